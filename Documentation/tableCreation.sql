@@ -15,7 +15,11 @@ create table Employee (
 	country VARCHAR(50),
 	city VARCHAR(50),
 	location INT,
-    FOREIGN KEY (location) REFERENCES Locations(id)
+    updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6)
+        ON UPDATE CURRENT_TIMESTAMP(6),
+    FOREIGN KEY (location) REFERENCES Locations(id),
+    INDEX idx_employee_name (last_name, first_name),
+    INDEX idx_employee_updated_at (updated_at)
 );
 
 CREATE TABLE AssetTypes (
@@ -32,7 +36,18 @@ CREATE TABLE Asset (
     employee_id INT,
     notes VARCHAR(1000),
     is_decommissioned binary DEFAULT 0,
+    decommission_date DATETIME,
+    version INT NOT NULL DEFAULT 1,
+    updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6)
+        ON UPDATE CURRENT_TIMESTAMP(6),
     UNIQUE INDEX uq_resource_id (resource_id),
+    INDEX idx_asset_updated_at (updated_at, id),
+    INDEX idx_asset_employee (employee_id),
+    INDEX idx_asset_location (location_id),
+    INDEX idx_asset_type_decommissioned (type_id, is_decommissioned),
+    INDEX idx_asset_date_added (date_added),
+    INDEX idx_asset_decommissioned_date (is_decommissioned, decommission_date),
+    FULLTEXT INDEX ft_asset_notes (notes),
     FOREIGN KEY (type_id) REFERENCES AssetTypes(id),
     FOREIGN KEY (location_id) REFERENCES Locations(id),
     FOREIGN KEY (employee_id) REFERENCES Employee(id),
@@ -42,6 +57,51 @@ CREATE TABLE Asset (
     )
 );
 
+CREATE TABLE AssetArchive (
+    id INT PRIMARY KEY,
+    resource_id VARCHAR(100),
+    type_id INT NOT NULL,
+    date_added DATE NOT NULL,
+    location_id INT,
+    employee_id INT,
+    notes VARCHAR(1000),
+    is_decommissioned binary DEFAULT 1,
+    decommission_date DATETIME,
+    version INT NOT NULL DEFAULT 1,
+    updated_at TIMESTAMP(6) NOT NULL,
+    archived_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+    UNIQUE INDEX uq_archive_resource_id (resource_id),
+    INDEX idx_archive_employee (employee_id),
+    INDEX idx_archive_location (location_id)
+);
+
+CREATE TABLE AssetSummary (
+    type_id INT NOT NULL,
+    location_key INT NOT NULL,
+    is_decommissioned TINYINT NOT NULL,
+    asset_count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (type_id, location_key, is_decommissioned)
+);
+
+CREATE TABLE ResourceIdSequence (
+    type_id INT NOT NULL,
+    year INT NOT NULL,
+    next_value INT NOT NULL,
+    PRIMARY KEY (type_id, year),
+    FOREIGN KEY (type_id) REFERENCES AssetTypes(id)
+);
+
+CREATE TABLE AssetHistory (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    asset_id INT NOT NULL,
+    action VARCHAR(20) NOT NULL,
+    actor VARCHAR(255),
+    changed_at DATETIME(6) NOT NULL,
+    before_values JSON,
+    after_values JSON,
+    INDEX idx_asset_history_asset (asset_id, id)
+);
+
 CREATE TRIGGER after_insert_assets
 AFTER INSERT ON Asset
 FOR EACH ROW
@@ -0,0 +1,2 @@
+# src/analytics/__init__.py
+# Makes this directory a Python package
@@ -0,0 +1,186 @@
+"""
+Asset Analytics Module
+
+Holds the Asset table in memory as columnar NumPy arrays and computes fleet analytics
+over them with vectorized operations (bincount, percentile, searchsorted), so a request
+costs a few array passes instead of a Python loop over row dictionaries.
+
+The columns are derived from an AssetReadModel (src/database/asset_read_model.py), which
+follows the change feed, writes through on controller writes and periodically reloads.
+A refresh syncs the model and rebuilds the columns only when its generation moved, so
+assets that were deleted, archived or moved to another shard drop out with it.
+
+Analytics provided:
+- age distribution of active assets from date_added
+- decommission rate by asset type
+- assets-per-employee percentiles
+- refresh forecast by location (assets past or approaching their refresh age)
+
+Example usage:
+    from src.analytics.asset_analytics import store
+
+    store.refresh_if_stale()
+    report = store.report(refresh_years=4, horizon_days=365)
+"""
+
+import datetime
+import threading
+import time
+import numpy as np
+from src.database import asset_read_model
+from src.database.inventory_summary import decommissioned_flag
+from src.logger import logger
+
+# Upper bounds (in days) of the age histogram buckets; the last bucket is open-ended.
+AGE_BUCKETS_DAYS = (365, 2 * 365, 3 * 365, 5 * 365)
+AGE_BUCKET_LABELS = ("<1y", "1-2y", "2-3y", "3-5y", "5y+")
+
+_NAT = np.datetime64("NaT", "D")
+
+
+def _to_day(value) -> np.datetime64:
+    if value is None or value == "":
+        return _NAT
+    if isinstance(value, datetime.datetime):
+        value = value.date()
+    return np.datetime64(value, "D")
+
+
+class AssetColumns:
+    """
+    Columnar copy of the Asset table, rebuilt from an AssetReadModel.
+
+    Missing location/employee ids are stored as 0.
+    """
+
+    def __init__(self, source: asset_read_model.AssetReadModel | None = None,
+                 min_refresh_seconds: float = 30.0):
+        self.source = asset_read_model.AssetReadModel() if source is None else source
+        self.min_refresh_seconds = min_refresh_seconds
+        self._lock = threading.Lock()
+        self._generation = None
+        self._last_refresh = 0.0
+        self.load_rows([])
+
+    def load_rows(self, rows: list[dict]):
+        """Replaces the columns with asset rows (as returned by the read model)."""
+        self.size = len(rows)
+        self.ids = np.fromiter((row["id"] for row in rows), dtype=np.int64, count=self.size)
+        self.type_ids = np.fromiter((row.get("type_id") or 0 for row in rows),
+                                    dtype=np.int32, count=self.size)
+        self.location_ids = np.fromiter((row.get("location_id") or 0 for row in rows),
+                                        dtype=np.int32, count=self.size)
+        self.employee_ids = np.fromiter((row.get("employee_id") or 0 for row in rows),
+                                        dtype=np.int32, count=self.size)
+        self.date_added = np.array([_to_day(row.get("date_added")) for row in rows],
+                                   dtype="datetime64[D]")
+        self.decommissioned = np.fromiter(
+            (bool(decommissioned_flag(row.get("is_decommissioned"))) for row in rows),
+            dtype=bool, count=self.size)
+
+    def refresh(self) -> bool:
+        """
+        Syncs the read model and rebuilds the columns if it changed.
+
+        Returns:
+            bool: False if the read model could not be refreshed.
+        """
+        with self._lock:
+            if not self.source.sync():
+                logger.event("Asset analytics refresh failed", level="error")
+                return False
+            generation = self.source.generation
+            if generation != self._generation:
+                self.load_rows(self.source.all())
+                self._generation = generation
+            self._last_refresh = time.monotonic()
+            logger.event(f"Asset analytics holds {self.size} assets", level="trace")
+            return True
+
+    def refresh_if_stale(self) -> bool:
+        """Refreshes unless the last refresh was under min_refresh_seconds ago."""
+        if time.monotonic() - self._last_refresh < self.min_refresh_seconds:
+            return True
+        return self.refresh()
+
+    # --- vectorized analytics ---
+
+    def _live(self):
+        n = self.size
+        return (self.type_ids[:n], self.location_ids[:n], self.employee_ids[:n],
+                self.date_added[:n], self.decommissioned[:n])
+
+    def age_distribution(self, today: np.datetime64) -> dict:
+        _, _, _, date_added, decommissioned = self._live()
+        dated = ~decommissioned & ~np.isnat(date_added)
+        ages = (today - date_added[dated]).astype(np.int64)
+        buckets = np.bincount(np.searchsorted(AGE_BUCKETS_DAYS, ages, side="right"),
+                              minlength=len(AGE_BUCKET_LABELS))
+        summary = {"count": int(ages.size),
+                   "buckets": dict(zip(AGE_BUCKET_LABELS, buckets.tolist()))}
+        if ages.size:
+            p50, p90 = np.percentile(ages, [50, 90])
+            summary.update(mean_days=round(float(ages.mean()), 1),
+                           p50_days=float(p50), p90_days=float(p90))
+        return summary
+
+    def decommission_rates(self) -> list[dict]:
+        type_ids, _, _, _, decommissioned = self._live()
+        totals = np.bincount(type_ids)
+        retired = np.bincount(type_ids, weights=decommissioned, minlength=totals.size)
+        present = np.nonzero(totals)[0]
+        rates = retired[present] / totals[present]
+        return [{"type_id": int(t), "total": int(totals[t]),
+                 "decommissioned": int(retired[t]), "rate": round(float(r), 4)}
+                for t, r in zip(present, rates)]
+
+    def assets_per_employee(self) -> dict:
+        _, _, employee_ids, _, decommissioned = self._live()
+        assigned = employee_ids[(employee_ids > 0) & ~decommissioned]
+        _, per_employee = np.unique(assigned, return_counts=True)
+        if not per_employee.size:
+            return {"employees": 0}
+        p50, p90, p99 = np.percentile(per_employee, [50, 90, 99])
+        return {"employees": int(per_employee.size), "mean": round(float(per_employee.mean()), 2),
+                "p50": float(p50), "p90": float(p90), "p99": float(p99),
+                "max": int(per_employee.max())}
+
+    def refresh_forecast(self, today: np.datetime64, refresh_years: int,
+                         horizon_days: int) -> list[dict]:
+        _, location_ids, _, date_added, decommissioned = self._live()
+        at_site = (location_ids > 0) & ~decommissioned & ~np.isnat(date_added)
+        locations, inverse = np.unique(location_ids[at_site], return_inverse=True)
+        if not locations.size:
+            return []
+        due_at = date_added[at_site] + np.timedelta64(int(round(refresh_years * 365.25)), "D")
+        days_left = (due_at - today).astype(np.int64)
+        overdue = np.bincount(inverse, weights=days_left <= 0, minlength=locations.size)
+        upcoming = np.bincount(inverse, weights=(days_left > 0) & (days_left <= horizon_days),
+                               minlength=locations.size)
+        totals = np.bincount(inverse, minlength=locations.size)
+        return [{"location_id": int(loc), "active_assets": int(total),
+                 "overdue": int(due), "due_within_horizon": int(soon)}
+                for loc, total, due, soon in zip(locations, totals, overdue, upcoming)]
+
+    def report(self, refresh_years: int = 4, horizon_days: int = 365,
+               today: datetime.date | None = None) -> dict:
+        """Computes every analytic over the current columns."""
+        today = np.datetime64(today or datetime.date.today(), "D")
+        with self._lock:
+            return {
+                "assets": self.size,
+                "age_distribution": self.age_distribution(today),
+                "decommission_rate_by_type": self.decommission_rates(),
+                "assets_per_employee": self.assets_per_employee(),
+                "refresh_forecast": {
+                    "refresh_years": refresh_years,
+                    "horizon_days": horizon_days,
+                    "by_location": self.refresh_forecast(today, refresh_years, horizon_days),
+                },
+            }
+
+
+# The shared read model is kept current by its own refresher when it is enabled;
+# otherwise analytics load a private one, so /assets keeps reading from SQL
+store = AssetColumns(asset_read_model.model if asset_read_model.READ_MODEL_ENABLED
+                     else None)
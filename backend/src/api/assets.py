@@ -2,6 +2,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel
 from src.database import database_controller as db_ctrl
+from src.database import asset_read_model
 import src.database.authorize as auth
 
 router = APIRouter(prefix="/assets", tags=["assets"])
@@ -11,9 +12,31 @@ class AssetCreate(BaseModel):
     location: str
 
 class AssetService:
+    """Asset reads are served from the in-memory read model once it has loaded,
+    and from the database until then."""
+    def __init__(self, read_model: asset_read_model.AssetReadModel | None = None):
+        self.read_model = read_model or asset_read_model.model
     def create(self, payload: dict) -> dict:
         return {"id": 1, **payload}
+    def list_by_employee(self, employee_id: int) -> list[dict]:
+        if self.read_model.loaded:
+            return self.read_model.by_employee(employee_id)
+        status, items = db_ctrl.get_resource_by_employee_id(
+            employee_id, user_position=auth.Role.EMPLOYEE)
+        if status != 200:
+            raise HTTPException(status_code=status, detail="Failed to fetch assets")
+        return items
+    def list_by_location(self, location_id: int) -> list[dict]:
+        if self.read_model.loaded:
+            return self.read_model.by_location(location_id)
+        status, items = db_ctrl.get_resource_by_location_id(
+            location_id, user_position=auth.Role.EMPLOYEE)
+        if status != 200:
+            raise HTTPException(status_code=status, detail="Failed to fetch assets")
+        return items
     def list(self) -> list[dict]:
+        if self.read_model.loaded:
+            return self.read_model.all()
         # Fetch real assets from DB via controller
         # Use EMPLOYEE role for read access (OTHER has no access)
         status, items = db_ctrl.get_resources(user_position=auth.Role.EMPLOYEE)
@@ -21,6 +44,11 @@ class AssetService:
             raise HTTPException(status_code=status, detail="Failed to fetch assets")
         return items
     def get_by_id(self, asset_id: int) -> dict:
+        if self.read_model.loaded:
+            item = self.read_model.get(asset_id)
+            if item is None:
+                raise HTTPException(status_code=404, detail="Asset not found")
+            return item
         # Fetch single asset by ID
         status, item = db_ctrl.get_resource_by_id(asset_id, user_position=auth.Role.EMPLOYEE)
         if status == 401:
@@ -56,7 +84,8 @@ def require_bearer(request: Request):
     return f"Bearer {token_value}"
 
 @router.post("", status_code=201)
-def create_asset(body: AssetCreate, svc: AssetService = Depends(get_service), _auth: str = Depends(require_bearer)):
+def create_asset(body: AssetCreate, svc: AssetService = Depends(get_service),
+                 _auth: str = Depends(require_bearer)):
     allowed = {"laptop", "monitor", "phone"}
     if body.type not in allowed:
         raise HTTPException(status_code=400, detail="unsupported type")
@@ -66,6 +95,17 @@ def create_asset(body: AssetCreate, svc: AssetService = Depends(get_service), _a
 def list_assets(svc: AssetService = Depends(get_service), _auth: str = Depends(require_bearer)):
     return svc.list()
 
+@router.get("/employee/{employee_id}")
+def list_assets_by_employee(employee_id: int, svc: AssetService = Depends(get_service),
+                            _auth: str = Depends(require_bearer)):
+    return svc.list_by_employee(employee_id)
+
+@router.get("/location/{location_id}")
+def list_assets_by_location(location_id: int, svc: AssetService = Depends(get_service),
+                            _auth: str = Depends(require_bearer)):
+    return svc.list_by_location(location_id)
+
 @router.get("/{asset_id}")
-def get_asset(asset_id: int, svc: AssetService = Depends(get_service), _auth: str = Depends(require_bearer)):
+def get_asset(asset_id: int, svc: AssetService = Depends(get_service),
+              _auth: str = Depends(require_bearer)):
     return svc.get_by_id(asset_id)
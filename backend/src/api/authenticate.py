@@ -1,7 +1,13 @@
 # src/authenticate.py
 from fastapi import HTTPException, Request
 import httpx
+import jwt
 import os
+from src.api import http_client
+from src.api import jwt_verifier
+from src.api import resilience
+from src.api import session_tokens
+from src.api import token_cache
 
 # Prefer verifying against Rocket-Pop SSO by calling a protected endpoint with the token.
 # If SSO_VERIFY_URL is set, we'll call that URL with Authorization header.
@@ -9,35 +15,47 @@ import os
 SSO_VERIFY_URL = os.getenv("SSO_VERIFY_URL", "http://host.docker.internal:42068/user/info")
 AUTH_SERVER_URL = os.getenv("AUTH_SERVER_URL", "http://172.16.0.51:8080/auth_service/api/auth/verify")
 
-async def authenticate_request(request: Request, token: str):
-    """Validate JWT tokens through the external authorization service and check request body."""   
-    # --- Step 1: Basic token presence check ---
-    if not token or not token.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing or invalid Authorization header")
+async def verify_with_sso(token_value: str) -> dict | None:
+    """
+    Asks the SSO (or the legacy verifier) whether token_value is valid, through
+    the SSO circuit breaker with hedged attempts (see resilience.py).
 
-    # Remove "Bearer " prefix
-    token_value = token.split(" ", 1)[1].strip()
+    Returns:
+        dict: The verifier's user info, or None if the token was rejected.
+
+    Raises:
+        HTTPException: 503 if the verifier cannot be reached, times out, fails
+        with a 5xx, or its circuit is open.
+    """
+    client = http_client.get_client()
+
+    async def attempt():
+        if SSO_VERIFY_URL:
+            # Call SSO with Authorization header; 200 means token accepted
+            response = await client.get(
+                SSO_VERIFY_URL,
+                headers={
+                    "Authorization": f"Bearer {token_value}",
+                    "Accept": "application/json"
+                }
+            )
+        else:
+            # Fallback: legacy auth service expects token in JSON
+            response = await client.post(
+                AUTH_SERVER_URL,
+                headers={"Content-Type": "application/json"},
+                json={"token": token_value}
+            )
+        if response.status_code >= 500:
+            raise resilience.DependencyError(f"Verifier returned {response.status_code}")
+        return response
 
-    # --- Step 2: Authenticate token by calling SSO protected endpoint or legacy verifier ---
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            if SSO_VERIFY_URL:
-                # Call SSO with Authorization header; 200 means token accepted
-                response = await client.get(
-                    SSO_VERIFY_URL,
-                    headers={
-                        "Authorization": f"Bearer {token_value}",
-                        "Accept": "application/json"
-                    }
-                )
-            else:
-                # Fallback: legacy auth service expects token in JSON
-                response = await client.post(
-                    AUTH_SERVER_URL,
-                    headers={"Content-Type": "application/json"},
-                    json={"token": token_value}
-                )
-    except httpx.RequestError as e:
+        # Verification has no side effects, so a slow attempt may be hedged
+        response = await resilience.sso.call(attempt, hedge=True)
+    except resilience.CircuitOpenError as e:
+        raise HTTPException(status_code=503, detail="Authorization service unavailable") from e
+    except (httpx.RequestError, resilience.DependencyError, TimeoutError) as e:
         print("AUTH CONNECTION ERROR:", e)
         raise HTTPException(status_code=503, detail="Authorization service unreachable") from e
 
@@ -46,12 +64,44 @@ async def authenticate_request(request: Request, token: str):
 
     if response.status_code not in (200, 201):
         # SSO returns 200 on success; legacy may return 201
-        raise HTTPException(status_code=401, detail="Unreadable or invalid token")
+        return None
 
     # The verifier returns user info or the protected endpoint response; use it as decoded payload
-    payload = response.json()
+    return response.json()
+
+async def authenticate_request(request: Request, token: str):
+    """Validate JWT tokens through the external authorization service and check request body."""   
+    # --- Step 1: Basic token presence check ---
+    if not token or not token.startswith("Bearer "):
+        raise HTTPException(status_code=401, detail="Missing or invalid Authorization header")
+
+    # Remove "Bearer " prefix
+    token_value = token.split(" ", 1)[1].strip()
+
+    # --- Step 2: Session tokens issued by /api/auth/login are checked in-process ---
+    payload = None
+    if session_tokens.sessions.enabled:
+        try:
+            payload = session_tokens.sessions.verify(token_value)
+        except jwt.InvalidTokenError as e:
+            raise HTTPException(status_code=401, detail="Session expired or revoked") from e
+
+    # --- Step 3: Verify other JWTs locally against the SSO's signing keys ---
+    if payload is None and jwt_verifier.verifier.enabled:
+        try:
+            payload = await jwt_verifier.verifier.verify(token_value)
+        except jwt.InvalidTokenError as e:
+            raise HTTPException(status_code=401, detail="Unreadable or invalid token") from e
+        if payload is None and not jwt_verifier.verifier.fallback_remote:
+            raise HTTPException(status_code=401, detail="Unreadable or invalid token")
+
+    # --- Step 4: Otherwise authenticate remotely, via the verification cache ---
+    if payload is None:
+        payload = await token_cache.cache.verify(token_value, verify_with_sso)
+    if payload is None:
+        raise HTTPException(status_code=401, detail="Unreadable or invalid token")
 
-    # --- Step 3: Return success for next processing stage ---
+    # --- Step 5: Return success for next processing stage ---
     return {
         "status": "valid",
         "method": request.method,
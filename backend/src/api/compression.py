@@ -0,0 +1,285 @@
+"""
+Compression Module
+
+Compresses responses in the app, so large asset lists leave uvicorn (and
+pass through the nginx proxy, which forwards Content-Encoding as is)
+compressed.
+
+    CompressionMiddleware   negotiates zstd, br or gzip from Accept-Encoding
+                            (server preference in that order, q-values
+                            honoured) and compresses JSON and text bodies of
+                            at least minimum_size bytes. Streamed bodies are
+                            compressed chunk by chunk and flushed after each
+                            chunk, so they are not buffered. Responses that
+                            already have a Content-Encoding pass untouched.
+    Precompressed           a response body stored once per encoding, for
+                            cached responses that should not be compressed
+                            again on every request
+    ResponseCache           time-bounded cache of Precompressed bodies,
+                            also cleared when a reference table is written
+                            (database_controller.notify_reference_write)
+
+gzip uses the zlib module, br and zstd the brotli and zstandard packages
+pinned in requirements.txt; an encoding whose package cannot be imported is
+not offered.
+
+Configuration (config.ini, all optional):
+    [compression]
+    enabled = false
+    minimum_size = 1024
+    gzip_level = 6
+    brotli_quality = 4
+    zstd_level = 3
+    reference_ttl_seconds = 300
+
+Example usage:
+    from src.api import compression
+
+    app.add_middleware(compression.CompressionMiddleware)
+
+    cached = reference_responses.get("types")
+    if cached is None:
+        cached = reference_responses.put("types", compression.Precompressed(body))
+    return cached.response(request)
+"""
+
+import configparser
+import threading
+import time
+import zlib
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import Response
+from src.logger import logger
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+config = configparser.ConfigParser()
+config.read('./config.ini')
+
+COMPRESSION_ENABLED = config.getboolean('compression', 'enabled', fallback=False)
+MINIMUM_SIZE = config.getint('compression', 'minimum_size', fallback=1024)
+GZIP_LEVEL = config.getint('compression', 'gzip_level', fallback=6)
+BROTLI_QUALITY = config.getint('compression', 'brotli_quality', fallback=4)
+ZSTD_LEVEL = config.getint('compression', 'zstd_level', fallback=3)
+REFERENCE_TTL_SECONDS = config.getfloat('compression', 'reference_ttl_seconds', fallback=300.0)
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript",
+                      "application/xml", "image/svg+xml")
+
+
+class _Gzip:
+    def __init__(self, level: int):
+        self._zlib = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._zlib.flush(zlib.Z_FINISH)
+
+
+class _Brotli:
+    def __init__(self, quality: int):
+        self._brotli = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._brotli.process(data) + self._brotli.flush()
+
+    def finish(self) -> bytes:
+        return self._brotli.finish()
+
+
+class _Zstd:
+    def __init__(self, level: int):
+        self._zstd = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._zstd.compress(data) + self._zstd.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._zstd.flush()
+
+
+def available_encodings() -> list[str]:
+    """Supported encodings, most preferred first."""
+    return ([name for name, module in (("zstd", zstandard), ("br", brotli)) if module]
+            + ["gzip"])
+
+
+def compressor(encoding: str):
+    """A streaming compressor: compress(chunk) returns flushed output, finish() the tail."""
+    if encoding == "zstd":
+        return _Zstd(ZSTD_LEVEL)
+    if encoding == "br":
+        return _Brotli(BROTLI_QUALITY)
+    return _Gzip(GZIP_LEVEL)
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    codec = compressor(encoding)
+    return codec.compress(data) + codec.finish()
+
+
+def negotiate(accept_encoding: str | None) -> str | None:
+    """
+    Picks the encoding to use for an Accept-Encoding header value.
+
+    Returns:
+        str: The supported encoding with the highest q-value (server
+            preference breaks ties), or None for an uncompressed response.
+    """
+    if not accept_encoding:
+        return None
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip().lower()] = q
+    wildcard = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for encoding in available_encodings():
+        q = weights.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def _compressible(headers: Headers) -> bool:
+    content_type = headers.get("content-type", "")
+    return ("content-encoding" not in headers
+            and content_type.startswith(COMPRESSIBLE_TYPES))
+
+
+def _weak_etag(headers: MutableHeaders):
+    # The compressed bytes differ from the identity ones, so the validator must too
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["etag"] = f"W/{etag}"
+
+
+class CompressionMiddleware:
+    """Compresses response bodies with the best encoding the client accepts."""
+
+    def __init__(self, app, minimum_size: int = MINIMUM_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        codec = None
+        passthrough = False
+
+        async def compressing_send(message):
+            nonlocal start, codec, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start = message          # held until the first body chunk
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if codec is None:
+                headers = MutableHeaders(raw=list(start["headers"]))
+                if not _compressible(headers) or (not more_body and len(body) < self.minimum_size):
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                codec = compressor(encoding)
+                headers["content-encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                _weak_etag(headers)
+                if more_body:
+                    del headers["content-length"]
+                else:
+                    body = codec.compress(body) + codec.finish()
+                    headers["content-length"] = str(len(body))
+                    await send({**start, "headers": headers.raw})
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                await send({**start, "headers": headers.raw})
+
+            chunk = codec.compress(body) if body else b""
+            if not more_body:
+                chunk += codec.finish()
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, compressing_send)
+
+
+class Precompressed:
+    """A response body kept uncompressed and in every supported encoding."""
+
+    def __init__(self, body: bytes, media_type: str = "application/json",
+                 minimum_size: int = MINIMUM_SIZE):
+        self.media_type = media_type
+        self.bodies = {None: body}
+        if len(body) >= minimum_size:
+            for encoding in available_encodings():
+                self.bodies[encoding] = compress(body, encoding)
+
+    def response(self, request, status_code: int = 200, headers: dict | None = None) -> Response:
+        """The variant for the request's Accept-Encoding, marked so it is not compressed again."""
+        encoding = negotiate(request.headers.get("Accept-Encoding"))
+        if encoding not in self.bodies:
+            encoding = None
+        headers = dict(headers or {})
+        if len(self.bodies) > 1:
+            headers["Vary"] = "Accept-Encoding"
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        return Response(content=self.bodies[encoding], status_code=status_code,
+                        headers=headers, media_type=self.media_type)
+
+
+class ResponseCache:
+    """Precompressed responses by key, each kept for ttl_seconds."""
+
+    def __init__(self, ttl_seconds: float = REFERENCE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries = {}     # key -> (monotonic expiry, Precompressed)
+
+    def get(self, key) -> Precompressed | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                return entry[1]
+            return None
+
+    def put(self, key, value: Precompressed) -> Precompressed:
+        if self.ttl_seconds > 0:
+            with self._lock:
+                self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        return value
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+        logger.event("Cached reference responses invalidated", level="info")
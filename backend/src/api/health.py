@@ -1,9 +1,17 @@
 from __future__ import annotations
 import time
 import sqlalchemy
-from fastapi import APIRouter, status
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from src.logger import logger
+from src.api import http_client
+from src.api import pipeline
+from src.api import resilience
+from src.api.authenticate import authenticate_request
+from src.api.authorize import authorize_request
+from src.api.responses import FastJSONResponse
+from src.api import token_cache
+from src.api.validate import validate_request
+import src.database.authorize as auth
 # dependency you can monkeypatch in tests
 from src.database.database_connector import get_db_connection
 
@@ -35,4 +43,22 @@ def health_ready():
     payload = {"status": "ok" if ok else "error", **db}
     code = status.HTTP_200_OK if ok else status.HTTP_503_SERVICE_UNAVAILABLE
     logger.event(f"readiness probe result={payload['status']}", level="info")
-    return JSONResponse(payload, status_code=code)
+    return FastJSONResponse(payload, status_code=code)
+
+async def _authenticated(request: Request) -> pipeline.RequestContext:
+    return await pipeline.run(request, validate_request, authenticate_request,
+                              authorize_request)
+
+@router.get("/health/metrics")
+def health_metrics(ctx: pipeline.RequestContext = Depends(_authenticated)):
+    """
+    In-process counters: token cache, SSO breaker and hedging, and the outbound pool.
+
+    Unlike the probes these describe the auth and SSO internals, so they are
+    for managers only.
+    """
+    if not auth.can_write(ctx.principal.role):
+        logger.event("Returning error 401: metrics require a manager", level="warning")
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    return {"token_cache": token_cache.cache.metrics(), "sso": resilience.sso.metrics(),
+            "http_client": http_client.metrics()}
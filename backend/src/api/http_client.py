@@ -0,0 +1,160 @@
+"""
+HTTP Client Module
+
+The one outbound HTTP client of the app (SSO token verification and the login
+proxy), so calls to the SSO reuse pooled keep-alive connections instead of
+opening a new TCP (and TLS) connection per request.
+
+The client is created at startup and closed at shutdown by the app lifespan;
+get_client() also creates it on first use, for scripts and tests that run
+without the lifespan. Every request is timed per host; metrics() adds the
+pool's open and idle connections per host.
+
+Configuration (config.ini, all optional):
+    [http_client]
+    max_connections = 100
+    max_keepalive_connections = 20
+    keepalive_expiry_seconds = 30
+    connect_timeout_seconds = 5
+    timeout_seconds = 10
+    http2 = false
+
+http2 needs the h2 package (pip install httpx[http2]) and only applies to
+https:// hosts; without h2 the client stays on HTTP/1.1.
+
+Example usage:
+    from src.api import http_client
+
+    response = await http_client.get_client().get(url, headers=headers)
+    http_client.metrics()   # {"hosts": {"sso:42068": {"requests": ..., ...}}, ...}
+"""
+
+import configparser
+import importlib.util
+import time
+import httpx
+from src.logger import logger
+
+config = configparser.ConfigParser()
+config.read('./config.ini')
+
+MAX_CONNECTIONS = config.getint('http_client', 'max_connections', fallback=100)
+MAX_KEEPALIVE_CONNECTIONS = config.getint('http_client', 'max_keepalive_connections', fallback=20)
+KEEPALIVE_EXPIRY_SECONDS = config.getfloat('http_client', 'keepalive_expiry_seconds', fallback=30.0)
+CONNECT_TIMEOUT_SECONDS = config.getfloat('http_client', 'connect_timeout_seconds', fallback=5.0)
+TIMEOUT_SECONDS = config.getfloat('http_client', 'timeout_seconds', fallback=10.0)
+HTTP2 = config.getboolean('http_client', 'http2', fallback=False)
+
+
+def _host(url: httpx.URL) -> str:
+    return f"{url.host}:{url.port or (443 if url.scheme == 'https' else 80)}"
+
+
+class _MeteredTransport(httpx.AsyncBaseTransport):
+    """Wraps the pooled transport and records per-host request counts and latency."""
+
+    def __init__(self, transport: httpx.AsyncHTTPTransport):
+        self.transport = transport
+        self.hosts = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        stats = self.hosts.setdefault(_host(request.url), {
+            "requests": 0, "errors": 0, "in_flight": 0, "total_ms": 0.0, "max_ms": 0.0})
+        stats["requests"] += 1
+        stats["in_flight"] += 1
+        started = time.monotonic()
+        try:
+            return await self.transport.handle_async_request(request)
+        except Exception:
+            stats["errors"] += 1
+            raise
+        finally:
+            # Time to response headers; the body is read by the caller
+            elapsed_ms = (time.monotonic() - started) * 1000.0
+            stats["in_flight"] -= 1
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+_client: httpx.AsyncClient | None = None
+_transport: _MeteredTransport | None = None
+
+
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def start() -> httpx.AsyncClient:
+    """Creates the shared client (no-op if it already exists)."""
+    global _client, _transport
+    if _client is not None:
+        return _client
+    http2 = HTTP2
+    if http2 and not _http2_available():
+        logger.event("http2 requested but the h2 package is not installed; using HTTP/1.1",
+                     level="warning")
+        http2 = False
+    limits = httpx.Limits(max_connections=MAX_CONNECTIONS,
+                          max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                          keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS)
+    _transport = _MeteredTransport(httpx.AsyncHTTPTransport(limits=limits, http2=http2))
+    _client = httpx.AsyncClient(
+        transport=_transport,
+        timeout=httpx.Timeout(TIMEOUT_SECONDS, connect=CONNECT_TIMEOUT_SECONDS))
+    logger.event(f"Outbound HTTP client started (max {MAX_CONNECTIONS} connections, "
+                 f"http2={http2})", level="info")
+    return _client
+
+
+def get_client() -> httpx.AsyncClient:
+    """The shared client, created on first use."""
+    return _client if _client is not None else start()
+
+
+async def close():
+    """Closes the shared client and its pooled connections."""
+    global _client, _transport
+    client, _client, _transport = _client, None, None
+    if client is not None:
+        await client.aclose()
+        logger.event("Outbound HTTP client closed", level="info")
+
+
+def _pool_connections() -> dict:
+    # httpcore keeps the connections on the transport's pool; origin is not
+    # public API, so fall back to "unknown" rather than fail the metrics call
+    pool = getattr(_transport.transport, "_pool", None) if _transport else None
+    per_host = {}
+    for connection in getattr(pool, "connections", []):
+        origin = getattr(connection, "_origin", None)
+        host = "unknown"
+        if origin is not None:
+            host = f"{origin.host.decode()}:{origin.port}"
+        counts = per_host.setdefault(host, {"open": 0, "idle": 0})
+        counts["open"] += 1
+        counts["idle"] += int(connection.is_idle())
+    return per_host
+
+
+def metrics() -> dict:
+    """Per-host request counts, latency and pooled connections."""
+    if _transport is None:
+        return {"started": False, "hosts": {}}
+    connections = _pool_connections()
+    hosts = {}
+    for host, stats in _transport.hosts.items():
+        hosts[host] = {
+            "requests": stats["requests"],
+            "errors": stats["errors"],
+            "in_flight": stats["in_flight"],
+            "avg_ms": round(stats["total_ms"] / stats["requests"], 2),
+            "max_ms": round(stats["max_ms"], 2),
+            **connections.pop(host, {"open": 0, "idle": 0}),
+        }
+    for host, counts in connections.items():
+        hosts[host] = counts
+    return {"started": True, "max_connections": MAX_CONNECTIONS,
+            "max_keepalive_connections": MAX_KEEPALIVE_CONNECTIONS, "hosts": hosts}
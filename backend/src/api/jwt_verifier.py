@@ -0,0 +1,195 @@
+"""
+JWT Verifier Module
+
+Local verification of SSO-issued JWTs: the signature, exp/nbf, audience and
+issuer are checked in-process against the SSO's public keys, so a request is
+authenticated without any outbound call.
+
+Keys come from the SSO's JWKS endpoint (jwks_url, fetched over the shared
+http_client) or from a PEM file (public_key_path). A background loop reloads
+them every refresh_interval_seconds; a token signed with an unknown kid also
+triggers a reload (at most once per min_refresh_seconds), so a key rotation
+is picked up without waiting for the loop.
+
+verify() has three outcomes:
+    claims dict         token verified locally
+    InvalidTokenError   the token is definitely bad (signature, expiry, audience)
+    None                cannot be decided locally (no keys loaded, not a JWT,
+                        unknown kid or algorithm); authenticate_request then
+                        falls back to the remote SSO check when fallback_remote
+                        is on
+
+Configuration (config.ini, all optional):
+    [jwt]
+    enabled = false
+    jwks_url = http://host.docker.internal:42068/.well-known/jwks.json
+    public_key_path =
+    algorithms = RS256
+    audience =
+    issuer =
+    title_claim = title
+    leeway_seconds = 30
+    refresh_interval_seconds = 300
+    min_refresh_seconds = 30
+    fallback_remote = true
+
+Example usage:
+    from src.api.jwt_verifier import verifier
+
+    await verifier.refresh()
+    claims = await verifier.verify(token_value)   # {"title": "Manager", ...}
+"""
+
+import asyncio
+import configparser
+import time
+import jwt
+from src.api import http_client
+from src.logger import logger
+
+config = configparser.ConfigParser()
+config.read('./config.ini')
+
+JWT_ENABLED = config.getboolean('jwt', 'enabled', fallback=False)
+JWKS_URL = config.get('jwt', 'jwks_url', fallback='') or None
+PUBLIC_KEY_PATH = config.get('jwt', 'public_key_path', fallback='') or None
+ALGORITHMS = [name.strip() for name in
+              config.get('jwt', 'algorithms', fallback='RS256').split(",") if name.strip()]
+AUDIENCE = config.get('jwt', 'audience', fallback='') or None
+ISSUER = config.get('jwt', 'issuer', fallback='') or None
+TITLE_CLAIM = config.get('jwt', 'title_claim', fallback='title')
+LEEWAY_SECONDS = config.getfloat('jwt', 'leeway_seconds', fallback=30.0)
+REFRESH_INTERVAL_SECONDS = config.getfloat('jwt', 'refresh_interval_seconds', fallback=300.0)
+MIN_REFRESH_SECONDS = config.getfloat('jwt', 'min_refresh_seconds', fallback=30.0)
+FALLBACK_REMOTE = config.getboolean('jwt', 'fallback_remote', fallback=True)
+
+# Key used for a PEM file or a JWKS entry without a kid
+NO_KID = ""
+
+
+class JWTVerifier:
+    """Holds the signing keys and verifies tokens against them."""
+
+    def __init__(self, jwks_url: str | None = JWKS_URL, public_key_path: str | None = PUBLIC_KEY_PATH,
+                 algorithms: list[str] = ALGORITHMS, audience: str | None = AUDIENCE,
+                 issuer: str | None = ISSUER, title_claim: str = TITLE_CLAIM,
+                 leeway_seconds: float = LEEWAY_SECONDS,
+                 min_refresh_seconds: float = MIN_REFRESH_SECONDS,
+                 fallback_remote: bool = FALLBACK_REMOTE, enabled: bool = JWT_ENABLED):
+        self.jwks_url = jwks_url
+        self.public_key_path = public_key_path
+        self.algorithms = algorithms
+        self.audience = audience
+        self.issuer = issuer
+        self.title_claim = title_claim
+        self.leeway_seconds = leeway_seconds
+        self.min_refresh_seconds = min_refresh_seconds
+        self.fallback_remote = fallback_remote
+        self.enabled = enabled
+        self.keys = {}                 # kid -> key object usable by jwt.decode
+        self._last_refresh = None      # monotonic time of the last attempt
+        self._refresh_lock = asyncio.Lock()
+
+    async def _load_jwks(self) -> dict:
+        response = await http_client.get_client().get(
+            self.jwks_url, headers={"Accept": "application/json"})
+        response.raise_for_status()
+        keys = {}
+        for jwk in response.json().get("keys", []):
+            if jwk.get("use", "sig") != "sig":
+                continue
+            try:
+                keys[jwk.get("kid", NO_KID)] = jwt.PyJWK(jwk).key
+            except jwt.PyJWKError as e:
+                logger.event(f"Skipping unusable JWKS key {jwk.get('kid')}: {e}", level="warning")
+        return keys
+
+    def _load_pem(self) -> dict:
+        with open(self.public_key_path, "rb") as f:
+            return {NO_KID: f.read()}
+
+    async def refresh(self) -> bool:
+        """
+        Reloads the signing keys; the old keys stay in use if loading fails.
+
+        Returns:
+            bool: True if keys were loaded.
+        """
+        async with self._refresh_lock:
+            self._last_refresh = time.monotonic()
+            try:
+                if self.jwks_url:
+                    keys = await self._load_jwks()
+                elif self.public_key_path:
+                    keys = await asyncio.to_thread(self._load_pem)
+                else:
+                    logger.event("JWT verification enabled without jwks_url or public_key_path",
+                                 level="error")
+                    return False
+            except Exception as e:
+                logger.event(f"Failed to load JWT signing keys: {e}", level="error")
+                return False
+            if not keys:
+                logger.event("No usable JWT signing keys found", level="error")
+                return False
+            if set(keys) != set(self.keys):
+                logger.event(f"Loaded JWT signing keys {sorted(keys)}", level="info")
+            self.keys = keys
+            return True
+
+    def _key_for(self, kid: str | None):
+        if kid in self.keys:
+            return self.keys[kid]
+        if len(self.keys) == 1 and (kid is None or NO_KID in self.keys):
+            return next(iter(self.keys.values()))
+        return None
+
+    def decode(self, token: str, key) -> dict:
+        """Checks signature and claims; raises jwt.InvalidTokenError. CPU only."""
+        claims = jwt.decode(
+            token, key, algorithms=self.algorithms, audience=self.audience, issuer=self.issuer,
+            leeway=self.leeway_seconds,
+            options={"require": ["exp"], "verify_aud": self.audience is not None})
+        if self.title_claim != "title" and "title" not in claims:
+            claims["title"] = claims.get(self.title_claim, "")
+        return claims
+
+    async def verify(self, token: str) -> dict | None:
+        """
+        Verifies token locally.
+
+        Returns:
+            dict: The token's claims, or None if it cannot be decided locally.
+
+        Raises:
+            jwt.InvalidTokenError: If the token is invalid, expired or for another audience.
+        """
+        try:
+            header = jwt.get_unverified_header(token)
+        except jwt.DecodeError:
+            return None                    # not a JWT, e.g. an opaque SSO session token
+        if header.get("alg") not in self.algorithms:
+            return None
+        key = self._key_for(header.get("kid"))
+        if key is None and (self._last_refresh is None
+                            or time.monotonic() - self._last_refresh >= self.min_refresh_seconds):
+            # Unknown kid: the SSO may have rotated its keys
+            await self.refresh()
+            key = self._key_for(header.get("kid"))
+        if key is None:
+            return None
+        return self.decode(token, key)
+
+
+async def run_refresher(interval_seconds: float = REFRESH_INTERVAL_SECONDS):
+    """Background loop reloading the signing keys; the first pass loads them."""
+    logger.event("JWT key refresher started", level="info")
+    while True:
+        try:
+            await verifier.refresh()
+        except Exception as e:  # keep the loop alive; the next pass retries
+            logger.event(f"JWT key refresh failed: {e}", level="error")
+        await asyncio.sleep(interval_seconds)
+
+
+verifier = JWTVerifier()
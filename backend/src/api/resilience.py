@@ -0,0 +1,190 @@
+"""
+Resilience Module
+
+Guards calls to an external dependency (the SSO) so that a slow or failing
+host does not make every API request wait for it.
+
+    circuit breaker   after failure_threshold consecutive failures the
+                      breaker opens and calls fail at once (CircuitOpenError)
+                      for reset_timeout_seconds; then one trial call is let
+                      through (half-open) and its outcome closes or reopens it
+    hedging           an idempotent call still running after hedge_delay_ms
+                      gets a second, parallel attempt; the first to succeed
+                      wins and the other is cancelled. At most max_hedge_ratio
+                      of calls are hedged, so a uniformly slow host does not
+                      get twice the load
+    attempt timeout   each attempt is bounded by request_timeout_seconds
+
+The grace window for tokens verified before an outage lives in token_cache.
+
+Configuration (config.ini, all optional):
+    [sso]
+    failure_threshold = 5
+    reset_timeout_seconds = 30
+    request_timeout_seconds = 3
+    hedge_delay_ms = 300
+    max_hedge_ratio = 0.1
+
+Example usage:
+    from src.api.resilience import sso
+
+    response = await sso.call(lambda: client.get(url), hedge=True)
+    sso.metrics()   # {"state": "closed", "hedges": 3, "hedge_wins": 2, ...}
+"""
+
+import asyncio
+import configparser
+import time
+from src.logger import logger
+
+config = configparser.ConfigParser()
+config.read('./config.ini')
+
+FAILURE_THRESHOLD = config.getint('sso', 'failure_threshold', fallback=5)
+RESET_TIMEOUT_SECONDS = config.getfloat('sso', 'reset_timeout_seconds', fallback=30.0)
+REQUEST_TIMEOUT_SECONDS = config.getfloat('sso', 'request_timeout_seconds', fallback=3.0)
+HEDGE_DELAY_MS = config.getfloat('sso', 'hedge_delay_ms', fallback=300.0)
+MAX_HEDGE_RATIO = config.getfloat('sso', 'max_hedge_ratio', fallback=0.1)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency whose circuit breaker is open."""
+
+
+class DependencyError(Exception):
+    """Raised by an attempt when the dependency answered but failed (e.g. HTTP 5xx)."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker with a single half-open trial call."""
+
+    def __init__(self, name: str, failure_threshold: int = FAILURE_THRESHOLD,
+                 reset_timeout_seconds: float = RESET_TIMEOUT_SECONDS):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.times_opened = 0
+        self.rejected = 0
+        self._trial_running = False
+
+    def allow(self) -> bool:
+        """True if a call may go out now; in half-open state only one trial may."""
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout_seconds:
+                self.rejected += 1
+                return False
+            self.state = HALF_OPEN
+            logger.event(f"Circuit {self.name} half-open, sending a trial call", level="info")
+        if self.state == HALF_OPEN:
+            if self._trial_running:
+                self.rejected += 1
+                return False
+            self._trial_running = True
+        return True
+
+    def release(self):
+        """A call ended without an outcome (cancelled); the next trial may go."""
+        self._trial_running = False
+
+    def record_success(self):
+        if self.state != CLOSED:
+            logger.event(f"Circuit {self.name} closed", level="info")
+        self.state = CLOSED
+        self.failures = 0
+        self._trial_running = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._trial_running = False
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self.times_opened += 1
+                logger.event(f"Circuit {self.name} open after {self.failures} failures",
+                             level="error")
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+
+class ResilientDependency:
+    """Circuit breaker, per-attempt timeout and optional hedging around one dependency."""
+
+    def __init__(self, name: str, breaker: CircuitBreaker | None = None,
+                 request_timeout_seconds: float = REQUEST_TIMEOUT_SECONDS,
+                 hedge_delay_ms: float = HEDGE_DELAY_MS, max_hedge_ratio: float = MAX_HEDGE_RATIO):
+        self.name = name
+        self.breaker = breaker or CircuitBreaker(name)
+        self.request_timeout_seconds = request_timeout_seconds
+        self.hedge_delay_ms = hedge_delay_ms
+        self.max_hedge_ratio = max_hedge_ratio
+        self.calls = self.failures = self.hedges = self.hedge_wins = 0
+
+    async def _attempt(self, attempt):
+        return await asyncio.wait_for(attempt(), self.request_timeout_seconds)
+
+    def _may_hedge(self) -> bool:
+        return self.hedge_delay_ms > 0 and self.hedges < self.max_hedge_ratio * self.calls
+
+    async def _hedged(self, attempt):
+        first = asyncio.ensure_future(self._attempt(attempt))
+        tasks = {first}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_delay_ms / 1000.0)
+            if not done and self._may_hedge():
+                self.hedges += 1
+                tasks.add(asyncio.ensure_future(self._attempt(attempt)))
+            error = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not first:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def call(self, attempt, hedge: bool = False):
+        """
+        Runs attempt() (a coroutine function) under the breaker.
+
+        Args:
+            attempt: Makes one request; raises on failure.
+            hedge (bool): Allow a second parallel attempt. Only for idempotent calls.
+
+        Raises:
+            CircuitOpenError: Without calling attempt, while the breaker is open.
+            Exception: The attempt's own error (asyncio.TimeoutError on timeout).
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"{self.name} circuit is open")
+        self.calls += 1
+        try:
+            result = await (self._hedged(attempt) if hedge else self._attempt(attempt))
+        except asyncio.CancelledError:
+            self.breaker.release()
+            raise
+        except Exception:
+            self.failures += 1
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        return result
+
+    def metrics(self) -> dict:
+        return {"state": self.breaker.state, "consecutive_failures": self.breaker.failures,
+                "times_opened": self.breaker.times_opened,
+                "rejected_while_open": self.breaker.rejected, "calls": self.calls,
+                "failures": self.failures, "hedges": self.hedges, "hedge_wins": self.hedge_wins}
+
+
+sso = ResilientDependency("sso")
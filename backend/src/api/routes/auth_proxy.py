@@ -1,7 +1,13 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 import httpx
+import jwt
 import os
+from src.api import http_client
+from src.api import authenticate
+from src.api import resilience
+from src.api import session_tokens
+from src.api import token_cache
 from src.logger import logger
 
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
@@ -31,16 +37,16 @@ async def proxy_login(credentials: LoginRequest):
     logger.event(f"Login proxy called for user: {credentials.username}", level="info")
     
     try:
-        # Forward the request to the SSO server
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(
-                SSO_SERVER_URL,
-                headers={"Content-Type": "application/json"},
-                json={
-                    "username": credentials.username,
-                    "password": credentials.password
-                }
-            )
+        # Forward the request to the SSO server over the shared pooled client,
+        # through the SSO circuit breaker (no hedging: a login is not idempotent)
+        response = await resilience.sso.call(lambda: http_client.get_client().post(
+            SSO_SERVER_URL,
+            headers={"Content-Type": "application/json"},
+            json={
+                "username": credentials.username,
+                "password": credentials.password
+            }
+        ))
         
         # Log the response status
         logger.security(
@@ -64,11 +70,14 @@ async def proxy_login(credentials: LoginRequest):
         sso_data = response.json()
         logger.event(f"Successful SSO authentication for user: {credentials.username}", level="info")
         
+        if session_tokens.sessions.enabled:
+            return await _start_session(sso_data, credentials.username)
+
         # Return the SSO response to the frontend
         # The frontend expects fields like token, access_token, bearerToken, or accessToken
         return sso_data
         
-    except httpx.RequestError as e:
+    except (httpx.RequestError, TimeoutError, resilience.CircuitOpenError) as e:
         logger.event(f"SSO server connection error: {str(e)}", level="error")
         raise HTTPException(
             status_code=503, 
@@ -83,3 +92,59 @@ async def proxy_login(credentials: LoginRequest):
             status_code=500,
             detail="An unexpected error occurred during authentication"
         ) from e
+
+
+SSO_TOKEN_FIELDS = ("token", "access_token", "bearerToken", "accessToken")
+
+
+async def _start_session(sso_data: dict, username: str) -> dict:
+    """
+    Replaces the SSO token in the login response with a backend session token.
+    The SSO is asked for the user's title once, here, instead of on every request.
+    """
+    sso_token = next((sso_data[field] for field in SSO_TOKEN_FIELDS if sso_data.get(field)), None)
+    if not sso_token:
+        raise HTTPException(status_code=502, detail="SSO response did not include a token")
+    sso_token = sso_token.split(" ", 1)[1] if sso_token.lower().startswith("bearer ") else sso_token
+    user = await token_cache.cache.verify(sso_token, authenticate.verify_with_sso)
+    if user is None:
+        raise HTTPException(status_code=401, detail="SSO rejected the issued token")
+
+    token, expires_in = session_tokens.sessions.issue({"username": username, **user})
+    logger.security(f"Session started for user: {username}", level="info")
+    response = {key: value for key, value in sso_data.items() if key not in SSO_TOKEN_FIELDS}
+    return {**response, "token": token, "token_type": "Bearer", "expires_in": expires_in}
+
+
+def _session_token(request: Request) -> str:
+    if not session_tokens.sessions.enabled:
+        raise HTTPException(status_code=404, detail="Session tokens are not enabled")
+    token = request.headers.get("Authorization") or ""
+    if not token.startswith("Bearer "):
+        raise HTTPException(status_code=401, detail="Missing or invalid Authorization header")
+    return token.split(" ", 1)[1].strip()
+
+
+@router.post("/refresh")
+async def refresh_session(request: Request):
+    """
+    Exchanges a session token (still valid, or expired within the refresh
+    grace) for a new one without another SSO login.
+    """
+    try:
+        token, expires_in = session_tokens.sessions.refresh(_session_token(request))
+    except jwt.InvalidTokenError as e:
+        logger.security(f"Session refresh refused: {e}", level="warning")
+        raise HTTPException(status_code=401, detail="Session expired or revoked") from e
+    return {"token": token, "token_type": "Bearer", "expires_in": expires_in}
+
+
+@router.post("/logout")
+async def logout(request: Request):
+    """Revokes the session, including tokens already refreshed from it."""
+    try:
+        session_tokens.sessions.logout(_session_token(request))
+    except jwt.InvalidTokenError as e:
+        raise HTTPException(status_code=401, detail="Session expired or revoked") from e
+    logger.security("Session revoked by logout", level="info")
+    return {"status": "logged out"}
@@ -1,11 +1,24 @@
-from fastapi import APIRouter, Request, HTTPException, status
-from fastapi.responses import JSONResponse
+import asyncio
+import codecs
+import tempfile
+from datetime import datetime
+from fastapi import APIRouter, Depends, Request, HTTPException, status
+from src.api import compression
+from src.api import pipeline
+from src.api.pipeline import RequestContext
+from src.api.responses import FastJSONResponse, dumps
 from src.api.validate import validate_request
 from src.api.authenticate import authenticate_request
-from src.api.authorize import authorize_request, get_db_role
+from src.api.authorize import authorize_request
 from src.security.sanitize import sanitize_data
 import src.database.database_controller as db
-from src.utils import convert_bytes_to_strings
+import src.database.authorize as auth
+from src.database import asset_import
+from src.database import audit
+from src.database import employee_index
+from src.database import inventory_summary
+from src.database import write_coalescer
+from src.analytics.asset_analytics import store as analytics_store
 
 # Helpers to accommodate different return shapes from DB layer
 def _is_ok(result):
@@ -15,113 +28,319 @@ def _is_ok(result):
 
 def _data(result):
     return result[1] if isinstance(result, tuple) and len(result) > 1 else result
+
+# Optimistic concurrency: the Asset.version column is exposed as a strong ETag
+# and conditional writes send it back in If-Match.
+def _etag(version):
+    return f'"{version}"'
+
+def _if_match_version(request: Request):
+    """Returns the version named by If-Match, or None when absent or '*'."""
+    header = request.headers.get("If-Match")
+    if header is None or header.strip() == "*":
+        return None
+    value = header.strip()
+    if value.startswith("W/"):
+        value = value[2:]
+    try:
+        return int(value.strip('"'))
+    except ValueError as exc:
+        logger.event(f"Unparseable If-Match header: {header}", level="warning")
+        raise HTTPException(status_code=412, detail="Precondition failed") from exc
+
 from src.logger import logger
 
 router = APIRouter(prefix="/resources", tags=["Resources"])
 
+# Asset types and locations change rarely; their rendered responses are kept
+# already compressed in every encoding, so cache hits are never compressed again
+reference_responses = compression.ResponseCache()
+
+# Token, validation, authentication, authorization and role run once per request
+# in the pipeline. The stages are looked up here at call time so they can be
+# swapped per module.
+async def _authenticated(request: Request) -> RequestContext:
+    return await pipeline.run(request, validate_request, authenticate_request,
+                              authorize_request)
+
+async def _authenticated_stream(request: Request) -> RequestContext:
+    """For routes whose body is not an asset and is consumed as a stream."""
+    return await pipeline.run(request, validate_request, authenticate_request,
+                              authorize_request, validate_body=False)
+
 # --- GET /resources ---
 @router.get("/")
-async def get_resources(request: Request):
+async def get_resources(include_archived: bool = False,
+                        ctx: RequestContext = Depends(_authenticated)):
     logger.event("GET /resources", level="info")
-    token = request.headers.get("Authorization")
-    logger.security(f"token: {token}", level="trace")
-    if not token:
-        logger.event("Missing Authorization header", level="warning")
-        raise HTTPException(status_code=401, detail="Missing Authorization header")
-
-    await validate_request(request, token)
-    auth_result = await authenticate_request(request, token)
-    decoded = auth_result["decoded_payload"]
-    await authorize_request(request, decoded)
-
-    title = get_db_role(decoded.get("title", ""))
-    result = db.get_resources(title)
+    title = ctx.principal.role
+    result = db.get_resources(title, include_archived=include_archived)
 
     if _is_ok(result):
         logger.event("Returning resources", level="info")
-        return JSONResponse(content=convert_bytes_to_strings(_data(result)),
-                             status_code=status.HTTP_200_OK)
+        return FastJSONResponse(content=_data(result),
+                                status_code=status.HTTP_200_OK)
     else:
         logger.event("Returning error 400", level="error")
         raise HTTPException(status_code=400, detail="Database error")
 
 # --- GET /resources/types/ ---
 @router.get("/types/")
-async def get_resource_types(request: Request):
+async def get_resource_types(request: Request, ctx: RequestContext = Depends(_authenticated)):
     logger.event("GET /resources/types", level="info")
 
-    token = request.headers.get("Authorization")
-    logger.security(f"token: {token}", level="trace")
-    if not token:
-        logger.event("Returning error 401: no token", level="warning")
-        raise HTTPException(status_code=401, detail="Missing Authorization header")
+    title = ctx.principal.role
+    cached = reference_responses.get(("types", title))
+    if cached is not None:
+        logger.event("Returning cached resource types", level="info")
+        return cached.response(request)
 
-    await validate_request(request, token)
-    auth_result = await authenticate_request(request, token)
-    decoded = auth_result["decoded_payload"]
-    await authorize_request(request, decoded)
-
-    title = get_db_role(decoded.get("title", ""))
     result = db.get_resource_types(title)
 
     if _is_ok(result):
         logger.event("Returning resource types", level="info")
-        return JSONResponse(content=convert_bytes_to_strings(_data(result)),
-                             status_code=status.HTTP_200_OK)
+        cached = compression.Precompressed(dumps(_data(result)))
+        return reference_responses.put(("types", title), cached).response(request)
 
     logger.event("Returning error 400", level="error")
     raise HTTPException(status_code=400, detail="Database error")
 
+# Change feed cursors are "<updated_at ISO timestamp>,<id>" of the last row seen.
+# A bare timestamp is accepted too and means "everything after this instant".
+def _parse_change_cursor(since: str | None):
+    if not since:
+        return None, 0
+    stamp, _, last_id = since.partition(",")
+    try:
+        return datetime.fromisoformat(stamp), int(last_id or 0)
+    except ValueError as exc:
+        logger.event(f"Invalid change cursor: {since}", level="warning")
+        raise HTTPException(status_code=400, detail="Invalid 'since' cursor") from exc
+
+def _change_cursor(row):
+    updated_at = row["updated_at"]
+    if isinstance(updated_at, datetime):
+        updated_at = updated_at.isoformat()
+    return f"{updated_at},{row['id']}"
+
+# --- GET /resources/changes ---
+@router.get("/changes")
+async def get_resource_changes(since: str | None = None, limit: int = 500,
+                               ctx: RequestContext = Depends(_authenticated)):
+    """
+    Returns assets created, updated or decommissioned after the 'since' cursor.
+    Clients store 'next_cursor' and pass it back as 'since' on the next sync;
+    'has_more' means another page is already waiting.
+    """
+    logger.event(f"GET /resources/changes since={since}", level="info")
+
+    since_at, since_id = _parse_change_cursor(since)
+    limit = max(1, min(limit, 1000))
+
+    title = ctx.principal.role
+    result = db.get_resource_changes(since_at, since_id, limit, title)
+
+    if _is_ok(result):
+        changes = _data(result)
+        next_cursor = _change_cursor(changes[-1]) if changes else since
+        logger.event(f"Returning {len(changes)} changes", level="info")
+        return FastJSONResponse(content={
+                                    "changes": changes,
+                                    "next_cursor": next_cursor,
+                                    "has_more": len(changes) == limit,
+                                },
+                                status_code=status.HTTP_200_OK)
+
+    logger.event("Returning error 400", level="error")
+    raise HTTPException(status_code=400, detail="Database error")
+
+# --- GET /resources/stats ---
+@router.get("/stats")
+async def get_resource_stats(ctx: RequestContext = Depends(_authenticated)):
+    """
+    Returns asset counts by type, location and decommission state, read from the
+    incrementally maintained AssetSummary table.
+    """
+    logger.event("GET /resources/stats", level="info")
+
+    title = ctx.principal.role
+    result = db.get_resource_stats(title)
+
+    if _is_ok(result):
+        logger.event("Returning resource stats", level="info")
+        return FastJSONResponse(content=inventory_summary.summarize(_data(result)),
+                                status_code=status.HTTP_200_OK)
+
+    logger.event("Returning error 400", level="error")
+    raise HTTPException(status_code=400, detail="Database error")
+
+# --- GET /resources/batch ---
+MAX_BATCH_IDS = 500
+
+@router.get("/batch")
+async def get_resources_batch(ids: str, include_archived: bool = False,
+                              ctx: RequestContext = Depends(_authenticated)):
+    """
+    Returns up to MAX_BATCH_IDS assets in one call. 'ids' is a comma-separated
+    list; the response maps each found id to its asset and lists the ids that
+    do not exist under 'missing'.
+    """
+    logger.event(f"GET /resources/batch ids={ids}", level="info")
+
+    try:
+        resource_ids = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError as exc:
+        logger.event(f"Returning error 400: bad ids {ids}", level="warning")
+        raise HTTPException(status_code=400, detail="ids must be comma-separated integers") from exc
+    if not resource_ids or len(resource_ids) > MAX_BATCH_IDS:
+        logger.event(f"Returning error 400: {len(resource_ids)} ids requested", level="warning")
+        raise HTTPException(status_code=400,
+                            detail=f"ids must list between 1 and {MAX_BATCH_IDS} assets")
+
+    title = ctx.principal.role
+    result = db.get_resources_by_ids(resource_ids, title, include_archived=include_archived)
+
+    if _is_ok(result):
+        batch = _data(result)
+        logger.event(f"Returning {len(batch['found'])} resources", level="info")
+        return FastJSONResponse(content={
+                                    "resources": {str(resource_id): row
+                                                  for resource_id, row in batch["found"].items()},
+                                    "missing": batch["missing"],
+                                },
+                                status_code=status.HTTP_200_OK)
+
+    logger.event("Returning error 400", level="error")
+    raise HTTPException(status_code=400, detail="Database error")
+
+# --- GET /resources/search ---
+@router.get("/search")
+async def search_resources(q: str, type_id: int | None = None,
+                           location_id: int | None = None,
+                           decommissioned: bool | None = None,
+                           limit: int = 50, offset: int = 0,
+                           ctx: RequestContext = Depends(_authenticated)):
+    """
+    Full-text search over asset notes, most relevant first. Every word in 'q'
+    must match; results can be narrowed by type, location and decommission
+    state. Pass 'next_offset' back as 'offset' while 'has_more' is true.
+    """
+    logger.event(f"GET /resources/search q={q}", level="info")
+
+    limit = max(1, min(limit, 200))
+    offset = max(0, offset)
+    filters = {
+        "type_id": type_id,
+        "location_id": location_id,
+        "is_decommissioned": None if decommissioned is None else int(decommissioned),
+    }
+
+    title = ctx.principal.role
+    # Fetch one extra row to know whether another page exists
+    result = db.search_resources(q, filters, limit + 1, offset, title)
+
+    if _is_ok(result):
+        matches = _data(result)
+        has_more = len(matches) > limit
+        matches = matches[:limit]
+        logger.event(f"Returning {len(matches)} search results", level="info")
+        return FastJSONResponse(content={
+                                    "results": matches,
+                                    "next_offset": offset + len(matches),
+                                    "has_more": has_more,
+                                },
+                                status_code=status.HTTP_200_OK)
+
+    logger.event("Returning error 400", level="error")
+    raise HTTPException(status_code=400, detail="Invalid search or database error")
+
+# --- GET /resources/analytics ---
+@router.get("/analytics")
+async def get_resource_analytics(refresh_years: int = 4,
+                                 horizon_days: int = 365,
+                                 ctx: RequestContext = Depends(_authenticated)):
+    """
+    Returns fleet analytics: age distribution, decommission rate by type,
+    assets-per-employee percentiles and a refresh forecast by location.
+    'refresh_years' is the replacement cycle; 'horizon_days' how far ahead
+    the forecast looks.
+    """
+    logger.event("GET /resources/analytics", level="info")
+
+    if not auth.can_read(ctx.principal.role):
+        logger.event("Returning error 401: user does not have read access", level="warning")
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    if refresh_years < 1 or horizon_days < 0:
+        raise HTTPException(status_code=400, detail="Invalid forecast parameters")
+
+    # Incremental refresh and the array math both block, so keep them off the event loop
+    if not await asyncio.to_thread(analytics_store.refresh_if_stale):
+        logger.event("Returning error 400", level="error")
+        raise HTTPException(status_code=400, detail="Database error")
+
+    report = await asyncio.to_thread(analytics_store.report, refresh_years, horizon_days)
+    logger.event("Returning resource analytics", level="info")
+    return FastJSONResponse(content=report, status_code=status.HTTP_200_OK)
+
 # --- GET /resources/{resource_id} ---
 @router.get("/{resource_id}")
-async def get_resource_by_id(request: Request, resource_id: int):
+async def get_resource_by_id(resource_id: int, include_archived: bool = False,
+                             ctx: RequestContext = Depends(_authenticated)):
     logger.event(f"GET /resources/{resource_id}", level="info")
 
-    token = request.headers.get("Authorization")
-    logger.security(f"token: {token}", level="trace")
-    if not token:
-        logger.event("Returning error 401: no token", level="warning")
-        raise HTTPException(status_code=401, detail="Missing Authorization header")
-
-    await validate_request(request, token)
-    auth_result = await authenticate_request(request, token)
-    decoded = auth_result["decoded_payload"]
-    await authorize_request(request, decoded)
-
-    title = get_db_role(decoded.get("title", ""))
-    result = db.get_resource_by_id(resource_id, title)
+    title = ctx.principal.role
+    result = db.get_resource_by_id(resource_id, title, include_archived=include_archived)
 
     if _is_ok(result):
         logger.event("Returning resource", level="info")
-        return JSONResponse(content=convert_bytes_to_strings(_data(result)),
-                             status_code=status.HTTP_200_OK)
+        resource = _data(result)
+        headers = {}
+        if isinstance(resource, dict) and resource.get("version") is not None:
+            headers["ETag"] = _etag(resource["version"])
+        return FastJSONResponse(content=resource,
+                                status_code=status.HTTP_200_OK, headers=headers)
 
     logger.event("Returning error 404", level="error")
     raise HTTPException(status_code=404, detail="Resource not found")
 
 
+# --- GET /resources/{id}/history ---
+@router.get("/{resource_id}/history")
+async def get_resource_history(resource_id: int, limit: int = 100,
+                               before: int | None = None,
+                               ctx: RequestContext = Depends(_authenticated)):
+    """
+    Returns who changed the asset and when, with before/after values, newest
+    first. Pass the last entry's id as 'before' for the next page.
+    """
+    logger.event(f"GET /resources/{resource_id}/history", level="info")
+
+    title = ctx.principal.role
+    result = await asyncio.to_thread(db.get_resource_history, resource_id, title,
+                                     max(1, min(limit, 1000)), before)
+    if _is_ok(result):
+        logger.event(f"Returning history for resource {resource_id}", level="info")
+        return FastJSONResponse(content=_data(result),
+                                status_code=status.HTTP_200_OK)
+    logger.event("Returning error 400", level="error")
+    raise HTTPException(status_code=400, detail="Database error")
+
+
 # --- GET /resources/employee/{employee_id} ---
 @router.get("/employee/{employee_id}")
-async def get_resources_by_employee(request: Request, employee_id: int):
+async def get_resources_by_employee(employee_id: int,
+                                    include_archived: bool = False,
+                                    ctx: RequestContext = Depends(_authenticated)):
     logger.event(f"GET /resources/employee/{employee_id}", level="info")
 
-    token = request.headers.get("Authorization")
-    logger.security(f"token: {token}", level="trace")
-    if not token:
-        logger.event("Returning error 401: no token", level="warning")
-        raise HTTPException(status_code=401, detail="Missing Authorization header")
-
-    await validate_request(request, token)
-    auth_result = await authenticate_request(request, token)
-    decoded = auth_result["decoded_payload"]
-    await authorize_request(request, decoded)
-
-    title = get_db_role(decoded.get("title", ""))
-    result = db.get_resource_by_employee_id(employee_id, title)
+    title = ctx.principal.role
+    result = db.get_resource_by_employee_id(employee_id, title,
+                                            include_archived=include_archived)
     if _is_ok(result):
         logger.event("Returning resources", level="info")
-        return JSONResponse(content=convert_bytes_to_strings(_data(result)),
-                             status_code=status.HTTP_200_OK)
+        return FastJSONResponse(content=_data(result),
+                                status_code=status.HTTP_200_OK)
     else:
         logger.event("Returning error 400", level="error")
         raise HTTPException(status_code=400, detail="Database error")
@@ -129,26 +348,18 @@ async def get_resources_by_employee(request: Request, employee_id: int):
 
 # --- GET /resources/location/{location_id} ---
 @router.get("/location/{location_id}")
-async def get_resources_by_location(request: Request, location_id: int):
+async def get_resources_by_location(location_id: int,
+                                    include_archived: bool = False,
+                                    ctx: RequestContext = Depends(_authenticated)):
     logger.event(f"GET /resources/location/{location_id}", level="info")
 
-    token = request.headers.get("Authorization")
-    logger.security(f"token: {token}", level="trace")
-    if not token:
-        logger.event("Returning error 401: no token", level="warning")
-        raise HTTPException(status_code=401, detail="Missing Authorization header")
-
-    await validate_request(request, token)
-    auth_result = await authenticate_request(request, token)
-    decoded = auth_result["decoded_payload"]
-    await authorize_request(request, decoded)
-
-    title = get_db_role(decoded.get("title", ""))
-    result = db.get_resource_by_location_id(location_id, title)
+    title = ctx.principal.role
+    result = db.get_resource_by_location_id(location_id, title,
+                                            include_archived=include_archived)
     if result[0] == 200:
         logger.event("Returning resources", level="info")
-        return JSONResponse(content=convert_bytes_to_strings(result[1]),
-                             status_code=status.HTTP_200_OK)
+        return FastJSONResponse(content=result[1],
+                                status_code=status.HTTP_200_OK)
     else:
         logger.event("Returning error 400", level="error")
         raise HTTPException(status_code=400, detail="Database error")
@@ -156,68 +367,160 @@ async def get_resources_by_location(request: Request, location_id: int):
 
 # --- POST /resources ---
 @router.post("/")
-async def post_resource(request: Request):
+async def post_resource(ctx: RequestContext = Depends(_authenticated)):
     logger.event("POST /resources", level="info")
 
-    token = request.headers.get("Authorization")
-    logger.security(f"token: {token}", level="trace")
-    if not token:
-        logger.event("Returning error 401: no token", level="warning")
-        raise HTTPException(status_code=401, detail="Missing Authorization header")
-
-    await validate_request(request, token)
-    auth_result = await authenticate_request(request, token)
-    decoded = auth_result["decoded_payload"]
-    await authorize_request(request, decoded)
-
-    body = await request.json()
+    body = ctx.body
     logger.event(f"body: {body}", level="trace")
 
     # Sanitize notes field
     if "notes" in body and body["notes"] is not None:
         body["notes"] = sanitize_data(body["notes"])
 
-    title = get_db_role(decoded.get("title", ""))
-    result = db.add_resource_asset(body, title)
+    title = ctx.principal.role
+    if write_coalescer.COALESCING_ENABLED:
+        # Flushed together with concurrent inserts as one multi-row INSERT
+        result, _ = await write_coalescer.coalescer.add(body, title)
+    else:
+        result = db.add_resource_asset(body, title)
     if result == 200:
         message = "Resource Added Successfully"
         logger.event(f"Returning success 200: {message}", level="info")
-        return JSONResponse(content=message, status_code=200)
+        return FastJSONResponse(content=message, status_code=200)
     elif result == 400:
         message = "Database error"
         logger.event(f"Returning error 400: {message}", level="error")
         raise HTTPException(status_code=400, detail=message)
 
 
+# --- POST /resources/audit/{location_id} ---
+MAX_AUDIT_TAGS = 100_000
+
+@router.post("/audit/{location_id}")
+async def audit_location(request: Request, location_id: int,
+                         ctx: RequestContext = Depends(_authenticated_stream)):
+    """
+    Reconciles a physical audit. The body is the streamed list of scanned
+    resource_ids (plain text, one per line or comma-separated); the response
+    lists missing, unexpected, misplaced and decommissioned assets.
+    """
+    logger.event(f"POST /resources/audit/{location_id}", level="info")
+
+    title = ctx.principal.role
+    if not auth.can_read(title):
+        logger.event("Returning error 401: user does not have read access", level="warning")
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    parser = audit.TagParser(max_tags=MAX_AUDIT_TAGS)
+    # Incremental, so a character split across two chunks still decodes
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    try:
+        async for chunk in request.stream():
+            parser.feed(decoder.decode(chunk))
+        parser.feed(decoder.decode(b"", final=True))
+    except UnicodeDecodeError as exc:
+        raise HTTPException(status_code=400, detail="Tag list must be UTF-8 text") from exc
+    except ValueError as exc:
+        logger.event(f"Returning error 413: {exc}", level="warning")
+        raise HTTPException(status_code=413, detail=str(exc)) from exc
+    scanned = parser.finish()
+    if not scanned:
+        raise HTTPException(status_code=400, detail="No scanned tags in request body")
+
+    report = await asyncio.to_thread(audit.reconcile_location, location_id, scanned)
+    if report is None:
+        logger.event("Returning error 400", level="error")
+        raise HTTPException(status_code=400, detail="Database error")
+
+    report["duplicates"] = parser.duplicates
+    logger.event(f"Returning audit report for location {location_id}", level="info")
+    return FastJSONResponse(content=report, status_code=status.HTTP_200_OK)
+
+
+# --- POST /resources/import ---
+MAX_IMPORT_BYTES = 200 * 1024 * 1024
+# Uploads are buffered in memory up to this size, then on disk
+IMPORT_SPOOL_BYTES = 8 * 1024 * 1024
+_IMPORT_CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": "xlsx",
+}
+
+@router.post("/import")
+async def import_resources(request: Request, format: str | None = None,
+                           ctx: RequestContext = Depends(_authenticated_stream)):
+    """
+    Creates assets from a spreadsheet sent as the raw request body (CSV or XLSX,
+    chosen by ?format= or the Content-Type). Rows that fail are listed in the
+    report and do not stop the import.
+    """
+    logger.event("POST /resources/import", level="info")
+
+    title = ctx.principal.role
+    if not auth.can_write(title):
+        logger.event("Returning error 401: user does not have write access", level="warning")
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    content_type = request.headers.get("Content-Type", "").split(";")[0].strip().lower()
+    file_format = (format or _IMPORT_CONTENT_TYPES.get(content_type, "")).lower()
+    if file_format not in asset_import.FORMATS:
+        raise HTTPException(status_code=415, detail="Send a CSV or XLSX file")
+
+    with tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_BYTES) as upload:
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > MAX_IMPORT_BYTES:
+                logger.event("Returning error 413: import file too large", level="warning")
+                raise HTTPException(status_code=413, detail="Import file too large")
+            upload.write(chunk)
+        upload.seek(0)
+
+        try:
+            report = await asyncio.to_thread(asset_import.import_assets, upload,
+                                             file_format, title)
+        except asset_import.ImportFileError as exc:
+            logger.event(f"Returning error 400: {exc}", level="warning")
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        except ImportError as exc:
+            logger.event("Returning error 415: openpyxl is not installed", level="error")
+            raise HTTPException(status_code=415, detail="XLSX import is not available") from exc
+
+    logger.event(f"Returning import report: {report['inserted']} inserted", level="info")
+    return FastJSONResponse(content=report, status_code=status.HTTP_200_OK)
+
+
 # --- PUT /resources/{id} ---
 @router.put("/{id}")
-async def update_resource(request: Request, id: int):
+async def update_resource(request: Request, id: int,
+                          ctx: RequestContext = Depends(_authenticated)):
     logger.event(f"PUT /resources/{id}", level="info")
 
-    token = request.headers.get("Authorization")
-    logger.security(f"token: {token}", level="trace")
-    if not token:
-        logger.event("Returning error 401: no token", level="warning")
-        raise HTTPException(status_code=401, detail="Missing Authorization header")
-
-    await validate_request(request, token)
-    auth_result = await authenticate_request(request, token)
-    decoded = auth_result["decoded_payload"]
-    await authorize_request(request, decoded)
-
-    body = await request.json()
+    body = ctx.body
     body["asset_id"] = id
 
     # Sanitize notes
     if "notes" in body and body["notes"] is not None:
         body["notes"] = sanitize_data(body["notes"])
 
-    title = get_db_role(decoded.get("title", ""))
-    result = db.update_resource(body, title)
+    title = ctx.principal.role
+    expected_version = _if_match_version(request)
+    if write_coalescer.COALESCING_ENABLED:
+        result = await write_coalescer.coalescer.update(body, title, expected_version,
+                                                        actor=ctx.principal.actor)
+    else:
+        result = db.update_resource(body, title, expected_version, ctx.principal.actor)
     if result == 200:
         message = f"Resource {id} updated successfully"
         logger.event(f"Returning success 200: {message}", level="info")
-        return JSONResponse(content={"message": message}, status_code=200)
+        headers = {}
+        if expected_version is not None:
+            headers["ETag"] = _etag(expected_version + 1)
+        return FastJSONResponse(content={"message": message}, status_code=200, headers=headers)
+    elif result == 412:
+        message = f"Resource {id} was modified by another request"
+        logger.event(f"Returning error 412: {message}", level="warning")
+        raise HTTPException(status_code=412, detail=message)
     else:
         message = "Database update failed"
         logger.event(f"Returning error 400 {message}", level="error")
@@ -225,26 +528,24 @@ async def update_resource(request: Request, id: int):
 
 # --- DELETE /resources/{id} ---
 @router.delete("/{id}")
-async def delete_resource(request: Request, id: int):
+async def delete_resource(request: Request, id: int,
+                          ctx: RequestContext = Depends(_authenticated)):
     logger.event(f"DELETE /resources/{id}", level="info")
 
-    token = request.headers.get("Authorization")
-    logger.security(f"token: {token}", level="trace")
-    if not token:
-        logger.event("Returning error 401: no token", level="warning")
-        raise HTTPException(status_code=401, detail="Missing Authorization header")
-
-    await validate_request(request, token)
-    auth_result = await authenticate_request(request, token)
-    decoded = auth_result["decoded_payload"]
-    await authorize_request(request, decoded)
-
-    title = get_db_role(decoded.get("title", ""))
-    result = db.delete_resource(id, title)
+    title = ctx.principal.role
+    expected_version = _if_match_version(request)
+    result = db.delete_resource(id, title, expected_version, ctx.principal.actor)
     if result == 200:
         message = "Resource deleted successfully"
         logger.event(f"Returning success 200: {message}", level="info")
-        return JSONResponse(content=message, status_code=200)
+        headers = {}
+        if expected_version is not None:
+            headers["ETag"] = _etag(expected_version + 1)
+        return FastJSONResponse(content=message, status_code=200, headers=headers)
+    elif result == 412:
+        message = f"Resource {id} was modified by another request"
+        logger.event(f"Returning error 412: {message}", level="warning")
+        raise HTTPException(status_code=412, detail=message)
     else:
         message = "Database delete failed"
         logger.event(f"Returning error 400 {message}", level="error")
@@ -252,32 +553,39 @@ async def delete_resource(request: Request, id: int):
     
     # --- GET /resources/employees ---
 @router.get("/employees/")
-async def get_employees(request: Request, q: str | None = None, limit: int = 250):
+async def get_employees(q: str | None = None, limit: int = 250,
+                        cursor: str | None = None,
+                        ctx: RequestContext = Depends(_authenticated)):
     """
     Returns a list of employees for dropdown menus.
-    Optional 'q' filters by name (case-insensitive substring match).
+    Optional 'q' filters by name (case-insensitive; prefix matches rank before
+    substring matches).
     Optional 'limit' caps number of results (default 250).
+    When more results exist, the X-Next-Cursor header holds the 'cursor' for the
+    next page.
     """
     logger.event("GET /resources/employees", level="info")
 
-    token = request.headers.get("Authorization")
-    logger.security(f"token: {token}", level="trace")
-    if not token:
-        logger.event("Returning error 401: no token", level="warning")
-        raise HTTPException(status_code=401, detail="Missing Authorization header")
-
-    await validate_request(request, token)
-    auth_result = await authenticate_request(request, token)
-    decoded = auth_result["decoded_payload"]
-    await authorize_request(request, decoded)
-
-    title = get_db_role(decoded.get("title", ""))
-
-    # Call to your teammate’s database layer
-    result = db.get_employees(title, q=q, limit=limit)
+    title = ctx.principal.role
+
+    headers = {}
+    if employee_index.index.loaded and auth.can_read(title):
+        # Served from the in-memory typeahead index, no database round trip
+        try:
+            employees, next_cursor = employee_index.index.search(
+                q, limit=max(1, min(limit, 1000)), cursor=cursor)
+        except ValueError as e:
+            logger.event(f"Returning error 400: {e}", level="warning")
+            raise HTTPException(status_code=400, detail="Invalid cursor") from e
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
+        result = (200, employees)
+    else:
+        # Call to your teammate’s database layer
+        result = db.get_employees(title, q=q, limit=limit)
 
     if result[0] == 200:
-        employees = convert_bytes_to_strings(result[1])
+        employees = result[1]
         trimmed = [
             {
                 "employee_id": e.get("id"),
@@ -287,37 +595,30 @@ async def get_employees(request: Request, q: str | None = None, limit: int = 250
             for e in employees
         ]
         logger.event(f"Returning {len(trimmed)} employees", level="info")
-        return JSONResponse(content=trimmed, status_code=status.HTTP_200_OK)
+        return FastJSONResponse(content=trimmed, status_code=status.HTTP_200_OK, headers=headers)
 
     logger.event("Returning error 400", level="error")
     raise HTTPException(status_code=400, detail="Database error")
 
 # --- GET /resources/locations ---
 @router.get("/locations/")
-async def get_locations(request: Request):
+async def get_locations(request: Request, ctx: RequestContext = Depends(_authenticated)):
     """
     Returns a list of locations for dropdown menus.
     """
     logger.event("GET /resources/locations", level="info")
 
-    token = request.headers.get("Authorization")
-    logger.security(f"token: {token}", level="trace")
-    if not token:
-        logger.event("Returning error 401: no token", level="warning")
-        raise HTTPException(status_code=401, detail="Missing Authorization header")
-
-    await validate_request(request, token)
-    auth_result = await authenticate_request(request, token)
-    decoded = auth_result["decoded_payload"]
-    await authorize_request(request, decoded)
-
-    title = get_db_role(decoded.get("title", ""))
+    title = ctx.principal.role
+    cached = reference_responses.get(("locations", title))
+    if cached is not None:
+        logger.event("Returning cached locations", level="info")
+        return cached.response(request)
 
     # Call to your teammate’s database layer
     result = db.get_resource_locations(title)
 
     if _is_ok(result):
-        locations = convert_bytes_to_strings(_data(result))
+        locations = _data(result)
         trimmed = [
             {
                 "id": loc.get("id"),
@@ -330,7 +631,8 @@ async def get_locations(request: Request):
             for loc in locations
         ]
         logger.event(f"Returning {len(trimmed)} locations", level="info")
-        return JSONResponse(content=trimmed, status_code=status.HTTP_200_OK)
+        cached = compression.Precompressed(dumps(trimmed))
+        return reference_responses.put(("locations", title), cached).response(request)
 
     logger.event("Returning error 400", level="error")
     raise HTTPException(status_code=400, detail="Database error")
@@ -0,0 +1,225 @@
+"""
+Session Tokens Module
+
+Short-lived session tokens issued by this backend after a successful SSO
+login, so later requests are authenticated with one in-process HMAC check
+instead of a call to the SSO.
+
+A session token is an HS256 JWT signed with a key only this backend holds:
+    sub, username   who logged in
+    title, role     the SSO title and the Role it resolved to at login
+    sid             session id, kept across refreshes
+    jti             token id, new for every token
+    auth_time       when the SSO login happened
+    iat, exp        issue time and expiry (ttl_seconds)
+
+/api/auth/refresh swaps a token for a new one in the same session, also shortly
+after it expired (refresh_grace_seconds), until the session reaches
+max_session_seconds; the SSO is not asked again. The old token is revoked.
+/api/auth/logout revokes the whole session.
+
+Revocation uses an in-memory deny-list of token and session ids. Each entry is
+kept only until the latest time the id could still be accepted, so the list
+holds just the revocations of the last max_session_seconds. It is per process:
+with several backend replicas, a revoked token stays valid on the others
+until it expires, which ttl_seconds bounds.
+
+Configuration (config.ini, all optional):
+    [session]
+    enabled = false
+    secret_path = ./env/session_key
+    issuer = inventory-backend
+    ttl_seconds = 900
+    refresh_grace_seconds = 3600
+    max_session_seconds = 43200
+
+Without a readable secret_path a random key is generated at startup, so
+sessions do not survive a restart and cannot be shared between replicas.
+
+Example usage:
+    from src.api.session_tokens import sessions
+
+    token, expires_in = sessions.issue({"username": "jdoe", "title": "Manager"})
+    claims = sessions.verify(token)     # None if not a session token
+    sessions.revoke(claims)
+"""
+
+import configparser
+import secrets
+import threading
+import time
+import uuid
+import jwt
+from src.api.authorize import get_db_role
+from src.logger import logger
+
+config = configparser.ConfigParser()
+config.read('./config.ini')
+
+SESSION_ENABLED = config.getboolean('session', 'enabled', fallback=False)
+SECRET_PATH = config.get('session', 'secret_path', fallback='./env/session_key')
+ISSUER = config.get('session', 'issuer', fallback='inventory-backend')
+TTL_SECONDS = config.getint('session', 'ttl_seconds', fallback=900)
+REFRESH_GRACE_SECONDS = config.getint('session', 'refresh_grace_seconds', fallback=3600)
+MAX_SESSION_SECONDS = config.getint('session', 'max_session_seconds', fallback=43_200)
+ALGORITHM = "HS256"
+
+
+class SessionExpired(jwt.InvalidTokenError):
+    """The session reached max_session_seconds or its refresh grace ran out."""
+
+
+class SessionRevoked(jwt.InvalidTokenError):
+    """The token or its session was revoked (refresh or logout)."""
+
+
+class DenyList:
+    """Revoked token and session ids, each kept until it could no longer be accepted."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}       # id -> epoch seconds after which it can be forgotten
+        self._next_prune = 0.0
+
+    def add(self, revoked_id: str, until: float):
+        with self._lock:
+            self._entries[revoked_id] = max(until, self._entries.get(revoked_id, 0.0))
+            self._prune(time.time())
+
+    def __contains__(self, revoked_id: str) -> bool:
+        with self._lock:
+            until = self._entries.get(revoked_id)
+            return until is not None and until > time.time()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _prune(self, now: float):
+        if now < self._next_prune:
+            return
+        self._entries = {key: until for key, until in self._entries.items() if until > now}
+        self._next_prune = now + 60
+
+
+def _load_secret(path: str) -> bytes:
+    try:
+        with open(path, "rb") as f:
+            secret = f.read().strip()
+        if len(secret) >= 32:
+            return secret
+        logger.security(f"Session key in {path} is shorter than 32 bytes; ignoring it",
+                        level="warning")
+    except OSError:
+        logger.security(f"No session key at {path}; using a per-process key", level="warning")
+    return secrets.token_bytes(32)
+
+
+class SessionTokens:
+    """Issues, verifies, refreshes and revokes session tokens."""
+
+    def __init__(self, secret: bytes | None = None, issuer: str = ISSUER,
+                 ttl_seconds: int = TTL_SECONDS, refresh_grace_seconds: int = REFRESH_GRACE_SECONDS,
+                 max_session_seconds: int = MAX_SESSION_SECONDS, enabled: bool = SESSION_ENABLED):
+        self.secret = secret if secret is not None else (
+            _load_secret(SECRET_PATH) if enabled else secrets.token_bytes(32))
+        self.issuer = issuer
+        self.ttl_seconds = ttl_seconds
+        self.refresh_grace_seconds = refresh_grace_seconds
+        self.max_session_seconds = max_session_seconds
+        self.enabled = enabled
+        self.denied = DenyList()
+
+    def _encode(self, claims: dict) -> tuple[str, int]:
+        now = int(time.time())
+        session_end = claims["auth_time"] + self.max_session_seconds
+        expires = min(now + self.ttl_seconds, session_end)
+        claims = {**claims, "iss": self.issuer, "iat": now, "exp": expires,
+                  "jti": uuid.uuid4().hex}
+        return jwt.encode(claims, self.secret, algorithm=ALGORITHM), expires - now
+
+    def issue(self, user: dict) -> tuple[str, int]:
+        """
+        Starts a session for an SSO-verified user.
+
+        Args:
+            user (dict): SSO user info; the identity is taken from username,
+                email, sub or id and the role is resolved from title.
+
+        Returns:
+            tuple: (token, seconds until it expires)
+        """
+        identity = next((str(user[claim]) for claim in ("username", "email", "sub", "id")
+                         if user.get(claim)), None)
+        title = str(user.get("title") or "")
+        claims = {"sub": identity, "username": identity, "title": title,
+                  "role": get_db_role(title).value, "sid": uuid.uuid4().hex,
+                  "auth_time": int(time.time())}
+        return self._encode(claims)
+
+    def is_session_token(self, token: str) -> bool:
+        """True if token claims to come from this backend (nothing is verified yet)."""
+        try:
+            if jwt.get_unverified_header(token).get("alg") != ALGORITHM:
+                return False
+            unverified = jwt.decode(token, options={"verify_signature": False})
+        except jwt.InvalidTokenError:
+            return False
+        return unverified.get("iss") == self.issuer
+
+    def _decode(self, token: str, leeway: float = 0) -> dict:
+        claims = jwt.decode(token, self.secret, algorithms=[ALGORITHM], issuer=self.issuer,
+                            leeway=leeway,
+                            options={"require": ["exp", "iat", "jti", "sid", "auth_time"]})
+        if claims["jti"] in self.denied or claims["sid"] in self.denied:
+            raise SessionRevoked("Session token has been revoked")
+        return claims
+
+    def verify(self, token: str) -> dict | None:
+        """
+        Verifies a session token in-process.
+
+        Returns:
+            dict: Its claims, or None if token is not a session token.
+
+        Raises:
+            jwt.InvalidTokenError: If it is one but is forged, expired or revoked.
+        """
+        if not self.is_session_token(token):
+            return None
+        return self._decode(token)
+
+    def refresh(self, token: str) -> tuple[str, int]:
+        """
+        Replaces a session token, valid or expired within the refresh grace,
+        with a new one for the same session, and revokes the old one.
+
+        Raises:
+            jwt.InvalidTokenError: If the token cannot be refreshed.
+        """
+        claims = self._decode(token, leeway=self.refresh_grace_seconds)
+        if time.time() >= claims["auth_time"] + self.max_session_seconds:
+            raise SessionExpired("Session has reached its maximum age")
+        self.revoke(claims, session=False)
+        fresh = {key: claims[key] for key in ("sub", "username", "title", "role", "sid", "auth_time")
+                 if key in claims}
+        return self._encode(fresh)
+
+    def logout(self, token: str):
+        """
+        Revokes the session of token (also if expired within the refresh grace).
+
+        Raises:
+            jwt.InvalidTokenError: If token is not a valid session token.
+        """
+        self.revoke(self._decode(token, leeway=self.refresh_grace_seconds))
+
+    def revoke(self, claims: dict, session: bool = True):
+        """Denies the token (and with session=True every token of its session)."""
+        # A token id can be refreshed until exp + grace; a session until it ends
+        self.denied.add(claims["jti"], claims["exp"] + self.refresh_grace_seconds)
+        if session:
+            self.denied.add(claims["sid"], claims["auth_time"] + self.max_session_seconds
+                            + self.refresh_grace_seconds)
+
+
+sessions = SessionTokens()
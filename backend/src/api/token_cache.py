@@ -0,0 +1,218 @@
+"""
+Token Cache Module
+
+Remembers the outcome of SSO token verification so authenticate_request does
+not make an outbound call for every request.
+
+Entries are keyed by the SHA-256 of the token (raw tokens are never stored)
+and held in an LRU of max_entries:
+    accepted tokens   cached for ttl_seconds, but never past the token's own
+                      exp claim when it has one
+    rejected tokens   cached for negative_ttl_seconds, so a client retrying a
+                      bad token does not hammer the SSO
+An unreachable SSO is not cached. Concurrent verifications of the same token
+share one outbound call (single flight).
+
+Grace window: an accepted entry is kept grace_seconds past its TTL (never past
+the token's exp). While the SSO cannot be reached (the verify call raises, e.g.
+because its circuit breaker is open), such a recently verified token is still
+accepted; tokens never seen before, or rejected ones, are not.
+
+Note that a token revoked at the SSO keeps working here until its entry
+expires, which is why ttl_seconds is short.
+
+Configuration (config.ini, all optional):
+    [token_cache]
+    enabled = true
+    max_entries = 10000
+    ttl_seconds = 60
+    negative_ttl_seconds = 5
+    grace_seconds = 300
+
+Example usage:
+    from src.api.token_cache import cache
+
+    payload = await cache.verify(token_value, call_sso)   # None if rejected
+    cache.metrics()   # {"hits": ..., "hit_rate": ..., "sso_latency_ms": {...}}
+"""
+
+import asyncio
+import base64
+import collections
+import configparser
+import hashlib
+import json
+import time
+
+config = configparser.ConfigParser()
+config.read('./config.ini')
+
+TOKEN_CACHE_ENABLED = config.getboolean('token_cache', 'enabled', fallback=False)
+MAX_ENTRIES = config.getint('token_cache', 'max_entries', fallback=10_000)
+TTL_SECONDS = config.getfloat('token_cache', 'ttl_seconds', fallback=60.0)
+NEGATIVE_TTL_SECONDS = config.getfloat('token_cache', 'negative_ttl_seconds', fallback=5.0)
+GRACE_SECONDS = config.getfloat('token_cache', 'grace_seconds', fallback=300.0)
+LATENCY_SAMPLES = 1000
+
+
+def token_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def token_expiry(token: str, payload: dict | None = None) -> float | None:
+    """
+    The token's exp claim (epoch seconds): from the verified payload if present,
+    else read from the JWT body. The value only ever shortens a cache entry, so
+    reading it without checking the signature is safe.
+    """
+    exp = (payload or {}).get("exp")
+    if exp is None:
+        parts = token.split(".")
+        if len(parts) != 3:
+            return None
+        try:
+            body = parts[1] + "=" * (-len(parts[1]) % 4)
+            exp = json.loads(base64.urlsafe_b64decode(body)).get("exp")
+        except (ValueError, AttributeError):
+            return None
+    try:
+        return float(exp)
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenCache:
+    """LRU of verification outcomes with single-flight verification."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, ttl_seconds: float = TTL_SECONDS,
+                 negative_ttl_seconds: float = NEGATIVE_TTL_SECONDS,
+                 grace_seconds: float = GRACE_SECONDS, enabled: bool = TOKEN_CACHE_ENABLED):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.grace_seconds = grace_seconds
+        self.enabled = enabled
+        # key -> (monotonic fresh-until, payload or None, monotonic keep-until)
+        self._entries = collections.OrderedDict()
+        self._inflight = {}                          # key -> asyncio.Task
+        self._latencies = collections.deque(maxlen=LATENCY_SAMPLES)
+        self.hits = self.negative_hits = self.misses = self.coalesced = 0
+        self.evictions = self.sso_calls = self.sso_errors = self.grace_hits = 0
+
+    def _lookup(self, key: str):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[2] <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key: str, token: str, payload: dict | None):
+        if payload is None:
+            ttl = keep = self.negative_ttl_seconds
+        else:
+            ttl, keep = self.ttl_seconds, self.ttl_seconds + self.grace_seconds
+            exp = token_expiry(token, payload)
+            if exp is not None:
+                ttl, keep = min(ttl, exp - time.time()), min(keep, exp - time.time())
+        if keep <= 0:
+            return
+        now = time.monotonic()
+        self._entries[key] = (now + ttl, payload, now + keep)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def _load(self, key: str, token: str, verify):
+        started = time.monotonic()
+        self.sso_calls += 1
+        try:
+            payload = await verify(token)
+        except Exception:
+            self.sso_errors += 1
+            raise
+        finally:
+            self._latencies.append((time.monotonic() - started) * 1000.0)
+            self._inflight.pop(key, None)
+        if self.enabled:
+            self._store(key, token, payload)
+        return payload
+
+    async def verify(self, token: str, verify) -> dict | None:
+        """
+        Returns the verified payload for token, or None if the SSO rejected it.
+
+        Args:
+            token (str): The bearer token without its "Bearer " prefix.
+            verify: Coroutine function token -> payload dict, or None when the
+                token is rejected. Exceptions (SSO unreachable) propagate to
+                every waiter, except those holding a token within its grace
+                window, and are not cached.
+        """
+        key = token_key(token)
+        stale = None
+        if self.enabled:
+            entry = self._lookup(key)
+            if entry is not None and entry[0] > time.monotonic():
+                if entry[1] is None:
+                    self.negative_hits += 1
+                    return None
+                self.hits += 1
+                return dict(entry[1])
+            if entry is not None:
+                stale = entry[1]        # past its TTL, within the grace window
+        self.misses += 1
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, token, verify))
+            self._inflight[key] = task
+        else:
+            self.coalesced += 1
+        try:
+            # shield: a caller that goes away must not cancel the call others wait on
+            return await asyncio.shield(task)
+        except Exception:
+            if stale is None:
+                raise
+            self.grace_hits += 1
+            return dict(stale)
+
+    def invalidate(self, token: str | None = None):
+        """Forgets one token, or every token when called without one."""
+        if token is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(token_key(token), None)
+
+    def metrics(self) -> dict:
+        lookups = self.hits + self.negative_hits + self.misses
+        latencies = sorted(self._latencies)
+
+        def percentile(p):
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 2)
+
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "hit_rate": round((self.hits + self.negative_hits) / lookups, 4) if lookups else None,
+            "sso_calls": self.sso_calls,
+            "sso_errors": self.sso_errors,
+            "grace_hits": self.grace_hits,
+            "sso_latency_ms": {"p50": percentile(0.50), "p95": percentile(0.95),
+                               "p99": percentile(0.99),
+                               "max": round(latencies[-1], 2) if latencies else None},
+        }
+
+
+cache = TokenCache()
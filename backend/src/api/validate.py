@@ -2,12 +2,15 @@ from fastapi import HTTPException, Request
 from src.security import data_validation
 from src.logger import logger
 
-async def validate_request(request: Request, token: str):
+async def validate_request(request: Request, token: str, validate_body: bool = True):
     """
     Validates an incoming API request.
     - Ensures token format is valid.
     - Validates body fields for POST and PUT requests.
     - Enforces XOR rule: exactly one of location_id or employee_id must be provided.
+    Routes whose body is not an asset (e.g. a streamed upload) pass validate_body=False
+    so the body is left unread for the route to consume.
+    The parsed body is returned under "body" so the route does not parse it again.
     Raises HTTPException on validation failure.
     """
 
@@ -15,8 +18,9 @@ async def validate_request(request: Request, token: str):
         logger.event("Invalid token", level="warning")
         raise HTTPException(status_code=401, detail="Missing or invalid Authorization header")
 
+    body = None
     # --- Step 2: For POST/PUT, validate JSON body against schema ---
-    if request.method in ["POST", "PUT"]:
+    if validate_body and request.method in ["POST", "PUT"]:
         logger.event("Validating request body", level="info")
         try:
             body = await request.json()
@@ -35,5 +39,6 @@ async def validate_request(request: Request, token: str):
     logger.event("Validation succeeded", level="info")
     return {
         "status": "valid",
-        "method": request.method
+        "method": request.method,
+        "body": body
     }
@@ -1,10 +1,61 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from src.analytics import asset_analytics
 from src.api.assets import router as assets_router
+from src.api import compression
+from src.api import http_client
+from src.api import jwt_verifier
+from src.api import pipeline
+from src.api.responses import FastJSONResponse
 from src.api.health import router as health_router
 from src.api.routes import resources
 from src.api.routes.auth_proxy import router as auth_proxy_router
 from src.api.pages import router as pages
+from src.database import archive
+from src.database import asset_history
+from src.database import asset_read_model
+from src.database import database_controller
+from src.database import employee_index
+from src.database import inventory_summary
+from src.database import reference_data
+from src.database import shards
+from src.database import write_coalescer
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """Starts the background jobs when the app starts and stops them on shutdown."""
+    http_client.start()
+    tasks = []
+    if jwt_verifier.JWT_ENABLED:
+        tasks.append(asyncio.create_task(jwt_verifier.run_refresher()))
+    if archive.ARCHIVE_ENABLED:
+        tasks.append(asyncio.create_task(archive.run_archiver()))
+    if inventory_summary.RECONCILE_ENABLED:
+        tasks.append(asyncio.create_task(inventory_summary.run_reconciler()))
+    if employee_index.INDEX_ENABLED:
+        tasks.append(asyncio.create_task(employee_index.run_refresher()))
+    database_controller.add_reference_listener(resources.reference_responses.invalidate)
+    database_controller.add_reference_listener(reference_data.cache.invalidate)
+    # Deleted and archived assets leave the analytics columns on the next refresh
+    database_controller.add_write_listener(asset_analytics.store.source.on_write)
+    if asset_read_model.READ_MODEL_ENABLED:
+        database_controller.add_write_listener(asset_read_model.model.on_write)
+        tasks.append(asyncio.create_task(asset_read_model.run_refresher()))
+    if asset_history.HISTORY_ENABLED:
+        tasks.append(asyncio.create_task(asset_history.run_writer()))
+    yield
+    await write_coalescer.coalescer.drain()
+    database_controller.remove_write_listener(asset_read_model.model.on_write)
+    database_controller.remove_write_listener(asset_analytics.store.source.on_write)
+    database_controller.remove_reference_listener(resources.reference_responses.invalidate)
+    database_controller.remove_reference_listener(reference_data.cache.invalidate)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    shards.router.close()
+    await http_client.close()
 
 def create_app() -> FastAPI:
     app = FastAPI(
@@ -12,6 +63,8 @@ def create_app() -> FastAPI:
         description="Listens for GET, POST, PUT, DELETE requests" \
         ", validates tokens, and authorizes by role.",
         version="1.0.0",
+        lifespan=lifespan,
+        default_response_class=FastJSONResponse,
     )
     
     # Add CORS middleware BEFORE including routes
@@ -21,7 +74,12 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["ETag", "X-Next-Cursor", "Server-Timing"],
     )
+    # Reports the auth pipeline stage timings of each request
+    app.add_middleware(pipeline.ServerTimingMiddleware)
+    if compression.COMPRESSION_ENABLED:
+        app.add_middleware(compression.CompressionMiddleware)
     
     app.include_router(health_router)
     app.include_router(auth_proxy_router)
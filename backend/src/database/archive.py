@@ -0,0 +1,134 @@
+"""
+Asset Archive Module
+
+Moves assets that were decommissioned long ago out of the active Asset table and into
+AssetArchive, so listings and lookups only scan the active set. Archived rows remain
+readable through the include_archived option of the database_controller read functions.
+
+Rows are moved in chunks: each batch locks up to batch_size eligible rows, copies them
+into AssetArchive and deletes them from Asset in one transaction, so a batch is either
+fully archived or not at all and concurrent writers are only blocked briefly.
+
+Configuration (config.ini, all optional):
+    [archive]
+    enabled = true
+    decommissioned_age_days = 365
+    batch_size = 500
+    interval_seconds = 3600
+
+Example usage:
+    from src.database import archive
+
+    moved = archive.archive_decommissioned_assets()   # one full pass
+    asyncio.create_task(archive.run_archiver())       # background loop
+"""
+
+import asyncio
+import configparser
+from src.database import shards
+from src.database.database_controller import ASSET_COLUMNS, notify_asset_write
+from src.query.builders import build_in_clause
+from src.logger import logger
+
+config = configparser.ConfigParser()
+config.read('./config.ini')
+
+ARCHIVE_ENABLED = config.getboolean('archive', 'enabled', fallback=False)
+DECOMMISSIONED_AGE_DAYS = config.getint('archive', 'decommissioned_age_days', fallback=365)
+BATCH_SIZE = config.getint('archive', 'batch_size', fallback=500)
+INTERVAL_SECONDS = config.getint('archive', 'interval_seconds', fallback=3600)
+
+
+def archive_batch(
+        older_than_days: int = DECOMMISSIONED_AGE_DAYS,
+        batch_size: int = BATCH_SIZE,
+        shard: shards.Shard | None = None
+        ) -> int | None:
+    """
+    Archives one chunk of assets decommissioned more than older_than_days ago.
+
+    Args:
+        older_than_days (int): Minimum age of the decommission in days.
+        batch_size (int): Maximum number of rows to move.
+        shard (Shard, optional): Shard to archive on; the default shard if omitted.
+
+    Returns:
+        int: Number of rows moved, or None if the transaction failed.
+    """
+    select_query = """
+    SELECT id FROM Asset
+    WHERE is_decommissioned = 1
+      AND decommission_date < NOW() - INTERVAL :older_than_days DAY
+    ORDER BY id
+    LIMIT :batch_size
+    FOR UPDATE SKIP LOCKED;
+    """
+    params = {
+        "older_than_days": older_than_days,
+        "batch_size": batch_size
+    }
+
+    def work(run):
+        ids = [row["id"] for row in run(select_query, params)]
+        if not ids:
+            return 0
+        in_clause, id_params = build_in_clause("asset_id", ids)
+        run(f"""
+            INSERT INTO AssetArchive ({ASSET_COLUMNS}, archived_at)
+            SELECT {ASSET_COLUMNS}, NOW(6) FROM Asset
+            WHERE id {in_clause};
+            """, id_params)
+        run(f"DELETE FROM Asset WHERE id {in_clause};", id_params)
+        archived.extend(ids)
+        return len(ids)
+
+    archived = []
+    logger.event(f"Archiving batch with params: {params}", level="trace")
+    moved = (shard or shards.router.default).execute_transaction(work)
+    if moved is None:
+        logger.event("Failed to archive batch of decommissioned assets", level="error")
+    elif archived:
+        notify_asset_write(archived)
+    return moved
+
+
+def archive_decommissioned_assets(
+        older_than_days: int = DECOMMISSIONED_AGE_DAYS,
+        batch_size: int = BATCH_SIZE
+        ) -> int:
+    """
+    Archives eligible assets batch by batch until a short batch signals the end,
+    on every shard (each keeps its own AssetArchive).
+
+    Returns:
+        int: Total number of rows moved to AssetArchive.
+    """
+    logger.event("archive_decommissioned_assets called", level="trace")
+    total = 0
+    for shard in shards.router.all():
+        while True:
+            moved = archive_batch(older_than_days, batch_size, shard)
+            if not moved:
+                break
+            total += moved
+            if moved < batch_size:
+                break
+    if total:
+        logger.event(f"Archived {total} decommissioned assets", level="info")
+    return total
+
+
+async def run_archiver(interval_seconds: int = INTERVAL_SECONDS):
+    """
+    Background loop that runs an archive pass every interval_seconds.
+
+    The blocking database work runs in a worker thread so the event loop
+    keeps serving requests.
+    """
+    logger.event("Asset archiver started", level="info")
+    while True:
+        try:
+            await asyncio.to_thread(archive_decommissioned_assets)
+        except Exception as e:  # keep the loop alive; the next pass retries
+            logger.event(f"Asset archiver pass failed: {e}", level="error")
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,193 @@
+"""
+Asset History Module
+
+Append-only record of asset changes in the AssetHistory table: for every
+update or delete, the asset id, the action, who made it, when, and the before
+and after values of the columns that changed.
+
+Entries are recorded in memory by the write path (database_controller) after
+its transaction commits and inserted by a background loop, batch_size rows per
+multi-row INSERT, so PUT and DELETE do not wait on a history write. If the
+database is unavailable the entries are kept and retried; beyond max_pending
+the oldest are dropped (and logged) so memory stays bounded.
+
+Configuration (config.ini, all optional):
+    [history]
+    enabled = true
+    flush_interval_seconds = 1
+    batch_size = 500
+    max_pending = 100000
+
+Example usage:
+    from src.database.asset_history import writer
+
+    writer.record(7, "update", before_row, {"location_id": 4}, actor="jdoe")
+    writer.flush()
+"""
+
+import asyncio
+import collections
+import configparser
+import datetime
+import json
+import threading
+from src.database import database_connector
+from src.database.inventory_summary import decommissioned_flag
+from src.logger import logger
+
+config = configparser.ConfigParser()
+config.read('./config.ini')
+
+HISTORY_ENABLED = config.getboolean('history', 'enabled', fallback=False)
+FLUSH_INTERVAL_SECONDS = config.getfloat('history', 'flush_interval_seconds', fallback=1.0)
+BATCH_SIZE = config.getint('history', 'batch_size', fallback=500)
+MAX_PENDING = config.getint('history', 'max_pending', fallback=100_000)
+
+UPDATE = "update"
+DELETE = "delete"
+
+HISTORY_COLUMNS = "id, asset_id, action, actor, changed_at, before_values, after_values"
+
+
+def _comparable(column: str, value):
+    if column == "is_decommissioned" and value is not None:
+        return decommissioned_flag(value)
+    return value
+
+
+def diff(before: dict, assigned: dict) -> tuple[dict, dict]:
+    """
+    Returns (before values, after values) of the assigned columns whose value
+    actually changes, plus the row version.
+    """
+    old, new = {}, {}
+    for column, value in assigned.items():
+        previous = _comparable(column, before.get(column))
+        if previous != _comparable(column, value):
+            old[column], new[column] = previous, value
+    if before.get("version") is not None:
+        old["version"], new["version"] = before["version"], before["version"] + 1
+    return old, new
+
+
+class HistoryWriter:
+    """Buffers history entries and inserts them in batches."""
+
+    def __init__(self, batch_size: int = BATCH_SIZE, max_pending: int = MAX_PENDING,
+                 enabled: bool = HISTORY_ENABLED):
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.enabled = enabled
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._pending = collections.deque()
+
+    def record(self, asset_id: int, action: str, before: dict, assigned: dict,
+               actor: str | None = None):
+        """Queues one history entry; never touches the database."""
+        if not self.enabled:
+            return
+        old, new = diff(before, assigned)
+        entry = {
+            "asset_id": asset_id,
+            "action": action,
+            "actor": actor[:255] if actor else None,
+            "changed_at": datetime.datetime.now(),
+            "before_values": json.dumps(old, default=str),
+            "after_values": json.dumps(new, default=str),
+        }
+        with self._lock:
+            self._pending.append(entry)
+            if len(self._pending) > self.max_pending:
+                self._pending.popleft()
+                self.dropped += 1
+                logger.event(f"Asset history buffer full, dropped an entry "
+                             f"({self.dropped} so far)", level="error")
+
+    def pending_for(self, asset_id: int) -> list[dict]:
+        """Entries for asset_id not yet written, oldest first."""
+        with self._lock:
+            return [dict(entry) for entry in self._pending if entry["asset_id"] == asset_id]
+
+    def _insert(self, batch: list[dict]) -> bool:
+        rows, params = [], {}
+        for i, entry in enumerate(batch):
+            rows.append(f"(:asset_id_{i}, :action_{i}, :actor_{i}, :changed_at_{i}, "
+                        f":before_values_{i}, :after_values_{i})")
+            for column, value in entry.items():
+                params[f"{column}_{i}"] = value
+        insert_query = f"""
+        INSERT INTO AssetHistory (asset_id, action, actor, changed_at, before_values, after_values)
+        VALUES {", ".join(rows)};
+        """
+        return database_connector.execute_query(insert_query, params) is not None
+
+    def flush(self) -> int:
+        """
+        Inserts everything queued so far in batches of batch_size.
+
+        Returns:
+            int: Entries written. A failed batch is put back for the next flush.
+        """
+        written = 0
+        while True:
+            with self._lock:
+                count = min(self.batch_size, len(self._pending))
+                batch = [self._pending.popleft() for _ in range(count)]
+            if not batch:
+                return written
+            if not self._insert(batch):
+                with self._lock:
+                    self._pending.extendleft(reversed(batch))
+                logger.event(f"Asset history flush failed, {len(batch)} entries kept",
+                             level="error")
+                return written
+            written += len(batch)
+            logger.event(f"Wrote {len(batch)} asset history entries", level="trace")
+
+
+def get_history(asset_id: int, limit: int = 100, before_id: int | None = None) -> list[dict] | None:
+    """
+    Reads the stored history of one asset, newest first.
+
+    Returns:
+        list[dict]: Entries with before/after decoded, or None on a database error.
+    """
+    params = {"asset_id": asset_id, "limit": limit}
+    where = "asset_id = :asset_id"
+    if before_id is not None:
+        where += " AND id < :before_id"
+        params["before_id"] = before_id
+    rows = database_connector.execute_query(
+        f"SELECT {HISTORY_COLUMNS} FROM AssetHistory WHERE {where} "
+        f"ORDER BY id DESC LIMIT :limit;", params)
+    if rows is None:
+        return None
+    return [decode(row) for row in rows]
+
+
+def decode(entry: dict) -> dict:
+    """Turns a stored or pending entry into the API shape."""
+    def values(raw):
+        return json.loads(raw) if isinstance(raw, (str, bytes)) else raw
+    return {"id": entry.get("id"), "asset_id": entry["asset_id"], "action": entry["action"],
+            "actor": entry["actor"], "changed_at": entry["changed_at"],
+            "before": values(entry["before_values"]), "after": values(entry["after_values"])}
+
+
+async def run_writer(interval_seconds: float = FLUSH_INTERVAL_SECONDS):
+    """Background loop flushing the history buffer."""
+    logger.event("Asset history writer started", level="info")
+    try:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await asyncio.to_thread(writer.flush)
+            except Exception as e:  # keep the loop alive; the next pass retries
+                logger.event(f"Asset history flush failed: {e}", level="error")
+    finally:
+        # Shutdown: write what is left so committed changes keep their history
+        await asyncio.to_thread(writer.flush)
+
+
+writer = HistoryWriter()
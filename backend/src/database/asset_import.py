@@ -0,0 +1,237 @@
+"""
+Asset Import Module
+
+Bulk-loads assets from an uploaded CSV or XLSX spreadsheet.
+
+The file is read row by row (csv.reader, or openpyxl in read-only mode) and
+handled in chunks of chunk_size rows: type and location names are resolved to
+ids from the cached reference data (src.database.reference_data), the chunk's
+notes are sanitized (sanitize_batch), the chunk is validated in one pass
+(batch_validation) and the valid rows are written with one multi-row INSERT
+(database_controller.add_resource_assets).
+Only the current chunk is held in memory, so a 500k-row file costs no more
+than a 1k-row one apart from time. A row that fails is reported and skipped;
+the import carries on.
+
+Columns are matched by header name, case-insensitively:
+    type or type_id           asset type name or id (required)
+    location or location_id   location id, city or street
+    employee_id               assignee id (exactly one of location/employee)
+    notes                     free text (sanitized like POST /resources/)
+    is_decommissioned         0/1, true/false or yes/no (default 0)
+
+Configuration (config.ini, all optional):
+    [import]
+    chunk_size = 1000
+    max_errors = 1000
+
+Example usage:
+    from src.database import asset_import
+
+    with open("inventory.csv", "rb") as f:
+        report = asset_import.import_assets(f, "csv", auth.Role.MANAGER)
+    # {"rows": 3, "inserted": 2, "failed": 1, "errors": [{"row": 4, "error": "..."}], ...}
+"""
+
+import configparser
+import csv
+import io
+from src.database import database_controller
+from src.database import reference_data
+from src.security.data_validation import batch_validation
+from src.security.sanitize import sanitize_batch
+import src.database.authorize as auth
+from src.logger import logger
+
+config = configparser.ConfigParser()
+config.read('./config.ini')
+
+IMPORT_CHUNK_SIZE = config.getint('import', 'chunk_size', fallback=1000)
+MAX_REPORTED_ERRORS = config.getint('import', 'max_errors', fallback=1000)
+
+FORMATS = ("csv", "xlsx")
+_ALIASES = {"type": "type_id", "location": "location_id"}
+_COLUMNS = ("type_id", "location_id", "employee_id", "notes", "is_decommissioned")
+_FLAGS = {"0": 0, "1": 1, "false": 0, "true": 1, "no": 0, "yes": 1}
+
+
+class ImportFileError(ValueError):
+    """Raised when the uploaded file cannot be read as an asset spreadsheet."""
+
+
+def _csv_rows(file):
+    # utf-8-sig drops the byte order mark Excel writes at the start of CSVs
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        yield from csv.reader(text)
+    except (UnicodeDecodeError, csv.Error) as exc:
+        raise ImportFileError(f"Unreadable CSV: {exc}") from exc
+    finally:
+        text.detach()
+
+
+def _xlsx_rows(file):
+    # Imported here so openpyxl is only needed by deployments that take XLSX
+    import openpyxl
+    try:
+        workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+    except Exception as exc:
+        raise ImportFileError(f"Unreadable XLSX: {exc}") from exc
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def _header(cells) -> dict[str, int]:
+    positions = {}
+    for i, cell in enumerate(cells):
+        name = str(cell or "").strip().lower()
+        name = _ALIASES.get(name, name)
+        if name in _COLUMNS and name not in positions:
+            positions[name] = i
+    if "type_id" not in positions:
+        raise ImportFileError("Header row needs a type or type_id column")
+    if "location_id" not in positions and "employee_id" not in positions:
+        raise ImportFileError("Header row needs a location or employee_id column")
+    return positions
+
+
+def _blank(value) -> bool:
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def _integer(column: str, value) -> int | None:
+    if _blank(value):
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return int(value)     # spreadsheet numbers arrive as floats
+    try:
+        return int(str(value).strip())
+    except ValueError as exc:
+        raise ValueError(f"{column} must be an integer, got '{value}'") from exc
+
+
+def _to_resource(cells, positions: dict[str, int]) -> dict:
+    """Converts one spreadsheet row into an asset dict; raises ValueError/LookupError."""
+    values = {column: (cells[i] if i < len(cells) else None) for column, i in positions.items()}
+    if _blank(values.get("type_id")):
+        raise ValueError("type is required")
+    resource = {
+        "type_id": reference_data.cache.resolve_type(values["type_id"]),
+        "location_id": (None if _blank(values.get("location_id"))
+                        else reference_data.cache.resolve_location(values["location_id"])),
+        "employee_id": _integer("employee_id", values.get("employee_id")),
+        "notes": None if _blank(values.get("notes")) else str(values["notes"]),
+        "is_decommissioned": 0,
+    }
+    flag = values.get("is_decommissioned")
+    if not _blank(flag):
+        key = str(int(flag) if isinstance(flag, (bool, float)) else flag).strip().lower()
+        if key not in _FLAGS:
+            raise ValueError(f"is_decommissioned must be 0 or 1, got '{flag}'")
+        resource["is_decommissioned"] = _FLAGS[key]
+    return resource
+
+
+class _Report:
+    def __init__(self, max_errors: int):
+        self.max_errors = max_errors
+        self.rows = self.inserted = self.failed = 0
+        self.errors = []
+
+    def error(self, row_number: int, message: str):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"row": row_number, "error": message})
+
+    def as_dict(self) -> dict:
+        return {"rows": self.rows, "inserted": self.inserted, "failed": self.failed,
+                "errors": self.errors, "errors_truncated": self.failed > len(self.errors)}
+
+
+def _insert_chunk(chunk: list, user_position: auth.Role, report: _Report):
+    """Sanitizes, validates and inserts (row number, resource) pairs, recording each failure."""
+    notes = sanitize_batch([resource["notes"] for _, resource in chunk])
+    for (_, resource), note in zip(chunk, notes):
+        resource["notes"] = note
+    messages = batch_validation([resource for _, resource in chunk])
+    valid = []
+    for (row_number, resource), message in zip(chunk, messages):
+        if message is None:
+            valid.append((row_number, resource))
+        else:
+            report.error(row_number, message)
+    if not valid:
+        return
+
+    results = database_controller.add_resource_assets(
+        [resource for _, resource in valid], user_position)
+    failed = [i for i, (status, _) in enumerate(results) if status == 400]
+    if len(valid) > 1 and failed:
+        # One bad row (e.g. an unknown employee_id) fails its whole shard's
+        # statement; retry each failed row alone so only the bad one is reported
+        logger.event(f"{len(failed)} of {len(valid)} import rows failed, retrying row by row",
+                     level="warning")
+        for i in failed:
+            results[i] = database_controller.add_resource_assets([valid[i][1]], user_position)[0]
+    for (row_number, _), (status, _) in zip(valid, results):
+        if status == 200:
+            report.inserted += 1
+        else:
+            report.error(row_number, "Database error")
+
+
+def import_assets(file, file_format: str, user_position: auth.Role,
+                  chunk_size: int = IMPORT_CHUNK_SIZE,
+                  max_errors: int = MAX_REPORTED_ERRORS) -> dict:
+    """
+    Imports every row of a CSV or XLSX file as a new asset.
+
+    Args:
+        file: A binary file object positioned at the start of the upload.
+        file_format (str): "csv" or "xlsx".
+        user_position (Role): The user's role (must be allowed to write).
+        chunk_size (int): Rows validated and inserted together.
+        max_errors (int): Per-row errors listed in the report; the rest are
+            only counted.
+
+    Returns:
+        dict: rows, inserted, failed, errors ([{"row", "error"}] with
+        spreadsheet row numbers, the header being row 1) and errors_truncated.
+
+    Raises:
+        ImportFileError: If the file or its header row cannot be read.
+        ImportError: For XLSX files when openpyxl is not installed.
+    """
+    logger.event(f"import_assets called for a {file_format} file", level="trace")
+    if file_format not in FORMATS:
+        raise ImportFileError(f"Unsupported format '{file_format}'")
+    if not auth.can_write(user_position):
+        raise PermissionError("Write access required")
+
+    rows = _csv_rows(file) if file_format == "csv" else _xlsx_rows(file)
+    header = next(rows, None)
+    if header is None:
+        raise ImportFileError("The file is empty")
+    positions = _header(header)
+
+    report = _Report(max_errors)
+    chunk = []
+    for row_number, cells in enumerate(rows, start=2):
+        if all(_blank(cell) for cell in cells):
+            continue
+        report.rows += 1
+        try:
+            chunk.append((row_number, _to_resource(cells, positions)))
+        except (ValueError, LookupError) as exc:
+            report.error(row_number, str(exc))
+        if len(chunk) >= chunk_size:
+            _insert_chunk(chunk, user_position, report)
+            chunk = []
+    if chunk:
+        _insert_chunk(chunk, user_position, report)
+
+    logger.event(f"Import finished: {report.inserted} of {report.rows} rows inserted, "
+                 f"{report.failed} failed", level="info")
+    return report.as_dict()
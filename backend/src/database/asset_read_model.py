@@ -0,0 +1,239 @@
+"""
+Asset Read Model Module
+
+In-process copy of the active Asset table that AssetService (src/api/assets.py)
+reads from, so /assets and the by-employee/by-location lookups are answered from
+memory instead of a query per request.
+
+Rows are held as tuples in ASSET_FIELDS order, with hash indexes by id,
+resource_id, employee_id, location_id and type_id. The model is kept fresh in
+three ways:
+    - write-through: database_controller notifies it of every asset it writes
+      (see database_controller.add_write_listener) and the committed rows are
+      re-read by id;
+    - delta refresh: rows changed since the last cursor are pulled from the
+      change feed (database_controller.get_resource_changes);
+    - full reload: a periodic rebuild drops rows removed outside the controller.
+
+The model is also the loader behind the analytics columns (src/analytics/
+asset_analytics.py), which are rebuilt from it whenever its generation moves.
+
+Configuration (config.ini, all optional):
+    [read_model]
+    enabled = true
+    refresh_interval_seconds = 30
+    full_reload_seconds = 3600
+
+Example usage:
+    from src.database.asset_read_model import model
+
+    model.reload()
+    assets = model.by_employee(42)
+"""
+
+import asyncio
+import configparser
+import threading
+import time
+import src.database.database_controller as db_ctrl
+import src.database.authorize as auth
+from src.logger import logger
+
+config = configparser.ConfigParser()
+config.read('./config.ini')
+
+READ_MODEL_ENABLED = config.getboolean('read_model', 'enabled', fallback=False)
+REFRESH_INTERVAL_SECONDS = config.getint('read_model', 'refresh_interval_seconds',
+                                         fallback=30)
+FULL_RELOAD_SECONDS = config.getint('read_model', 'full_reload_seconds', fallback=3600)
+
+ASSET_FIELDS = tuple(column.strip() for column in db_ctrl.ASSET_COLUMNS.split(","))
+_INDEXED = ("employee_id", "location_id", "type_id")
+_POSITION = {field: i for i, field in enumerate(ASSET_FIELDS)}
+
+
+class _IndexedRows:
+    """The rows of a read model with their indexes and change-feed cursor."""
+
+    def __init__(self):
+        self.rows: dict[int, tuple] = {}
+        self.by_resource_id: dict[str, int] = {}
+        self.indexes: dict[str, dict[int, set[int]]] = {field: {} for field in _INDEXED}
+        self.cursor = (None, 0)
+
+    def remove(self, asset_id: int) -> bool:
+        row = self.rows.pop(asset_id, None)
+        if row is None:
+            return False
+        resource_id = row[_POSITION["resource_id"]]
+        if resource_id is not None and self.by_resource_id.get(resource_id) == asset_id:
+            del self.by_resource_id[resource_id]
+        for field in _INDEXED:
+            ids = self.indexes[field].get(row[_POSITION[field]])
+            if ids is not None:
+                ids.discard(asset_id)
+                if not ids:
+                    del self.indexes[field][row[_POSITION[field]]]
+        return True
+
+    def put(self, asset: dict) -> bool:
+        """Adds or replaces an asset; False if a newer version is already held."""
+        row = tuple(asset.get(field) for field in ASSET_FIELDS)
+        asset_id = asset["id"]
+        current = self.rows.get(asset_id)
+        version = _POSITION["version"]
+        if current is not None and (current[version] or 0) > (asset.get("version") or 0):
+            return False    # a write-through already applied a newer version
+        self.remove(asset_id)
+        self.rows[asset_id] = row
+        if asset.get("resource_id") is not None:
+            self.by_resource_id[asset["resource_id"]] = asset_id
+        for field in _INDEXED:
+            if asset.get(field) is not None:
+                self.indexes[field].setdefault(asset[field], set()).add(asset_id)
+        return True
+
+
+class AssetReadModel:
+    """Hash-indexed, incrementally refreshed copy of the Asset table."""
+
+    PAGE_SIZE = 1000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = _IndexedRows()
+        self._last_full_reload = 0.0
+        self.loaded = False
+        self.generation = 0     # bumped on every change, for copies derived from the model
+
+    # --- maintenance (callers hold the lock) ---
+
+    def _unindex(self, asset_id: int):
+        if self._data.remove(asset_id):
+            self.generation += 1
+
+    def _index(self, asset: dict):
+        if self._data.put(asset):
+            self.generation += 1
+
+    def _pull_changes(self, data: _IndexedRows) -> int | None:
+        """Applies the change feed after data's cursor; the number of rows, or None."""
+        since, since_id = data.cursor
+        applied = 0
+        while True:
+            status, rows = db_ctrl.get_resource_changes(
+                since, since_id, self.PAGE_SIZE, user_position=auth.Role.EMPLOYEE)
+            if status != 200:
+                logger.event("Asset read model refresh failed", level="error")
+                return None
+            applied += sum(data.put(row) for row in rows)
+            if rows:
+                since, since_id = rows[-1]["updated_at"], rows[-1]["id"]
+                data.cursor = (since, since_id)
+            if len(rows) < self.PAGE_SIZE:
+                return applied
+
+    # --- refresh ---
+
+    def reload(self) -> bool:
+        """
+        Rebuilds the model from the whole Asset table through the change feed.
+
+        The rebuild happens off to the side and is swapped in at the end, so
+        lookups keep being served from the old copy meanwhile. Writes made during
+        the rebuild are picked up by the next refresh, because the change feed
+        holds back the most recent second.
+        """
+        fresh = _IndexedRows()
+        if self._pull_changes(fresh) is None:
+            return False
+        with self._lock:
+            self._data = fresh
+            self.generation += 1
+            self._last_full_reload = time.monotonic()
+            self.loaded = True
+        logger.event(f"Asset read model loaded with {len(fresh.rows)} assets", level="info")
+        return True
+
+    def refresh(self) -> bool:
+        """Applies rows changed since the last cursor; loads the model first if needed."""
+        if not self.loaded:
+            return self.reload()
+        with self._lock:
+            applied = self._pull_changes(self._data)
+            if applied:
+                self.generation += 1
+            return applied is not None
+
+    def sync(self, full_reload_seconds: float = FULL_RELOAD_SECONDS) -> bool:
+        """Refreshes the model, or reloads it once full_reload_seconds have passed."""
+        if self.loaded and time.monotonic() - self._last_full_reload < full_reload_seconds:
+            return self.refresh()
+        return self.reload()
+
+    def on_write(self, asset_ids: list[int]):
+        """
+        Write-through listener: re-reads the committed rows and applies them,
+        dropping ids that are no longer in the Asset table (e.g. archived).
+        """
+        if not self.loaded or not asset_ids:
+            return
+        status, batch = db_ctrl.get_resources_by_ids(asset_ids, auth.Role.EMPLOYEE)
+        if status != 200:
+            logger.event(f"Asset read model write-through failed for {asset_ids}",
+                         level="warning")
+            return
+        with self._lock:
+            for asset in batch["found"].values():
+                self._index(asset)
+            for asset_id in batch["missing"]:
+                self._unindex(asset_id)
+
+    # --- lookups ---
+
+    def _materialize(self, asset_ids) -> list[dict]:
+        with self._lock:
+            rows = [self._data.rows[i] for i in sorted(asset_ids) if i in self._data.rows]
+        return [dict(zip(ASSET_FIELDS, row)) for row in rows]
+
+    def all(self) -> list[dict]:
+        with self._lock:
+            asset_ids = list(self._data.rows)
+        return self._materialize(asset_ids)
+
+    def get(self, asset_id: int) -> dict | None:
+        found = self._materialize([asset_id])
+        return found[0] if found else None
+
+    def by_resource_id(self, resource_id: str) -> dict | None:
+        asset_id = self._data.by_resource_id.get(resource_id)
+        return None if asset_id is None else self.get(asset_id)
+
+    def _by(self, field: str, value: int) -> list[dict]:
+        with self._lock:
+            asset_ids = list(self._data.indexes[field].get(value, ()))
+        return self._materialize(asset_ids)
+
+    def by_employee(self, employee_id: int) -> list[dict]:
+        return self._by("employee_id", employee_id)
+
+    def by_location(self, location_id: int) -> list[dict]:
+        return self._by("location_id", location_id)
+
+    def by_type(self, type_id: int) -> list[dict]:
+        return self._by("type_id", type_id)
+
+
+async def run_refresher(interval_seconds: int = REFRESH_INTERVAL_SECONDS,
+                        full_reload_seconds: int = FULL_RELOAD_SECONDS):
+    """Background loop keeping the model current; the first pass loads it."""
+    logger.event("Asset read model refresher started", level="info")
+    while True:
+        try:
+            await asyncio.to_thread(model.sync, full_reload_seconds)
+        except Exception as e:  # keep the loop alive; the next pass retries
+            logger.event(f"Asset read model refresh failed: {e}", level="error")
+        await asyncio.sleep(interval_seconds)
+
+
+model = AssetReadModel()
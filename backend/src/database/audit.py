@@ -0,0 +1,138 @@
+"""
+Inventory Audit Module
+
+Reconciles a physical audit of one location, i.e. the set of asset tags
+(resource_ids) scanned on site, against the database.
+
+The comparison is set-based: the assets registered at the location are read
+with one indexed query and the scanned tags that are not among them are looked
+up in chunks of IN (...) queries; the diff itself is an in-memory hash join.
+A 20k-tag audit therefore costs a few dozen queries rather than one per tag.
+
+Report categories:
+    matched         scanned, active and registered at this location
+    missing         active at this location but not scanned
+    unexpected      scanned but unknown to the database
+    wrong_location  scanned here but registered at another location
+    wrong_assignee  scanned here but assigned to an employee
+    decommissioned  scanned but marked decommissioned
+
+Example usage:
+    from src.database import audit
+
+    tags = audit.TagParser()
+    tags.feed("Laptop-2025-001\\nLaptop-2025-002\\n")
+    report = audit.reconcile_location(4, tags.finish())
+"""
+
+from src.database import shards
+from src.database.inventory_summary import decommissioned_flag
+from src.query.builders import build_in_clause
+from src.logger import logger
+
+AUDIT_COLUMNS = "id, resource_id, location_id, employee_id, is_decommissioned"
+LOOKUP_CHUNK_SIZE = 1000
+_SEPARATORS = str.maketrans({",": "\n", "\r": "\n", "\t": "\n", ";": "\n"})
+
+
+class TagParser:
+    """
+    Incrementally parses a streamed tag list: one resource_id per line, commas,
+    semicolons and tabs also accepted as separators. A tag split across two
+    chunks is reassembled.
+    """
+
+    def __init__(self, max_tags: int | None = None):
+        self.max_tags = max_tags
+        self.tags: set[str] = set()
+        self.duplicates = 0
+        self._partial = ""
+
+    def _add(self, tag: str):
+        tag = tag.strip()
+        if not tag:
+            return
+        if tag in self.tags:
+            self.duplicates += 1
+            return
+        if self.max_tags is not None and len(self.tags) >= self.max_tags:
+            raise ValueError(f"Audit exceeds {self.max_tags} tags")
+        self.tags.add(tag)
+
+    def feed(self, chunk: str):
+        """
+        Adds the complete tags in chunk; a trailing partial tag is held back.
+
+        Raises:
+            ValueError: If more than max_tags distinct tags are sent.
+        """
+        lines = (self._partial + chunk).translate(_SEPARATORS).split("\n")
+        self._partial = lines.pop()
+        for line in lines:
+            self._add(line)
+
+    def finish(self) -> set[str]:
+        """Flushes the last tag and returns the set of scanned tags."""
+        self._add(self._partial)
+        self._partial = ""
+        return self.tags
+
+
+def _public(row: dict) -> dict:
+    return {"id": row["id"], "resource_id": row["resource_id"],
+            "location_id": row["location_id"], "employee_id": row["employee_id"]}
+
+
+def reconcile_location(location_id: int, scanned: set[str]) -> dict | None:
+    """
+    Diffs the scanned tags against the assets registered at location_id.
+
+    Returns:
+        dict: The discrepancy report (see module docstring), or None if the
+        database could not be read.
+    """
+    logger.event(f"reconcile_location called for {location_id} with {len(scanned)} tags",
+                 level="trace")
+
+    expected_rows = shards.router.for_location(location_id).execute_query(
+        f"SELECT {AUDIT_COLUMNS} FROM Asset WHERE location_id = :location_id;",
+        {"location_id": location_id})
+    if expected_rows is None:
+        logger.event(f"Failed to read assets at location {location_id}", level="error")
+        return None
+    expected = {row["resource_id"]: row for row in expected_rows if row["resource_id"]}
+
+    # Only tags not already explained by this location need a lookup
+    others = sorted(scanned - expected.keys())
+    found = {}
+    for start in range(0, len(others), LOOKUP_CHUNK_SIZE):
+        in_clause, params = build_in_clause("tag", others[start:start + LOOKUP_CHUNK_SIZE])
+        rows = shards.router.query_all(
+            f"SELECT {AUDIT_COLUMNS} FROM Asset WHERE resource_id {in_clause};", params)
+        if rows is None:
+            logger.event("Failed to look up scanned tags", level="error")
+            return None
+        found.update((row["resource_id"], row) for row in rows)
+
+    report = {"location_id": location_id, "scanned": len(scanned), "matched": 0,
+              "missing": [], "unexpected": [], "wrong_location": [],
+              "wrong_assignee": [], "decommissioned": []}
+    for tag in sorted(scanned):
+        row = expected.get(tag) or found.get(tag)
+        if row is None:
+            report["unexpected"].append(tag)
+        elif decommissioned_flag(row["is_decommissioned"]):
+            report["decommissioned"].append(_public(row))
+        elif row["location_id"] == location_id:
+            report["matched"] += 1
+        elif row["employee_id"] is not None:
+            report["wrong_assignee"].append(_public(row))
+        else:
+            report["wrong_location"].append(_public(row))
+    report["missing"] = [_public(row) for tag, row in sorted(expected.items())
+                         if tag not in scanned and not decommissioned_flag(row["is_decommissioned"])]
+
+    logger.event(f"Audit of location {location_id}: {report['matched']} matched, "
+                 f"{len(report['missing'])} missing, {len(report['unexpected'])} unexpected",
+                 level="info")
+    return report
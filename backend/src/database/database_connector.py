@@ -137,9 +137,46 @@ def execute_query(query: str, params: dict = None):
             print("Failed to get database pool. Cannot execute query.")
             return None
 
+    return query_on(POOL, query, params)
+
+def execute_transaction(work):
+    """
+    Runs several statements on one pooled connection inside a single transaction.
+
+    `work` is called with a `run(query, params)` function bound to the transaction's
+    connection. `run` returns the same shapes as execute_query (a list of row dicts for
+    SELECT statements, a dict with status and rows_affected otherwise) and accepts a
+    list of parameter dicts to execute a statement once per dict.
+
+    The transaction commits when `work` returns and rolls back if it raises; exceptions
+    other than database errors are re-raised to the caller after the rollback.
+
+    Args:
+        work (callable): Function taking `run` and returning the caller's result.
+
+    Returns:
+        Any: Whatever `work` returns, or None if a database error occurred.
+    """
+    global POOL
+
+    if not POOL:
+        POOL = get_db_connection()
+        if not POOL:
+            print("Failed to get database pool. Cannot execute transaction.")
+            return None
+
+    return transaction_on(POOL, work)
+
+def query_on(pool, query: str, params: dict = None):
+    """
+    Executes a SQL query on the given engine; execute_query on the main pool.
+
+    Shards other than the main database (see shards.py) have their own engines
+    and run their queries through here.
+    """
     try:
         # Use the .connect() method on the engine to get a connection from the pool
-        with POOL.connect() as db_conn:
+        with pool.connect() as db_conn:
             # Prepare the query as a text object for SQLAlchemy
             text_query = sqlalchemy.text(query)
 
@@ -169,6 +206,27 @@ def execute_query(query: str, params: dict = None):
         print(f"Parameter or data error while executing the query: {e}")
     return None
 
+def transaction_on(pool, work):
+    """Runs execute_transaction's `work` on the given engine."""
+    try:
+        # engine.begin() commits on success and rolls back on any exception
+        with pool.begin() as db_conn:
+            def run(query: str, params=None):
+                result = db_conn.execute(sqlalchemy.text(query), params or {})
+                if result.returns_rows:
+                    return [row._asdict() for row in result.fetchall()]
+                return {"status": "success", "rows_affected": result.rowcount}
+
+            outcome = work(run)
+        print("Transaction committed successfully.")
+        return outcome
+
+    except sqlalchemy.exc.OperationalError as e:
+        print(f"Database connection error: {e}")
+    except sqlalchemy.exc.SQLAlchemyError as e:
+        print(f"SQLAlchemy error occurred during the transaction: {e}")
+    return None
+
 def close_db_connection():
     """
     Cleans up the connector and disposes of the connection pool.
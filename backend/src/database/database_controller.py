@@ -18,11 +18,244 @@ Example usage:
 """
 
 import datetime
+from src.database import asset_history
 from src.database import database_connector
+from src.database import inventory_summary
+from src.database import shards
+from src.database.resource_ids import allocator as resource_id_allocator, format_resource_id
+from src.query.builders import build_in_clause, build_notes_search_query
 from src.logger import logger
 import src.database.authorize as auth
 
 
+# Columns shared by Asset and AssetArchive; reads that span both tables use this
+# list instead of SELECT * so the UNION lines up regardless of column order.
+ASSET_COLUMNS = ("id, resource_id, type_id, date_added, location_id, employee_id, notes, "
+                 "is_decommissioned, decommission_date, version, updated_at")
+
+
+# Callables notified with the ids of assets after a successful write, so in-process
+# copies of the Asset table (e.g. asset_read_model) can write through.
+_write_listeners = []
+
+
+def add_write_listener(listener):
+    """Registers listener(asset_ids) to be called after every successful asset write."""
+    if listener not in _write_listeners:
+        _write_listeners.append(listener)
+
+
+def remove_write_listener(listener):
+    """Unregisters a listener added with add_write_listener."""
+    if listener in _write_listeners:
+        _write_listeners.remove(listener)
+
+
+def notify_asset_write(asset_ids: list[int]):
+    """
+    Tells the write listeners which assets changed. A failing listener is logged
+    and skipped; the write itself has already committed.
+    """
+    for listener in list(_write_listeners):
+        try:
+            listener(list(asset_ids))
+        except Exception as e:
+            logger.event(f"Asset write listener failed: {e}", level="error")
+
+
+# Callables notified after asset types or locations change, so cached copies of
+# the reference tables (e.g. the precompressed /resources/types/ response) are dropped.
+_reference_listeners = []
+
+
+def add_reference_listener(listener):
+    """Registers listener() to be called after every successful reference table write."""
+    if listener not in _reference_listeners:
+        _reference_listeners.append(listener)
+
+
+def remove_reference_listener(listener):
+    """Unregisters a listener added with add_reference_listener."""
+    if listener in _reference_listeners:
+        _reference_listeners.remove(listener)
+
+
+def notify_reference_write():
+    """Tells the reference listeners that AssetTypes or Locations changed."""
+    for listener in list(_reference_listeners):
+        try:
+            listener()
+        except Exception as e:
+            logger.event(f"Reference write listener failed: {e}", level="error")
+
+
+def _asset_select(where: str = "", include_archived: bool = False) -> str:
+    """
+    Builds the SELECT for an Asset read.
+
+    Default reads only touch the active Asset table; include_archived adds the
+    rows that the archiver moved to AssetArchive (with their archived_at).
+    """
+    if not include_archived:
+        return f"SELECT * FROM Asset{where};"
+    return (f"SELECT {ASSET_COLUMNS}, NULL AS archived_at FROM Asset{where} "
+            f"UNION ALL SELECT {ASSET_COLUMNS}, archived_at FROM AssetArchive{where};")
+
+
+def _version_guard(expected_version: int | None) -> str:
+    """
+    Returns the extra WHERE condition for a conditional (If-Match) write.
+
+    The version check rides along in the UPDATE itself, so a stale write simply
+    matches no rows instead of needing a read-before-write or a lock.
+    """
+    if expected_version is None:
+        return ""
+    return " AND version = :expected_version"
+
+
+def _is_version_conflict(result, expected_version: int | None) -> bool:
+    """
+    True when a conditional write matched no rows, i.e. the version moved on.
+    """
+    return (expected_version is not None and isinstance(result, dict)
+            and result.get("rows_affected") == 0)
+
+
+def _capture(column: str, value: str | None = None) -> str:
+    """
+    Returns a SET assignment of `value` (default: the column itself) that first
+    saves the column's old value in the session variable @before_<column>.
+
+    MySQL has no UPDATE ... RETURNING; this lets _captured_before read the
+    pre-update row back without reading (or locking) it before the UPDATE.
+    """
+    value = value or column
+    return f"{column} = IF((@before_{column} := {column}) IS NULL, {value}, {value})"
+
+
+def _captured_before(run, columns: tuple) -> dict:
+    """The old values the last _capture UPDATE on this connection saved."""
+    select = ", ".join(f"@before_{column} AS {column}" for column in columns)
+    return run(f"SELECT {select};")[0]
+
+
+def _asset_write(
+        shard: shards.Shard,
+        update_query: str,
+        params: dict,
+        captured: tuple,
+        changes: dict
+        ):
+    """
+    Runs a single-asset UPDATE in one transaction on the asset's shard, together
+    with its summary upkeep.
+
+    The UPDATE saves the `captured` columns' old values with _capture; when it
+    matched the row they are read back and the asset is moved between
+    AssetSummary buckets according to `changes`, the bucket columns it assigns.
+
+    Returns:
+        dict: The UPDATE's status dict (rows_affected 0 if the row is missing or
+        stale) with the captured old values under "before" when it was written,
+        or None if the transaction failed.
+    """
+    return shard.execute_transaction(
+        lambda run: _asset_write_in(run, update_query, params, captured, changes))
+
+
+def _asset_write_in(run, update_query: str, params: dict, captured: tuple,
+                    changes: dict) -> dict:
+    """The body of _asset_write, run inside a caller's transaction."""
+    result = run(update_query, params)
+    if result["rows_affected"]:
+        before = _captured_before(run, captured)
+        inventory_summary.move(run, before, {**before, **changes})
+        result = {**result, "before": before}
+    return result
+
+
+# Columns copied when an asset moves to another shard; updated_at is set by MySQL
+MOVE_COLUMNS = ("id", "resource_id", "type_id", "date_added", "location_id", "employee_id",
+                "notes", "is_decommissioned", "decommission_date", "version")
+
+
+class _MoveFailed(Exception):
+    """Aborts the source transaction of a move whose target insert failed."""
+
+
+class _MoveConflict(Exception):
+    """Aborts the source transaction of a move whose row changed after it was read."""
+
+
+def _move_asset(source: shards.Shard, target: shards.Shard, params: dict,
+                expected_version: int | None, assigned: dict):
+    """
+    Applies an update that moves an asset to a location on another shard.
+
+    The row is read on the source shard (honouring the If-Match version),
+    inserted with the same id on the target shard (target transaction commits),
+    then deleted from the source only if it is still at the version read, so no
+    lock is held across the target write. There is no two-phase commit: if the
+    row changed meanwhile or the source commit fails, the copy on the target is
+    removed again.
+
+    Returns:
+        dict: As _asset_write, or None if the move failed or raced another
+        unconditional write.
+    """
+    read_query = f"SELECT * FROM Asset WHERE id = :asset_id{_version_guard(expected_version)};"
+    read_params = {key: params[key] for key in ("asset_id", "expected_version") if key in params}
+    moved = {}
+
+    def insert(run, row):
+        columns = ", ".join(MOVE_COLUMNS)
+        values = ", ".join(f":{column}" for column in MOVE_COLUMNS)
+        run(f"INSERT INTO Asset ({columns}) VALUES ({values});", row)
+        inventory_summary.apply_delta(run, row, 1)
+        return True
+
+    def work(run):
+        before = run(read_query, read_params)
+        if not before:
+            return {"status": "success", "rows_affected": 0}
+        row = {**before[0], **assigned, "version": (before[0].get("version") or 0) + 1}
+        row = {column: row.get(column) for column in MOVE_COLUMNS}
+        if target.execute_transaction(lambda target_run: insert(target_run, row)) is None:
+            raise _MoveFailed(f"Insert on shard {target.name} failed")
+        moved["row"] = row
+        deleted = run("DELETE FROM Asset WHERE id = :asset_id AND version <=> :version;",
+                      {"asset_id": params["asset_id"], "version": before[0].get("version")})
+        if not deleted["rows_affected"]:
+            raise _MoveConflict(f"Asset {params['asset_id']} changed on shard {source.name}")
+        inventory_summary.apply_delta(run, before[0], -1)
+        return {"status": "success", "rows_affected": 1, "before": before[0]}
+
+    logger.event(f"Moving asset {params['asset_id']} from shard {source.name} "
+                 f"to {target.name}", level="trace")
+    try:
+        result = source.execute_transaction(work)
+    except _MoveFailed as e:
+        logger.event(f"Asset move failed: {e}", level="error")
+        return None
+    except _MoveConflict as e:
+        logger.event(f"Asset move undone: {e}", level="warning")
+        # A conditional write reports the conflict (412), an unconditional one fails
+        result = None
+        if expected_version is not None:
+            result = {"status": "success", "rows_affected": 0}
+    if (result is None or not result["rows_affected"]) and "row" in moved:
+        # The source kept the row, so take the copy back out of the target
+        def undo(run):
+            run("DELETE FROM Asset WHERE id = :id;", {"id": moved["row"]["id"]})
+            inventory_summary.apply_delta(run, moved["row"], -1)
+            return True
+        if target.execute_transaction(undo) is None:
+            logger.event(f"Asset {params['asset_id']} is now on shards {source.name} and "
+                         f"{target.name}; remove one copy by hand", level="critical")
+    return result
+
+
 def add_resource_type(
         resource,
         user_position: auth.Role = auth.Role.OTHER
@@ -61,14 +294,68 @@ def add_resource_type(
 
     logger.event(f"Running query {update_query} with params: {params}", level="trace")
     result = database_connector.execute_query(update_query, params)
+    if shards.router.sharded and (result is not None
+                                  or _partly_replicated_type(asset_type_name)):
+        # Adding a type again after a failed copy finishes copying it
+        result = _replicate_resource_type(asset_type_name)
 
     if result is not None:
         logger.event(f"Successfully added resource type {asset_type_name}", level="info")
+        notify_reference_write()
         return 200
     logger.event(f"Failed to add resource type {asset_type_name}", level="error")
     return 400
 
 
+# Attempts per shard at copying a new asset type before giving up
+REPLICATE_ATTEMPTS = 3
+
+TYPE_BY_NAME_QUERY = """
+SELECT id, asset_type_name FROM AssetTypes WHERE asset_type_name = :asset_type_name;
+"""
+
+
+def _partly_replicated_type(asset_type_name: str) -> bool:
+    """True if the type is on the default shard but missing, by id, on another shard."""
+    rows = shards.router.default.execute_query(TYPE_BY_NAME_QUERY,
+                                               {"asset_type_name": asset_type_name})
+    if not rows:
+        return False
+    return any(not shard.execute_query("SELECT id FROM AssetTypes WHERE id = :id;", rows[0])
+               for shard in shards.router.all() if shard is not shards.router.default)
+
+
+def _replicate_resource_type(asset_type_name: str):
+    """
+    Copies a type added on the default shard, with its id, to the other shards.
+
+    The copy is an INSERT IGNORE by id, so it is retried per shard and is safe
+    to run again; shards still failing after REPLICATE_ATTEMPTS are reported.
+    """
+    rows = shards.router.default.execute_query(TYPE_BY_NAME_QUERY,
+                                               {"asset_type_name": asset_type_name})
+    if not rows:
+        return None
+    missing = []
+    for shard in shards.router.all():
+        if shard is shards.router.default:
+            continue
+        for _ in range(REPLICATE_ATTEMPTS):
+            result = shard.execute_query(
+                "INSERT IGNORE INTO AssetTypes (id, asset_type_name) "
+                "VALUES (:id, :asset_type_name);", rows[0])
+            if result is not None:
+                break
+        else:
+            missing.append(shard.name)
+    if missing:
+        logger.event(f"Type {asset_type_name} (id {rows[0]['id']}) is missing on shards "
+                     f"{', '.join(missing)}; add it again to finish copying it",
+                     level="critical")
+        return None
+    return rows
+
+
 def add_resource_asset(
         resource,
         user_position: auth.Role = auth.Role.OTHER
@@ -76,7 +363,9 @@ def add_resource_asset(
     """
     Adds a new asset resource to the database.
 
-    Only users with the "Manager" position are allowed to add assets.
+    Only users with the "Manager" position are allowed to add assets. The
+    resource_id comes from the in-memory allocator (see resource_ids) and is
+    written by the INSERT itself.
 
     Args:
         user_position (str): The user's position (must be "Manager").
@@ -92,12 +381,18 @@ def add_resource_asset(
         logger.event(f"Position of Manager required but {user_position} provided", level="error")
         return 401
 
+    resource_ids = resource_id_allocator.allocate(resource.get("type_id"))
+    if resource_ids is None:
+        logger.event("Could not allocate a resource ID", level="error")
+        return 400
+
     insert_query = """
-    INSERT INTO Asset (type_id, location_id, employee_id, notes, is_decommissioned)
-    VALUES (:type_id, :location_id, :employee_id, :notes, :is_decommissioned);
+    INSERT INTO Asset (resource_id, type_id, location_id, employee_id, notes, is_decommissioned)
+    VALUES (:resource_id, :type_id, :location_id, :employee_id, :notes, :is_decommissioned);
     """
 
     params = {
+        "resource_id": resource_ids[0],
         "type_id": resource.get("type_id"),
         "location_id": resource.get("location_id"),
         "employee_id": resource.get("employee_id"),
@@ -105,50 +400,51 @@ def add_resource_asset(
         "is_decommissioned": resource.get("is_decommissioned")
     }
 
+    def work(run):
+        run(insert_query, params)
+        # Same connection as the INSERT, so this is our row's id
+        new_asset_id = run("SELECT LAST_INSERT_ID() as new_id;")[0]["new_id"]
+        inventory_summary.apply_delta(run, resource, 1)
+        return new_asset_id
+
     logger.event(f"Running query {insert_query} with params: {params}", level="trace")
-    result = database_connector.execute_query(insert_query, params)
-    logger.event(f"result: {result}", level="warning")
-    if result is None:
+    new_asset_id = shards.router.for_asset(resource).execute_transaction(work)
+    if new_asset_id is None:
         logger.event("Item not added to Database", level="error")
         return 400
 
-    logger.event("Item added to Database", level="info")
-
-    new_asset_id_row = database_connector.execute_query("SELECT LAST_INSERT_ID() as new_id;")
-    logger.event(f"New asset ID row: {new_asset_id_row}", level="trace")
-
-    if not new_asset_id_row:
-        logger.event("Error getting new asset ID", level="error")
-        return 400
-
-    new_asset_id = new_asset_id_row[0]['new_id']
-    logger.event(f"New asset ID: {new_asset_id}", level="trace")
+    logger.event(f"Item {params['resource_id']} added to Database with ID {new_asset_id}",
+                 level="info")
+    notify_asset_write([new_asset_id])
+    return 200
 
-    update_result = update_resource_id(resource.get("type_id"), new_asset_id, user_position)
-    logger.event(f"Update result: {update_result}", level="trace")
 
-    if update_result is False:
-        logger.event("Error updating resource ID", level="error")
-        return 400
-    logger.event("Successfully updated resource ID", level="info")
-    return 200
+# Old values a delete_resource write captures: its summary bucket and history
+DELETE_CAPTURED = ("type_id", "location_id", "is_decommissioned", "decommission_date", "version")
 
 
 def delete_resource(
         resource: int,
-        user_position: auth.Role = auth.Role.OTHER
+        user_position: auth.Role = auth.Role.OTHER,
+        expected_version: int | None = None,
+        actor: str | None = None
         ) -> int:
     """
     Marks an asset resource as decommissioned in the database.
 
     Only users with the "Manager" position are allowed to delete resources.
+    When expected_version is given the write only applies if the row is still
+    at that version (optimistic concurrency, see _version_guard).
 
     Args:
         resource (int): The asset ID to decommission.
         user_position (Role): The user's role.
+        expected_version (int, optional): Version the caller last read (If-Match).
+        actor (str, optional): Who made the change, for the asset history.
 
     Returns:
-        int: 200 if successful, 400 if failed, 401 if unauthorized.
+        int: 200 if successful, 400 if failed, 401 if unauthorized,
+        412 if the row changed since expected_version.
     """
     logger.event("delete_resource called", level="trace")
 
@@ -156,42 +452,103 @@ def delete_resource(
         logger.event(f"Position of Manager required but {user_position} provided", level="error")
         return 401
 
-    update_query = """
+    update_query = f"""
         UPDATE Asset
-        SET is_decommissioned = 1,
-            decommission_date = NOW()
-        WHERE id = :asset_id;
+        SET {_capture("is_decommissioned", "1")},
+            {_capture("decommission_date", "NOW()")},
+            {_capture("type_id")},
+            {_capture("location_id")},
+            {_capture("version", "version + 1")}
+        WHERE id = :asset_id{_version_guard(expected_version)};
         """
 
     params = {
         "asset_id": resource
     }
+    if expected_version is not None:
+        params["expected_version"] = expected_version
 
     logger.event(f"Running query {update_query} with params: {params}", level="trace")
-    result = database_connector.execute_query(update_query, params)
+    result = _asset_write(shards.router.locate(resource), update_query, params,
+                          DELETE_CAPTURED, {"is_decommissioned": 1})
 
+    if _is_version_conflict(result, expected_version):
+        logger.event(f"Version conflict deleting resource {resource}", level="warning")
+        return 412
     if result is not None:
         logger.event(f"Successfully deleted resource {resource}", level="info")
+        if "before" in result:
+            asset_history.writer.record(
+                resource, asset_history.DELETE, result["before"],
+                {"is_decommissioned": 1, "decommission_date": datetime.datetime.now()}, actor)
+        notify_asset_write([resource])
         return 200
     logger.event(f"Failed to delete resource {resource}", level="error")
     return 400
 
 
+# Columns an update_resource write assigns (and AssetHistory records)
+UPDATE_COLUMNS = ("type_id", "location_id", "employee_id", "notes", "is_decommissioned")
+UPDATE_CAPTURED = UPDATE_COLUMNS + ("version",)
+
+
+def _update_statement(resource: dict, expected_version: int | None):
+    """Returns (query, params, summary bucket changes) for an update_resource write."""
+    update_query = f"""
+    UPDATE Asset
+    SET {_capture("type_id", ":type_id")},
+        {_capture("location_id", ":location_id")},
+        {_capture("employee_id", ":employee_id")},
+        {_capture("notes", ":notes")},
+        {_capture("is_decommissioned", ":is_decommissioned")},
+        {_capture("version", "version + 1")}
+    WHERE id = :asset_id{_version_guard(expected_version)};
+    """
+
+    params = {
+        "type_id": resource.get("type_id"),
+        "location_id": resource.get("location_id"),
+        "employee_id": resource.get("employee_id"),
+        "notes": resource.get("notes"),
+        "is_decommissioned": resource.get("is_decommissioned"),
+        "asset_id": resource.get("asset_id")
+    }
+    if expected_version is not None:
+        params["expected_version"] = expected_version
+    changes = {key: params[key] for key in ("type_id", "location_id", "is_decommissioned")}
+    return update_query, params, changes
+
+
+def _record_update(params: dict, result: dict, actor: str | None):
+    """Queues the asset history entry for a committed update_resource write."""
+    if "before" in result:
+        assigned = {column: params[column] for column in UPDATE_COLUMNS}
+        asset_history.writer.record(params["asset_id"], asset_history.UPDATE,
+                                    result["before"], assigned, actor)
+
+
 def update_resource(
         resource,
-        user_position: auth.Role = auth.Role.OTHER
+        user_position: auth.Role = auth.Role.OTHER,
+        expected_version: int | None = None,
+        actor: str | None = None
         ) -> int:
     """
     Updates an existing asset resource in the database.
 
     Only users with the "Manager" position are allowed to update assets.
+    When expected_version is given the write only applies if the row is still
+    at that version (optimistic concurrency, see _version_guard).
 
     Args:
         resource (dict): Dictionary containing updated asset details.
         user_position (Role): The user's role.
+        expected_version (int, optional): Version the caller last read (If-Match).
+        actor (str, optional): Who made the change, for the asset history.
 
     Returns:
-        int: 200 if successful, 400 if failed, 401 if unauthorized.
+        int: 200 if successful, 400 if failed, 401 if unauthorized,
+        412 if the row changed since expected_version.
     """
     logger.event("update_resource called", level="trace")
 
@@ -199,40 +556,228 @@ def update_resource(
         logger.event(f"Position of Manager required but {user_position} provided", level="error")
         return 401
 
-    update_query = """
-    UPDATE Asset
-    SET type_id = :type_id,
-        location_id = :location_id,
-        employee_id = :employee_id,
-        notes = :notes,
-        is_decommissioned = :is_decommissioned
-    WHERE id = :asset_id;
-    """
-
-    params = {
-        "type_id": resource.get("type_id"),
-        "location_id": resource.get("location_id"),
-        "employee_id": resource.get("employee_id"),
-        "notes": resource.get("notes"),
-        "is_decommissioned": resource.get("is_decommissioned"),
-        "asset_id": resource.get("asset_id")
-    }
+    update_query, params, changes = _update_statement(resource, expected_version)
 
     logger.event(f"Running query {update_query} with params: {params}", level="trace")
-    result = database_connector.execute_query(update_query, params)
-
+    source = shards.router.locate(params["asset_id"])
+    target = shards.router.for_asset(params)
+    if target is source:
+        result = _asset_write(source, update_query, params, UPDATE_CAPTURED, changes)
+    else:
+        result = _move_asset(source, target, params, expected_version,
+                             {column: params[column] for column in UPDATE_COLUMNS})
+
+    if _is_version_conflict(result, expected_version):
+        logger.event(f"Version conflict updating resource {resource}", level="warning")
+        return 412
     if result is not None:
         logger.event(f"Successfully updated resource {resource}", level="info")
+        _record_update(params, result, actor)
+        notify_asset_write([params["asset_id"]])
         return 200
     logger.event(f"Failed to update resource {resource}", level="error")
     return 400
 
 
-def get_resources(user_position=auth.Role.OTHER) -> tuple[int, list]:
+def add_resource_assets(
+        resources: list[dict],
+        user_position: auth.Role = auth.Role.OTHER
+        ) -> list[tuple[int, int | None]]:
+    """
+    Adds several asset resources with one multi-row INSERT in a single transaction
+    per shard.
+
+    The rows carry their final resource_ids from the allocator, so no follow-up
+    UPDATE is needed. Summary deltas are applied once per bucket.
+
+    Args:
+        resources (list[dict]): Asset details, as for add_resource_asset.
+        user_position (Role): The user's role (must be "Manager").
+
+    Returns:
+        list: One (status code, new asset id or None) per resource, in order.
+            Entries are 400 if their shard's transaction failed, 401 if unauthorized.
+    """
+    logger.event(f"add_resource_assets called with {len(resources)} resources", level="trace")
+
+    if not auth.can_write(user_position):
+        logger.event(f"Position of Manager required but {user_position} provided", level="error")
+        return [(401, None)] * len(resources)
+    if not resources:
+        return []
+
+    # Reserve every resource_id up front, one allocation per type
+    positions_by_type = {}
+    for i, resource in enumerate(resources):
+        positions_by_type.setdefault(resource.get("type_id"), []).append(i)
+    ordered_ids = [None] * len(resources)
+    for type_id, positions in positions_by_type.items():
+        allocated = resource_id_allocator.allocate(type_id, len(positions))
+        if allocated is None:
+            logger.event(f"Could not allocate resource IDs for type {type_id}", level="error")
+            return [(400, None)] * len(resources)
+        for position, resource_id in zip(positions, allocated):
+            ordered_ids[position] = resource_id
+
+    # One transaction per shard; a shard that fails only fails its own rows
+    positions_by_shard = {}
+    for i, resource in enumerate(resources):
+        positions_by_shard.setdefault(shards.router.for_asset(resource).name, []).append(i)
+
+    def insert_on(shard):
+        positions = positions_by_shard.get(shard.name)
+        if not positions:
+            return []
+        return _insert_assets(shard, [resources[i] for i in positions],
+                              [ordered_ids[i] for i in positions])
+
+    results = [(400, None)] * len(resources)
+    inserted = []
+    for shard, ids in zip(shards.router.all(), shards.router.fan_out(insert_on)):
+        positions = positions_by_shard.get(shard.name, [])
+        if ids is None:
+            logger.event(f"Batch insert failed on shard {shard.name}", level="error")
+            continue
+        for position, asset_id in zip(positions, ids):
+            results[position] = (200, asset_id)
+        inserted.extend(ids)
+
+    if inserted:
+        logger.event(f"Batch inserted resources {inserted}", level="info")
+        notify_asset_write(inserted)
+    return results
+
+
+def _insert_assets(shard: shards.Shard, resources: list[dict],
+                   resource_ids: list[str]) -> list[int] | None:
+    """One multi-row INSERT of resources on shard; returns the new ids in order."""
+    rows, params = [], {}
+    for i, resource in enumerate(resources):
+        rows.append(f"(:resource_id_{i}, :type_id_{i}, :location_id_{i}, :employee_id_{i}, "
+                    f":notes_{i}, :is_decommissioned_{i})")
+        params[f"resource_id_{i}"] = resource_ids[i]
+        for column in ("type_id", "location_id", "employee_id", "notes", "is_decommissioned"):
+            params[f"{column}_{i}"] = resource.get(column)
+    insert_query = f"""
+    INSERT INTO Asset (resource_id, type_id, location_id, employee_id, notes, is_decommissioned)
+    VALUES {", ".join(rows)};
+    """
+
+    def work(run):
+        run(insert_query, params)
+        # Auto-increment values of one statement are not guaranteed to be
+        # consecutive, so map the new ids back through the unique resource_ids
+        in_clause, in_params = build_in_clause("resource_id", resource_ids)
+        inserted = run(f"SELECT id, resource_id FROM Asset WHERE resource_id {in_clause};",
+                       in_params)
+        asset_ids = {row["resource_id"]: row["id"] for row in inserted}
+
+        buckets = {}
+        for resource in resources:
+            key = inventory_summary.bucket(resource)
+            buckets[key] = buckets.get(key, 0) + 1
+        for (type_id, location_key, is_decommissioned), count in buckets.items():
+            inventory_summary.apply_delta(run, {"type_id": type_id, "location_id": location_key,
+                                                "is_decommissioned": is_decommissioned}, count)
+        return [asset_ids[resource_id] for resource_id in resource_ids]
+
+    logger.event(f"Running batch insert of {len(resources)} resources on shard {shard.name}",
+                 level="trace")
+    return shard.execute_transaction(work)
+
+
+def update_resources(
+        items: list[tuple[dict, int | None]],
+        user_position: auth.Role = auth.Role.OTHER
+        ) -> list[int]:
+    """
+    Applies several asset updates in a single transaction (one commit) per shard.
+
+    Each update writes its own row exactly as update_resource does, so
+    a stale If-Match version only fails that item (412), not the batch.
+
+    Args:
+        items (list): (resource dict, expected_version or None) pairs, optionally
+            with the actor for the asset history as a third element.
+        user_position (Role): The user's role (must be "Manager").
+
+    Returns:
+        list[int]: One status per item: 200, 412 if its version moved on, or
+        400 for every item of a shard whose transaction failed, 401 if unauthorized.
+    """
+    logger.event(f"update_resources called with {len(items)} updates", level="trace")
+
+    if not auth.can_write(user_position):
+        logger.event(f"Position of Manager required but {user_position} provided", level="error")
+        return [401] * len(items)
+
+    # Grouped by the shard holding each row, one transaction per shard; an
+    # update that moves its asset to another shard's location runs on its own
+    located = shards.router.locate_many([item[0].get("asset_id") for item in items])
+    positions_by_shard, moves = {}, []
+    for i, item in enumerate(items):
+        source = located.get(item[0].get("asset_id"), shards.router.default)
+        if shards.router.for_asset(item[0]) is source:
+            positions_by_shard.setdefault(source.name, []).append(i)
+        else:
+            moves.append((i, source))
+
+    def update_on(shard):
+        positions = positions_by_shard.get(shard.name)
+        if not positions:
+            return None
+        written = []
+
+        def work(run):
+            statuses = []
+            written.clear()
+            for i in positions:
+                resource, expected_version, *actor = items[i]
+                update_query, params, changes = _update_statement(resource, expected_version)
+                result = _asset_write_in(run, update_query, params, UPDATE_CAPTURED, changes)
+                statuses.append(412 if _is_version_conflict(result, expected_version) else 200)
+                written.append((params, result, actor[0] if actor else None))
+            return statuses
+
+        statuses = shard.execute_transaction(work)
+        if statuses is None:
+            logger.event(f"Batch update failed on shard {shard.name}", level="error")
+            return None
+        return statuses, written
+
+    statuses = [400] * len(items)
+    written = []
+    for shard, outcome in zip(shards.router.all(), shards.router.fan_out(update_on)):
+        if outcome is not None:
+            for i, status in zip(positions_by_shard[shard.name], outcome[0]):
+                statuses[i] = status
+            written.extend(outcome[1])
+    for i, source in moves:
+        resource, expected_version, *actor = items[i]
+        _, params, _ = _update_statement(resource, expected_version)
+        result = _move_asset(source, shards.router.for_asset(params), params, expected_version,
+                             {column: params[column] for column in UPDATE_COLUMNS})
+        if result is not None:
+            statuses[i] = 412 if _is_version_conflict(result, expected_version) else 200
+            written.append((params, result, actor[0] if actor else None))
+
+    for params, result, actor in written:
+        _record_update(params, result, actor)
+    logger.event(f"Batch updated {statuses.count(200)} of {len(items)} resources", level="info")
+    notify_asset_write([item[0].get("asset_id") for item, status
+                        in zip(items, statuses) if status == 200])
+    return statuses
+
+
+def get_resources(
+        user_position=auth.Role.OTHER,
+        include_archived: bool = False
+        ) -> tuple[int, list]:
     """
     Retrieves all asset resources from the database.
     Args:
         user_position (Role): The user's role.
+        include_archived (bool): Also return rows moved to AssetArchive.
     Returns:
         tuple: (status code, list of asset resources)
             - status code: 200 if successful, 400 if failed
@@ -246,9 +791,11 @@ def get_resources(user_position=auth.Role.OTHER) -> tuple[int, list]:
                      level="trace")
         return 401, []
 
-    select_query = "SELECT * FROM Asset;"
+    select_query = _asset_select(include_archived=include_archived)
     logger.event(f"Running query {select_query}", level="trace")
-    results = database_connector.execute_query(select_query)
+    results = shards.router.query_all(select_query)
+    if results is not None and shards.router.sharded:
+        results.sort(key=lambda row: row["id"])
 
     if results is not None:
         logger.event(f"Successfully retrieved {len(results)} resources", level="info")
@@ -257,6 +804,170 @@ def get_resources(user_position=auth.Role.OTHER) -> tuple[int, list]:
     return 400, []
 
 
+def get_resource_changes(
+        since: datetime.datetime | None = None,
+        since_id: int = 0,
+        limit: int = 500,
+        user_position: auth.Role = auth.Role.OTHER
+        ) -> tuple[int, list]:
+    """
+    Retrieves assets created, updated or decommissioned after a change cursor.
+
+    The cursor is the (updated_at, id) pair of the last row a client has seen;
+    rows come back in that order so the last row of a page is the next cursor.
+    Decommissioned rows are included (is_decommissioned = 1) so clients see
+    them as tombstones. Rows touched within the last second are held back so
+    that a transaction committing with an earlier timestamp is not skipped.
+
+    Args:
+        since (datetime, optional): updated_at of the last seen row; None starts
+            from the beginning.
+        since_id (int): id of the last seen row, breaks updated_at ties.
+        limit (int): Maximum number of rows to return.
+        user_position (Role): The user's role.
+
+    Returns:
+        tuple: (status code, list of changed asset resources)
+            - status code: 200 if successful, 400 if failed, 401 if unauthorized
+            - list: Asset dictionaries ordered by (updated_at, id)
+    """
+    logger.event("get_resource_changes called", level="trace")
+
+    if not auth.can_read(user_position):
+        logger.event("Returning error 401: user does not have read access", level="trace")
+        return 401, []
+
+    select_query = """
+    SELECT * FROM Asset
+    WHERE updated_at < NOW(6) - INTERVAL 1 SECOND
+    """
+    params = {"limit": limit}
+    if since is not None:
+        # Written as a range on updated_at so idx_asset_updated_at is usable
+        select_query += """
+    AND updated_at >= :since
+    AND (updated_at > :since OR id > :since_id)
+    """
+        params["since"] = since
+        params["since_id"] = since_id
+    select_query += """
+    ORDER BY updated_at, id
+    LIMIT :limit;
+    """
+
+    logger.event(f"Running query {select_query} with params: {params}", level="trace")
+    # Each shard returns its first `limit` changes after the cursor, so the
+    # first `limit` of the merge are exactly the next page
+    results = shards.router.query_all(select_query, params)
+    if results is not None and shards.router.sharded:
+        results = sorted(results, key=lambda row: (row["updated_at"], row["id"]))[:limit]
+
+    if results is not None:
+        logger.event(f"Successfully retrieved {len(results)} changed resources", level="info")
+        return 200, results
+    logger.event("Failed to retrieve resource changes", level="error")
+    return 400, []
+
+
+def get_resource_stats(
+        user_position: auth.Role = auth.Role.OTHER
+        ) -> tuple[int, list]:
+    """
+    Retrieves the inventory summary buckets maintained in AssetSummary.
+
+    The table holds one row per (type, location, decommission state), so this
+    read costs the same at any inventory size.
+
+    Args:
+        user_position (Role): The user's role.
+
+    Returns:
+        tuple: (status code, list of summary rows)
+            - status code: 200 if successful, 400 if failed, 401 if unauthorized
+            - list: Dictionaries with type_id, location_key, is_decommissioned
+              and asset_count
+    """
+    logger.event("get_resource_stats called", level="trace")
+
+    if not auth.can_read(user_position):
+        logger.event("Returning error 401: user does not have read access", level="trace")
+        return 401, []
+
+    select_query = "SELECT * FROM AssetSummary;"
+    logger.event(f"Running query {select_query}", level="trace")
+    results = shards.router.query_all(select_query)
+    if results is not None and shards.router.sharded:
+        # Buckets are per shard; the same bucket on two shards is added up
+        totals = {}
+        for row in results:
+            key = (row["type_id"], row["location_key"], row["is_decommissioned"])
+            if key in totals:
+                totals[key] = {**totals[key],
+                               "asset_count": totals[key]["asset_count"] + row["asset_count"]}
+            else:
+                totals[key] = row
+        results = list(totals.values())
+
+    if results is not None:
+        logger.event(f"Successfully retrieved {len(results)} summary buckets", level="info")
+        return 200, results
+    logger.event("Failed to retrieve resource stats", level="error")
+    return 400, []
+
+
+def search_resources(
+        text: str,
+        filters: dict | None = None,
+        limit: int = 50,
+        offset: int = 0,
+        user_position: auth.Role = auth.Role.OTHER
+        ) -> tuple[int, list]:
+    """
+    Searches asset notes through the ft_asset_notes FULLTEXT index.
+
+    Every word of the search text must appear in the notes; matches come back
+    most relevant first, each with a 'relevance' score.
+
+    Args:
+        text (str): Words to search for, e.g. "cracked screen".
+        filters (dict, optional): Any of type_id, location_id, is_decommissioned.
+        limit (int): Maximum number of rows to return.
+        offset (int): Number of ranked rows to skip.
+        user_position (Role): The user's role.
+
+    Returns:
+        tuple: (status code, list of matching asset resources)
+            - status code: 200 if successful, 400 if failed or the text has
+              no searchable words, 401 if unauthorized
+    """
+    logger.event("search_resources called", level="trace")
+
+    if not auth.can_read(user_position):
+        logger.event("Returning error 401: user does not have read access", level="trace")
+        return 401, []
+
+    # Across shards, each returns its best offset + limit rows and the merge is paged
+    sharded = shards.router.sharded
+    try:
+        select_query, params = build_notes_search_query(
+            text, filters or {}, offset + limit if sharded else limit, 0 if sharded else offset)
+    except ValueError as e:
+        logger.event(f"Returning error 400: {e}", level="warning")
+        return 400, []
+
+    logger.event(f"Running query {select_query} with params: {params}", level="trace")
+    results = shards.router.query_all(select_query, params)
+    if results is not None and sharded:
+        results.sort(key=lambda row: (-row["relevance"], row["id"]))
+        results = results[offset:offset + limit]
+
+    if results is not None:
+        logger.event(f"Search matched {len(results)} resources", level="info")
+        return 200, results
+    logger.event("Failed to search resources", level="error")
+    return 400, []
+
+
 def get_resource_types(
         user_position: auth.Role = auth.Role.OTHER
         ) -> tuple[int, list]:
@@ -319,7 +1030,8 @@ def get_resource_locations(
 
 def get_resource_by_id(
         resource_id: int,
-        user_position: auth.Role = auth.Role.OTHER
+        user_position: auth.Role = auth.Role.OTHER,
+        include_archived: bool = False
         ) -> tuple[int, dict]:
     """
     Retrieves a single asset resource by its ID.
@@ -327,6 +1039,7 @@ def get_resource_by_id(
     Args:
         resource_id (int): The asset ID to retrieve.
         user_position (Role): The user's role.
+        include_archived (bool): Also look in AssetArchive.
 
     Returns:
         tuple: (status code, resource dictionary)
@@ -339,12 +1052,12 @@ def get_resource_by_id(
         logger.event("Returning error 401: user does not have read access", level="trace")
         return 401
 
-    select_query = "SELECT * FROM Asset WHERE id = :asset_id;"
+    select_query = _asset_select(" WHERE id = :asset_id", include_archived)
     params = {
         "asset_id": resource_id
     }
     logger.event(f"Running query {select_query} with params: {params}", level="trace")
-    results = database_connector.execute_query(select_query, params)
+    results = shards.router.query_all(select_query, params)
 
     if results is not None and len(results) > 0:
         logger.event(f"Successfully retrieved {len(results)} resources", level="info")
@@ -354,9 +1067,100 @@ def get_resource_by_id(
     return 400, {}
 
 
+def get_resources_by_ids(
+        resource_ids: list[int],
+        user_position: auth.Role = auth.Role.OTHER,
+        include_archived: bool = False
+        ) -> tuple[int, dict]:
+    """
+    Retrieves several asset resources by ID with a single WHERE id IN (...) query.
+
+    Args:
+        resource_ids (list[int]): The asset IDs to retrieve; duplicates are ignored.
+        user_position (Role): The user's role.
+        include_archived (bool): Also look in AssetArchive.
+
+    Returns:
+        tuple: (status code, result dictionary)
+            - status code: 200 if successful, 400 if failed, 401 if unauthorized
+            - dict: {"found": {id: asset}, "missing": [ids not found]}
+    """
+    logger.event("get_resources_by_ids called", level="trace")
+
+    if not auth.can_read(user_position):
+        logger.event("Returning error 401: user does not have read access", level="trace")
+        return 401, {}
+
+    wanted = list(dict.fromkeys(resource_ids))
+    if not wanted:
+        return 200, {"found": {}, "missing": []}
+
+    in_clause, params = build_in_clause("asset_id", wanted)
+    select_query = _asset_select(f" WHERE id {in_clause}", include_archived)
+    logger.event(f"Running query {select_query} with params: {params}", level="trace")
+    results = shards.router.query_all(select_query, params)
+
+    if results is None:
+        logger.event("Failed to retrieve resources by IDs", level="error")
+        return 400, {}
+
+    found = {row["id"]: row for row in results}
+    missing = [resource_id for resource_id in wanted if resource_id not in found]
+    logger.event(f"Retrieved {len(found)} of {len(wanted)} requested resources", level="info")
+    return 200, {"found": found, "missing": missing}
+
+
+def get_resource_history(
+        asset_id: int,
+        user_position: auth.Role = auth.Role.OTHER,
+        limit: int = 100,
+        before_id: int | None = None
+        ) -> tuple[int, list]:
+    """
+    Retrieves the change history of one asset, newest first.
+
+    The first page (no before_id) also includes entries still waiting in the
+    history writer's buffer, so a change shows up as soon as it commits.
+
+    Args:
+        asset_id (int): The asset ID.
+        user_position (Role): The user's role.
+        limit (int): Maximum stored entries to return.
+        before_id (int, optional): Only entries older than this history id.
+
+    Returns:
+        tuple: (status code, list of history entries)
+            - status code: 200 if successful, 400 if failed, 401 if unauthorized
+    """
+    logger.event(f"get_resource_history called for {asset_id}", level="trace")
+
+    if not auth.can_read(user_position):
+        logger.event("Returning error 401: user does not have read access", level="trace")
+        return 401, []
+
+    # Buffer first: an entry flushed in between then shows up in both reads
+    # (and is dropped below) rather than in neither
+    pending = []
+    if before_id is None:
+        pending = [asset_history.decode(entry)
+                   for entry in reversed(asset_history.writer.pending_for(asset_id))]
+    stored = asset_history.get_history(asset_id, limit, before_id)
+    if stored is None:
+        logger.event(f"Failed to retrieve history for resource {asset_id}", level="error")
+        return 400, []
+
+    written = {(entry["action"], entry["changed_at"]) for entry in stored}
+    pending = [entry for entry in pending
+               if (entry["action"], entry["changed_at"]) not in written]
+    logger.event(f"Retrieved {len(stored) + len(pending)} history entries for {asset_id}",
+                 level="info")
+    return 200, pending + stored
+
+
 def get_resource_by_employee_id(
         employee_id: int,
-        user_position: auth.Role = auth.Role.OTHER
+        user_position: auth.Role = auth.Role.OTHER,
+        include_archived: bool = False
         ) -> tuple[int, list]:
     """
     Retrieves all asset resources assigned to a specific employee.
@@ -364,6 +1168,7 @@ def get_resource_by_employee_id(
     Args:
         employee_id (int): The employee's ID.
         user_position (Role): The user's role.
+        include_archived (bool): Also return rows moved to AssetArchive.
 
     Returns:
         tuple: (status code, list of resources)
@@ -377,13 +1182,15 @@ def get_resource_by_employee_id(
         logger.event("Returning error 401: user does not have read access", level="trace")
         return 401
 
-    select_query = "SELECT * FROM Asset WHERE employee_id = :employee_id;"
+    select_query = _asset_select(" WHERE employee_id = :employee_id", include_archived)
     params = {
         "employee_id": employee_id
     }
 
     logger.event(f"Running query {select_query} with params: {params}", level="trace")
-    results = database_connector.execute_query(select_query, params)
+    results = shards.router.query_all(select_query, params)
+    if results is not None and shards.router.sharded:
+        results.sort(key=lambda row: row["id"])
 
     if results is not None:
         logger.event(f"Successfully retrieved {len(results)} resources", level="info")
@@ -394,7 +1201,8 @@ def get_resource_by_employee_id(
 
 def get_resource_by_location_id(
         location_id: int,
-        user_position: auth.Role = auth.Role.OTHER
+        user_position: auth.Role = auth.Role.OTHER,
+        include_archived: bool = False
         ) -> tuple[int, list]:
     """
     Retrieves all asset resources at a specific location.
@@ -402,6 +1210,7 @@ def get_resource_by_location_id(
     Args:
         location_id (int): The location's ID.
         user_position (Role): The user's role.
+        include_archived (bool): Also return rows moved to AssetArchive.
 
     Returns:
         tuple: (status code, list of resources)
@@ -414,12 +1223,12 @@ def get_resource_by_location_id(
         logger.event("Returning error 401: user does not have read access", level="trace")
         return 401
 
-    select_query = "SELECT * FROM Asset WHERE location_id = :location_id;"
+    select_query = _asset_select(" WHERE location_id = :location_id", include_archived)
     params = {
         "location_id": location_id
     }
     logger.event(f"Running query {select_query} with params: {params}", level="trace")
-    results = database_connector.execute_query(select_query, params)
+    results = shards.router.for_location(location_id).execute_query(select_query, params)
 
     if results is not None:
         logger.event(f"Successfully retrieved {len(results)} resources", level="info")
@@ -468,9 +1277,7 @@ def update_resource_id(
         return False
     asset_type_name = type_result[0]['asset_type_name']
     current_year = datetime.datetime.now().year
-    padded_id = str(new_asset_id).zfill(3)
-    # Construct the final resource_id string
-    resource_id_value = f"{asset_type_name}-{current_year}-{padded_id}"
+    resource_id_value = format_resource_id(asset_type_name, current_year, new_asset_id)
     update_resource_id_query = """
     UPDATE Asset
     SET resource_id = :resource_id
@@ -480,7 +1287,8 @@ def update_resource_id(
         "resource_id": resource_id_value,
         "asset_id": new_asset_id
     }
-    result = database_connector.execute_query(update_resource_id_query, update_params)
+    result = shards.router.locate(new_asset_id).execute_query(update_resource_id_query,
+                                                              update_params)
     if result is not None:
         logger.event(f"Successfully updated resource ID {new_asset_id}", level="info")
         return True
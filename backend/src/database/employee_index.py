@@ -0,0 +1,294 @@
+"""
+Employee Index Module
+
+In-memory typeahead index over the Employee table for the assignee picker, so a
+keystroke is answered from a few dictionary and bisect lookups instead of a
+LIKE '%q%' table scan and filesort.
+
+Matching is case-insensitive and ranked:
+    0. prefix of the first name, last name or "first last" full name
+    1. substring anywhere in the full name (queries of 3+ characters)
+Within a rank, employees are ordered by (last_name, first_name, id). Prefixes
+are found by bisecting a sorted list of name keys (or, for very common prefixes,
+by walking employees in name order until a page is full); substrings by
+intersecting a trigram index and then verifying the candidates. Pages are
+keyed by the last result's (rank, last, first, id), so a cursor stays valid
+across refreshes.
+
+The index is loaded in full at startup and then refreshed incrementally with
+an (updated_at, id) cursor over Employee.updated_at (migration 0008), like the
+asset change feed: rows touched within the last second are held back, so a
+transaction committing with an earlier timestamp is not skipped, and ties on
+updated_at are broken by id. A periodic full reload also drops employees that
+were deleted.
+
+Configuration (config.ini, all optional):
+    [employee_index]
+    enabled = true
+    refresh_interval_seconds = 60
+    full_reload_seconds = 3600
+
+Example usage:
+    from src.database.employee_index import index
+
+    index.reload()
+    employees, next_cursor = index.search("smi", limit=20)
+"""
+
+import asyncio
+import base64
+import bisect
+import configparser
+import itertools
+import json
+import threading
+import time
+from src.database import database_connector
+from src.logger import logger
+
+config = configparser.ConfigParser()
+config.read('./config.ini')
+
+INDEX_ENABLED = config.getboolean('employee_index', 'enabled', fallback=False)
+REFRESH_INTERVAL_SECONDS = config.getint('employee_index', 'refresh_interval_seconds',
+                                         fallback=60)
+FULL_RELOAD_SECONDS = config.getint('employee_index', 'full_reload_seconds', fallback=3600)
+
+SELECT_QUERY = """
+SELECT id, first_name, last_name, updated_at FROM Employee
+WHERE updated_at < NOW(6) - INTERVAL 1 SECOND
+"""
+
+# Written as a range on updated_at so idx_employee_updated_at is usable
+CHANGES_CONDITION = """
+AND updated_at >= :since
+AND (updated_at > :since OR id > :since_id)
+"""
+
+ORDER = "ORDER BY updated_at, id;"
+
+RANK_PREFIX = 0
+RANK_SUBSTRING = 1
+_MIN_SUBSTRING_LENGTH = 3
+
+
+def _fold(value) -> str:
+    return " ".join((value or "").lower().split())
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def encode_cursor(key: tuple) -> str:
+    """Encodes a result's sort key as an opaque pagination cursor."""
+    return base64.urlsafe_b64encode(json.dumps(key).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """
+    Decodes a cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        rank, last, first, employee_id = json.loads(base64.urlsafe_b64decode(cursor))
+        return (int(rank), str(last), str(first), int(employee_id))
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+class EmployeeIndex:
+    """Prefix and trigram index over employee names."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._employees: dict[int, dict] = {}
+        self._keys: list[tuple[str, int]] = []      # sorted (name key, id)
+        self._ordered: list[tuple] = []              # sorted (last, first, id)
+        self._trigrams: dict[str, set[int]] = {}
+        self._cursor = None                          # (updated_at, id) of the last row seen
+        self._last_full_reload = 0.0
+        self.loaded = False
+
+    # --- maintenance ---
+
+    def _add(self, employee: dict, keep_sorted: bool = True):
+        employee_id = employee["id"]
+        first, last = _fold(employee.get("first_name")), _fold(employee.get("last_name"))
+        full = f"{first} {last}".strip()
+        employee["_sort"] = (last, first, employee_id)
+        employee["_full"] = full
+        self._employees[employee_id] = employee
+        if keep_sorted:
+            bisect.insort(self._ordered, employee["_sort"])
+        else:
+            self._ordered.append(employee["_sort"])
+        for key in {first, last, full} - {""}:
+            if keep_sorted:
+                bisect.insort(self._keys, (key, employee_id))
+            else:
+                self._keys.append((key, employee_id))
+        for trigram in _trigrams(full):
+            self._trigrams.setdefault(trigram, set()).add(employee_id)
+
+    def _remove(self, employee_id: int):
+        employee = self._employees.pop(employee_id, None)
+        if employee is None:
+            return
+        last, first, _ = employee["_sort"]
+        position = bisect.bisect_left(self._ordered, employee["_sort"])
+        if position < len(self._ordered) and self._ordered[position] == employee["_sort"]:
+            del self._ordered[position]
+        for key in {first, last, employee["_full"]} - {""}:
+            position = bisect.bisect_left(self._keys, (key, employee_id))
+            if position < len(self._keys) and self._keys[position] == (key, employee_id):
+                del self._keys[position]
+        for trigram in _trigrams(employee["_full"]):
+            ids = self._trigrams.get(trigram)
+            if ids is not None:
+                ids.discard(employee_id)
+                if not ids:
+                    del self._trigrams[trigram]
+
+    def _advance(self, rows: list[dict]):
+        for row in rows:
+            if row.get("updated_at") is None:
+                continue
+            position = (row["updated_at"], row["id"])
+            if self._cursor is None or position > self._cursor:
+                self._cursor = position
+
+    def load(self, rows: list[dict]):
+        """Replaces the index contents with rows (id, first_name, last_name[, updated_at])."""
+        fresh = EmployeeIndex()
+        for row in rows:
+            fresh._add(dict(row), keep_sorted=False)
+        fresh._keys.sort()
+        fresh._ordered.sort()
+        fresh._advance(rows)
+        with self._lock:
+            self._employees, self._keys = fresh._employees, fresh._keys
+            self._ordered = fresh._ordered
+            self._trigrams, self._cursor = fresh._trigrams, fresh._cursor
+            self._last_full_reload = time.monotonic()
+            self.loaded = True
+
+    def upsert(self, rows: list[dict]):
+        """Adds new employees and re-indexes changed ones."""
+        with self._lock:
+            for row in rows:
+                self._remove(row["id"])
+                self._add(dict(row))
+            self._advance(rows)
+
+    def reload(self) -> bool:
+        """
+        Rebuilds the index from the whole Employee table; rows touched within the
+        last second are left to the next refresh.
+        """
+        rows = database_connector.execute_query(SELECT_QUERY + ORDER)
+        if rows is None:
+            logger.event("Failed to load employee index", level="error")
+            return False
+        self.load(rows)
+        logger.event(f"Employee index loaded with {len(rows)} employees", level="info")
+        return True
+
+    def refresh(self) -> bool:
+        """Applies employees created or renamed since the last load or refresh."""
+        if not self.loaded or self._cursor is None:
+            return self.reload()
+        since, since_id = self._cursor
+        rows = database_connector.execute_query(SELECT_QUERY + CHANGES_CONDITION + ORDER,
+                                                {"since": since, "since_id": since_id})
+        if rows is None:
+            logger.event("Failed to refresh employee index", level="error")
+            return False
+        if rows:
+            self.upsert(rows)
+            logger.event(f"Employee index refreshed {len(rows)} employees", level="trace")
+        return True
+
+    # --- lookup ---
+
+    def _prefix_range(self, query: str) -> tuple[int, int]:
+        low = bisect.bisect_left(self._keys, (query, -1))
+        high = bisect.bisect_left(self._keys, (query + "\U0010ffff",), low)
+        return low, high
+
+    def _is_prefix(self, sort_key: tuple, query: str) -> bool:
+        last, first, employee_id = sort_key
+        return (last.startswith(query) or first.startswith(query)
+                or self._employees[employee_id]["_full"].startswith(query))
+
+    def _substring_ids(self, query: str) -> set[int]:
+        postings = [self._trigrams.get(trigram, set()) for trigram in _trigrams(query)]
+        if not postings:
+            return set()
+        candidates = set.intersection(*sorted(postings, key=len))
+        return {i for i in candidates if query in self._employees[i]["_full"]}
+
+    def _ranked(self, query: str, after: tuple | None, limit: int):
+        """Yields (rank, last, first, id) keys of the matches in order, after the cursor."""
+        if after is None or after[0] == RANK_PREFIX:
+            low, high = self._prefix_range(query)
+            hits = high - low
+            # Walking employees in name order finds a page after about
+            # limit * n / hits checks; sorting the hits costs about hits.
+            # Walk when the prefix is common enough for that to be cheaper.
+            if not query or hits * hits > len(self._ordered) * (limit + 1):
+                start = bisect.bisect_right(self._ordered, after[1:]) if after else 0
+                for sort_key in itertools.islice(self._ordered, start, None):
+                    if not query or self._is_prefix(sort_key, query):
+                        yield (RANK_PREFIX, *sort_key)
+            else:
+                hits = {self._employees[i]["_sort"] for _, i in self._keys[low:high]}
+                for sort_key in sorted(hits):
+                    if after is None or (RANK_PREFIX, *sort_key) > after:
+                        yield (RANK_PREFIX, *sort_key)
+        if len(query) >= _MIN_SUBSTRING_LENGTH:
+            hits = (self._employees[i]["_sort"] for i in self._substring_ids(query))
+            for sort_key in sorted(k for k in hits if not self._is_prefix(k, query)):
+                if after is None or (RANK_SUBSTRING, *sort_key) > after:
+                    yield (RANK_SUBSTRING, *sort_key)
+
+    def search(self, q: str | None, limit: int = 20,
+               cursor: str | None = None) -> tuple[list[dict], str | None]:
+        """
+        Returns up to limit ranked matches after cursor, plus the cursor of the
+        next page (None on the last page). An empty q lists everyone by name.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        after = decode_cursor(cursor) if cursor else None
+        query = _fold(q)
+        with self._lock:
+            page = list(itertools.islice(self._ranked(query, after, limit), limit + 1))
+            results = [{"id": key[3],
+                        "first_name": self._employees[key[3]].get("first_name"),
+                        "last_name": self._employees[key[3]].get("last_name")}
+                       for key in page[:limit]]
+        next_cursor = encode_cursor(page[limit - 1]) if len(page) > limit else None
+        return results, next_cursor
+
+
+async def run_refresher(interval_seconds: int = REFRESH_INTERVAL_SECONDS,
+                        full_reload_seconds: int = FULL_RELOAD_SECONDS):
+    """Background loop keeping the index current; the first pass loads it."""
+    logger.event("Employee index refresher started", level="info")
+    while True:
+        try:
+            if (not index.loaded
+                    or time.monotonic() - index._last_full_reload >= full_reload_seconds):
+                await asyncio.to_thread(index.reload)
+            else:
+                await asyncio.to_thread(index.refresh)
+        except Exception as e:  # keep the loop alive; the next pass retries
+            logger.event(f"Employee index refresh failed: {e}", level="error")
+        await asyncio.sleep(interval_seconds)
+
+
+index = EmployeeIndex()
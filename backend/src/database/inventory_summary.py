@@ -0,0 +1,211 @@
+"""
+Inventory Summary Module
+
+Maintains the AssetSummary table: one row per (type_id, location, decommission state)
+holding the number of assets in that bucket, across Asset and AssetArchive. Dashboards
+read these few rows instead of counting the Asset table.
+
+The database_controller write paths apply +1/-1 deltas inside their own transactions
+(see apply_delta). A periodic reconcile counts the source rows and corrects the buckets
+that drifted, e.g. from writes made outside the controller.
+
+Employee-assigned assets have no location; they are counted under location_key 0.
+
+Configuration (config.ini, all optional):
+    [summary]
+    reconcile_enabled = true
+    reconcile_interval_seconds = 900
+
+Example usage:
+    from src.database import inventory_summary
+
+    inventory_summary.reconcile()
+    stats = inventory_summary.summarize(rows)
+"""
+
+import asyncio
+import configparser
+from src.database import shards
+from src.logger import logger
+
+config = configparser.ConfigParser()
+config.read('./config.ini')
+
+RECONCILE_ENABLED = config.getboolean('summary', 'reconcile_enabled', fallback=False)
+RECONCILE_INTERVAL_SECONDS = config.getint('summary', 'reconcile_interval_seconds',
+                                           fallback=900)
+
+DELTA_QUERY = """
+INSERT INTO AssetSummary (type_id, location_key, is_decommissioned, asset_count)
+VALUES (:type_id, :location_key, :is_decommissioned, :delta)
+ON DUPLICATE KEY UPDATE asset_count = asset_count + :delta;
+"""
+
+COUNT_QUERY = """
+SELECT type_id, COALESCE(location_id, 0) AS location_key,
+       IF(is_decommissioned = 1, 1, 0) AS is_decommissioned, COUNT(*) AS asset_count
+FROM (
+    SELECT type_id, location_id, is_decommissioned FROM Asset
+    UNION ALL
+    SELECT type_id, location_id, is_decommissioned FROM AssetArchive
+) AS all_assets
+GROUP BY type_id, COALESCE(location_id, 0), IF(is_decommissioned = 1, 1, 0);
+"""
+
+SUMMARY_QUERY = """
+SELECT type_id, location_key, is_decommissioned, asset_count FROM AssetSummary;
+"""
+
+
+def decommissioned_flag(value) -> int:
+    """
+    Normalizes an is_decommissioned value to 0 or 1.
+
+    The column is BINARY(1), so rows read back hold b'0'/b'1' (or b'\\x00'/b'\\x01'),
+    while request payloads hold ints.
+    """
+    if isinstance(value, (bytes, bytearray)):
+        return 1 if value in (b"1", b"\x01") else 0
+    if isinstance(value, str):
+        return 1 if value in ("1", "\x01") else 0
+    return 1 if value == 1 else 0
+
+
+def bucket(asset: dict) -> tuple[int, int, int]:
+    """Returns the (type_id, location_key, is_decommissioned) bucket of an asset."""
+    return (asset.get("type_id"),
+            asset.get("location_id") or 0,
+            decommissioned_flag(asset.get("is_decommissioned")))
+
+
+def apply_delta(run, asset: dict, delta: int):
+    """
+    Adds delta to the asset's bucket using the transaction's run function.
+
+    Args:
+        run (callable): Statement runner from database_connector.execute_transaction,
+            or database_connector.execute_query.
+        asset (dict): Row or payload with type_id, location_id and is_decommissioned.
+        delta (int): +1 when an asset enters the bucket, -1 when it leaves.
+    """
+    type_id, location_key, is_decommissioned = bucket(asset)
+    params = {
+        "type_id": type_id,
+        "location_key": location_key,
+        "is_decommissioned": is_decommissioned,
+        "delta": delta
+    }
+    return run(DELTA_QUERY, params)
+
+
+def move(run, before: dict, after: dict):
+    """Moves one asset from its old bucket to its new one, if the bucket changed."""
+    if bucket(before) == bucket(after):
+        return
+    apply_delta(run, before, -1)
+    apply_delta(run, after, 1)
+
+
+def drift(counted: list[dict], summarized: list[dict]) -> list[dict]:
+    """
+    Returns the DELTA_QUERY params that bring the summarized buckets to the
+    counted ones, for the buckets that differ only.
+    """
+    def counts(rows):
+        return {(row["type_id"], int(row["location_key"] or 0),
+                 decommissioned_flag(row["is_decommissioned"])): int(row["asset_count"])
+                for row in rows}
+
+    actual, stored = counts(counted), counts(summarized)
+    deltas = []
+    for key in actual.keys() | stored.keys():
+        delta = actual.get(key, 0) - stored.get(key, 0)
+        if delta:
+            type_id, location_key, is_decommissioned = key
+            deltas.append({"type_id": type_id, "location_key": location_key,
+                           "is_decommissioned": is_decommissioned, "delta": delta})
+    return deltas
+
+
+def reconcile_shard(shard: shards.Shard) -> int | None:
+    """
+    Corrects AssetSummary on one shard.
+
+    The counts and the stored summary are read in one read-only transaction, a
+    consistent (non-locking) snapshot of both, so writers are never blocked.
+    The differences are then applied as deltas in a short write transaction,
+    which keeps the deltas of writes committed since the snapshot.
+
+    Returns:
+        int: Number of buckets corrected, or None if either transaction failed.
+    """
+    snapshot = shard.execute_transaction(lambda run: (run(COUNT_QUERY), run(SUMMARY_QUERY)))
+    if snapshot is None:
+        return None
+    deltas = drift(*snapshot)
+    if deltas and shard.execute_transaction(
+            lambda run: [run(DELTA_QUERY, params) for params in deltas]) is None:
+        return None
+    return len(deltas)
+
+
+def reconcile() -> bool:
+    """
+    Corrects AssetSummary from Asset and AssetArchive on every shard.
+
+    Returns:
+        bool: True if every shard was reconciled.
+    """
+    logger.event("inventory summary reconcile called", level="trace")
+
+    reconciled = True
+    for shard in shards.router.all():
+        corrected = reconcile_shard(shard)
+        if corrected is None:
+            logger.event(f"Failed to reconcile inventory summary on shard {shard.name}",
+                         level="error")
+            reconciled = False
+            continue
+        logger.event(f"Reconciled inventory summary on shard {shard.name} "
+                     f"({corrected} buckets corrected)", level="info")
+    return reconciled
+
+
+async def run_reconciler(interval_seconds: int = RECONCILE_INTERVAL_SECONDS):
+    """Background loop that reconciles the summary every interval_seconds."""
+    logger.event("Inventory summary reconciler started", level="info")
+    while True:
+        try:
+            await asyncio.to_thread(reconcile)
+        except Exception as e:  # keep the loop alive; the next pass retries
+            logger.event(f"Inventory summary reconcile failed: {e}", level="error")
+        await asyncio.sleep(interval_seconds)
+
+
+def summarize(rows: list[dict]) -> dict:
+    """
+    Folds AssetSummary rows into dashboard totals.
+
+    Returns:
+        dict: total, active and decommissioned counts plus per-type and
+        per-location breakdowns (location_id None = assigned to an employee).
+    """
+    by_type, by_location = {}, {}
+    totals = {"total": 0, "active": 0, "decommissioned": 0}
+    for row in rows:
+        count = int(row["asset_count"])
+        if count <= 0:
+            continue
+        state = "decommissioned" if decommissioned_flag(row["is_decommissioned"]) else "active"
+        totals["total"] += count
+        totals[state] += count
+        for key, breakdown in ((row["type_id"], by_type),
+                               (row["location_key"] or None, by_location)):
+            entry = breakdown.setdefault(key, {"total": 0, "active": 0, "decommissioned": 0})
+            entry["total"] += count
+            entry[state] += count
+    return {
+        **totals,
+        "by_type": [{"type_id": key, **counts} for key, counts in by_type.items()],
+        "by_location": [{"location_id": key, **counts} for key, counts in by_location.items()],
+    }
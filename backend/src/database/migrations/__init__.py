@@ -0,0 +1,2 @@
+# src/database/migrations/__init__.py
+# Versioned schema migrations; run with `python -m src.database.migrations`.
@@ -0,0 +1,45 @@
+"""
+Command line entry point for the migration runner.
+
+Run from the backend folder (so config.ini is found):
+    python -m src.database.migrations             # apply pending migrations on every shard
+    python -m src.database.migrations --status    # list pending migrations per shard
+    python -m src.database.migrations --baseline  # mark all as applied
+"""
+
+import argparse
+import sys
+from src.database import database_connector
+from src.database import shards
+from src.database.migrations import runner
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Apply versioned schema migrations.")
+    parser.add_argument("--target", type=int, default=None,
+                        help="highest migration version to apply")
+    parser.add_argument("--baseline", action="store_true",
+                        help="record pending migrations as applied without running them")
+    parser.add_argument("--status", action="store_true",
+                        help="list pending migrations and exit")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.status:
+            status = 0
+            for shard in shards.router.all():
+                pending = runner.pending_migrations(args.target, shard)
+                if pending is None:
+                    status = 1
+                    continue
+                for migration in pending:
+                    print(f"pending on {shard.name}: {migration.version:04d}_{migration.name}")
+            return status
+        return 0 if runner.migrate(args.target, args.baseline) else 1
+    finally:
+        shards.router.close()
+        database_connector.close_db_connection()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+"""
+Migration Runner Module
+
+Applies the versioned SQL scripts in the versions/ directory to every database shard
+(src.database.shards; just the main database when sharding is off), in order, and
+records each applied version in that shard's schema_migrations tracking table.
+
+Migration files are named NNNN_description.sql. Each file may contain several statements
+separated by semicolons; they are executed one at a time on the shard.
+Index builds are written as ALGORITHM=INPLACE, LOCK=NONE so they run online without
+blocking reads or writes on the table.
+
+Example usage:
+    from src.database.migrations import runner
+
+    runner.migrate()                 # apply everything pending, on every shard
+    runner.migrate(target=2)         # apply up to and including version 2
+    runner.migrate(baseline=True)    # mark all as applied (schema built from tableCreation.sql)
+"""
+
+import hashlib
+import os
+import re
+from dataclasses import dataclass
+from src.database import shards
+from src.logger import logger
+
+VERSIONS_DIR = os.path.join(os.path.dirname(__file__), "versions")
+
+_FILENAME_PATTERN = re.compile(r"^(\d{4})_([a-z0-9_]+)\.sql$")
+
+TRACKING_TABLE_QUERY = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INT PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    checksum CHAR(64) NOT NULL,
+    applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+
+@dataclass(frozen=True)
+class Migration:
+    """A single versioned migration script."""
+    version: int
+    name: str
+    sql: str
+
+    @property
+    def checksum(self) -> str:
+        return hashlib.sha256(self.sql.encode("utf-8")).hexdigest()
+
+
+def discover_migrations(directory: str | None = None) -> list[Migration]:
+    """
+    Loads all migration scripts from a directory (default VERSIONS_DIR), ordered by version.
+
+    Raises:
+        ValueError: If two files share a version number.
+    """
+    directory = directory or VERSIONS_DIR
+    migrations = {}
+    for filename in sorted(os.listdir(directory)):
+        match = _FILENAME_PATTERN.match(filename)
+        if not match:
+            continue
+        version = int(match.group(1))
+        if version in migrations:
+            raise ValueError(f"Duplicate migration version {version}: {filename}")
+        with open(os.path.join(directory, filename), "r", encoding="utf-8") as file:
+            migrations[version] = Migration(version, match.group(2), file.read())
+    return [migrations[version] for version in sorted(migrations)]
+
+
+def split_statements(sql: str) -> list[str]:
+    """
+    Splits a migration script into individual statements.
+
+    Full-line "--" comments are dropped and statements are split on a semicolon
+    at the end of a line, which is all the migration scripts use.
+    """
+    statements, current = [], []
+    for line in sql.splitlines():
+        if line.strip().startswith("--"):
+            continue
+        current.append(line)
+        if line.rstrip().endswith(";"):
+            statement = "\n".join(current).strip()
+            if statement != ";":
+                statements.append(statement)
+            current = []
+    leftover = "\n".join(current).strip()
+    if leftover:
+        statements.append(leftover)
+    return statements
+
+
+def applied_migrations(shard: shards.Shard | None = None) -> dict[int, str] | None:
+    """
+    Returns {version: checksum} for every migration applied on a shard (default:
+    the default shard), creating the tracking table on first use. Returns None
+    if the database is unavailable.
+    """
+    shard = shard or shards.router.default
+    if shard.execute_query(TRACKING_TABLE_QUERY) is None:
+        logger.event(f"Could not create schema_migrations table on shard {shard.name}",
+                     level="error")
+        return None
+    rows = shard.execute_query("SELECT version, checksum FROM schema_migrations;")
+    if rows is None:
+        logger.event(f"Could not read schema_migrations table on shard {shard.name}",
+                     level="error")
+        return None
+    return {row["version"]: row["checksum"] for row in rows}
+
+
+def _record(shard: shards.Shard, migration: Migration) -> bool:
+    insert_query = """
+    INSERT INTO schema_migrations (version, name, checksum)
+    VALUES (:version, :name, :checksum);
+    """
+    params = {
+        "version": migration.version,
+        "name": migration.name,
+        "checksum": migration.checksum
+    }
+    return shard.execute_query(insert_query, params) is not None
+
+
+def pending_migrations(target: int | None = None,
+                       shard: shards.Shard | None = None) -> list[Migration] | None:
+    """
+    Returns the migrations not yet applied on a shard (default: the default
+    shard) up to target, or None if the tracking table cannot be read.
+    """
+    applied = applied_migrations(shard)
+    if applied is None:
+        return None
+
+    pending = []
+    for migration in discover_migrations():
+        if target is not None and migration.version > target:
+            break
+        if migration.version in applied:
+            if applied[migration.version] != migration.checksum:
+                logger.event(f"Migration {migration.version}_{migration.name} changed after "
+                             "it was applied", level="warning")
+            continue
+        pending.append(migration)
+    return pending
+
+
+def migrate(target: int | None = None, baseline: bool = False) -> bool:
+    """
+    Applies pending migrations in version order on every shard, stopping at a
+    shard's first failure.
+
+    MySQL commits DDL implicitly, so a migration that fails part-way is left
+    unrecorded and must be fixed up by hand before re-running; re-running skips
+    what each shard has already recorded.
+
+    Args:
+        target (int, optional): Highest version to apply; defaults to all.
+        baseline (bool): Record pending migrations as applied without running
+            them, for databases created from the current tableCreation.sql.
+
+    Returns:
+        bool: True if every pending migration was applied (or baselined) on
+        every shard.
+    """
+    logger.event("migrate called", level="trace")
+    migrated = True
+    for shard in shards.router.all():
+        migrated = _migrate_shard(shard, target, baseline) and migrated
+    return migrated
+
+
+def _migrate_shard(shard: shards.Shard, target: int | None, baseline: bool) -> bool:
+    pending = pending_migrations(target, shard)
+    if pending is None:
+        return False
+    if not pending:
+        logger.event(f"Schema is up to date on shard {shard.name}", level="info")
+        return True
+
+    for migration in pending:
+        label = f"{migration.version:04d}_{migration.name} on shard {shard.name}"
+        if not baseline:
+            logger.event(f"Applying migration {label}", level="info")
+            for statement in split_statements(migration.sql):
+                logger.event(f"Running statement {statement}", level="trace")
+                if shard.execute_query(statement) is None:
+                    logger.event(f"Migration {label} failed", level="error")
+                    return False
+        if not _record(shard, migration):
+            logger.event(f"Could not record migration {label}", level="error")
+            return False
+        logger.event(f"Migration {label} {'baselined' if baseline else 'applied'}",
+                     level="info")
+    return True
@@ -0,0 +1,11 @@
+-- Secondary indexes for the Asset query shapes used by database_controller:
+--   get_resource_by_employee_id   WHERE employee_id = ?
+--   get_resource_by_location_id   WHERE location_id = ?
+--   type / decommission filters   WHERE type_id = ? AND is_decommissioned = ?
+--   age and intake reporting      WHERE/ORDER BY date_added
+ALTER TABLE Asset
+    ADD INDEX idx_asset_employee (employee_id),
+    ADD INDEX idx_asset_location (location_id),
+    ADD INDEX idx_asset_type_decommissioned (type_id, is_decommissioned),
+    ADD INDEX idx_asset_date_added (date_added),
+    ALGORITHM=INPLACE, LOCK=NONE;
@@ -0,0 +1,4 @@
+-- get_employees orders every call by (last_name, first_name).
+ALTER TABLE Employee
+    ADD INDEX idx_employee_name (last_name, first_name),
+    ALGORITHM=INPLACE, LOCK=NONE;
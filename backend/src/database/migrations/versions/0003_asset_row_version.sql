@@ -0,0 +1,4 @@
+-- Row version used for If-Match / ETag optimistic concurrency.
+ALTER TABLE Asset
+    ADD COLUMN version INT NOT NULL DEFAULT 1,
+    ALGORITHM=INSTANT;
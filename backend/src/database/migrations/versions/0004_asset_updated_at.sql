@@ -0,0 +1,9 @@
+-- Change-feed cursor column for GET /resources/changes.
+ALTER TABLE Asset
+    ADD COLUMN updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6)
+        ON UPDATE CURRENT_TIMESTAMP(6),
+    ALGORITHM=INPLACE, LOCK=NONE;
+
+ALTER TABLE Asset
+    ADD INDEX idx_asset_updated_at (updated_at, id),
+    ALGORITHM=INPLACE, LOCK=NONE;
@@ -0,0 +1,23 @@
+-- Archive tier for long-decommissioned assets (see src/database/archive.py).
+CREATE TABLE IF NOT EXISTS AssetArchive (
+    id INT PRIMARY KEY,
+    resource_id VARCHAR(100),
+    type_id INT NOT NULL,
+    date_added DATE NOT NULL,
+    location_id INT,
+    employee_id INT,
+    notes VARCHAR(1000),
+    is_decommissioned binary DEFAULT 1,
+    decommission_date DATETIME,
+    version INT NOT NULL DEFAULT 1,
+    updated_at TIMESTAMP(6) NOT NULL,
+    archived_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+    UNIQUE INDEX uq_archive_resource_id (resource_id),
+    INDEX idx_archive_employee (employee_id),
+    INDEX idx_archive_location (location_id)
+);
+
+-- Lets the archiver find eligible rows without scanning the active table.
+ALTER TABLE Asset
+    ADD INDEX idx_asset_decommissioned_date (is_decommissioned, decommission_date),
+    ALGORITHM=INPLACE, LOCK=NONE;
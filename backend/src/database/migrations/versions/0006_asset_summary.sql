@@ -0,0 +1,19 @@
+-- Incrementally maintained inventory counts (see src/database/inventory_summary.py).
+-- location_key is the asset's location_id, or 0 for employee-assigned assets.
+CREATE TABLE IF NOT EXISTS AssetSummary (
+    type_id INT NOT NULL,
+    location_key INT NOT NULL,
+    is_decommissioned TINYINT NOT NULL,
+    asset_count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (type_id, location_key, is_decommissioned)
+);
+
+-- Seed from the existing rows; the reconcile job keeps it honest from here on.
+INSERT INTO AssetSummary (type_id, location_key, is_decommissioned, asset_count)
+SELECT type_id, COALESCE(location_id, 0), IF(is_decommissioned = 1, 1, 0), COUNT(*)
+FROM (
+    SELECT type_id, location_id, is_decommissioned FROM Asset
+    UNION ALL
+    SELECT type_id, location_id, is_decommissioned FROM AssetArchive
+) AS all_assets
+GROUP BY type_id, COALESCE(location_id, 0), IF(is_decommissioned = 1, 1, 0);
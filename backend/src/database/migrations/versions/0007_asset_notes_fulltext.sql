@@ -0,0 +1,6 @@
+-- FULLTEXT index behind GET /resources/search (MATCH(notes) AGAINST ...).
+-- InnoDB builds the first FULLTEXT index of a table in place but cannot do it
+-- with LOCK=NONE; LOCK=SHARED keeps reads flowing while writes wait.
+ALTER TABLE Asset
+    ADD FULLTEXT INDEX ft_asset_notes (notes),
+    ALGORITHM=INPLACE, LOCK=SHARED;
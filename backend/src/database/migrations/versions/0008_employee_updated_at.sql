@@ -0,0 +1,9 @@
+-- Refresh cursor for the in-memory employee typeahead index (src/database/employee_index.py).
+ALTER TABLE Employee
+    ADD COLUMN updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6)
+        ON UPDATE CURRENT_TIMESTAMP(6),
+    ALGORITHM=INPLACE, LOCK=NONE;
+
+ALTER TABLE Employee
+    ADD INDEX idx_employee_updated_at (updated_at),
+    ALGORITHM=INPLACE, LOCK=NONE;
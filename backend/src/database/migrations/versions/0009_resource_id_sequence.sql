@@ -0,0 +1,20 @@
+-- Per-(type, year) resource_id counters used by src/database/resource_ids.py.
+CREATE TABLE IF NOT EXISTS ResourceIdSequence (
+    type_id INT NOT NULL,
+    year INT NOT NULL,
+    next_value INT NOT NULL,
+    PRIMARY KEY (type_id, year),
+    FOREIGN KEY (type_id) REFERENCES AssetTypes(id)
+);
+
+-- Existing resource_ids were numbered by asset id, so this year's counters
+-- start above the highest id in use to keep new ids from colliding with them.
+INSERT IGNORE INTO ResourceIdSequence (type_id, year, next_value)
+SELECT t.id, YEAR(CURDATE()), (
+    SELECT COALESCE(MAX(id), 0) + 1 FROM (
+        SELECT id FROM Asset
+        UNION ALL
+        SELECT id FROM AssetArchive
+    ) AS all_assets
+)
+FROM AssetTypes t;
@@ -0,0 +1,12 @@
+-- Append-only change log of asset updates and deletes, written in batches by
+-- src/database/asset_history.py. No foreign key: history outlives archiving.
+CREATE TABLE IF NOT EXISTS AssetHistory (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    asset_id INT NOT NULL,
+    action VARCHAR(20) NOT NULL,
+    actor VARCHAR(255),
+    changed_at DATETIME(6) NOT NULL,
+    before_values JSON,
+    after_values JSON,
+    INDEX idx_asset_history_asset (asset_id, id)
+);
@@ -0,0 +1,103 @@
+"""
+Reference Data Module
+
+Short-lived in-memory cache of the small lookup tables (AssetTypes and
+Locations), so bulk work such as spreadsheet imports can resolve names to ids
+without a query per row.
+
+Entries are reloaded after ttl_seconds or when invalidate() is called; the app
+registers invalidate as a database_controller reference listener, so adding an
+asset type clears the cache.
+
+Example usage:
+    from src.database.reference_data import cache
+
+    type_id = cache.resolve_type("Laptop")         # by name (case-insensitive) or id
+    location_id = cache.resolve_location("Austin") # by id, city or street
+"""
+
+import threading
+import time
+import src.database.database_controller as db_ctrl
+import src.database.authorize as auth
+from src.logger import logger
+
+
+class ReferenceLookupError(LookupError):
+    """Raised when a reference value is unknown or ambiguous."""
+
+
+class ReferenceCache:
+    """Time-bounded cache of AssetTypes and Locations rows, indexed for lookups."""
+
+    def __init__(self, ttl_seconds: float = 300.0):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._loaded = {}    # table -> (monotonic load time, rows, {key: [ids]})
+
+    @staticmethod
+    def _keys(table: str, row: dict) -> list[str]:
+        if table == "types":
+            return [str(row["asset_type_name"]).lower()]
+        return [str(row[column]).lower() for column in ("city", "street") if row.get(column)]
+
+    def _table(self, table: str) -> tuple:
+        with self._lock:
+            cached = self._loaded.get(table)
+            if cached and time.monotonic() - cached[0] < self.ttl_seconds:
+                return cached
+            read = (db_ctrl.get_resource_types if table == "types"
+                    else db_ctrl.get_resource_locations)
+            result = read(auth.Role.EMPLOYEE)
+            if not isinstance(result, tuple) or result[0] != 200:
+                logger.event(f"Could not load reference data for {table}", level="error")
+                if cached:
+                    return cached     # serve stale rather than fail
+                raise ReferenceLookupError(f"Reference data for {table} is unavailable")
+            index = {}
+            for row in result[1]:
+                index.setdefault(str(row["id"]), []).append(row["id"])
+                for key in self._keys(table, row):
+                    if row["id"] not in index.setdefault(key, []):
+                        index[key].append(row["id"])
+            self._loaded[table] = (time.monotonic(), result[1], index)
+            return self._loaded[table]
+
+    def types(self) -> list[dict]:
+        return self._table("types")[1]
+
+    def locations(self) -> list[dict]:
+        return self._table("locations")[1]
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded.clear()
+
+    def _resolve(self, table: str, label: str, value) -> int:
+        ids = self._table(table)[2].get(str(value).strip().lower(), [])
+        if len(ids) == 1:
+            return ids[0]
+        if ids:
+            raise ReferenceLookupError(f"{label} '{value}' is ambiguous; use its id")
+        raise ReferenceLookupError(f"Unknown {label.lower()} '{value}'")
+
+    def resolve_type(self, value) -> int:
+        """
+        Returns the id of the asset type named (case-insensitive) or numbered by value.
+
+        Raises:
+            ReferenceLookupError: If no such type exists.
+        """
+        return self._resolve("types", "Asset type", value)
+
+    def resolve_location(self, value) -> int:
+        """
+        Returns the id of the location given by id, city or street.
+
+        Raises:
+            ReferenceLookupError: If no location, or more than one, matches.
+        """
+        return self._resolve("locations", "Location", value)
+
+
+cache = ReferenceCache()
@@ -0,0 +1,117 @@
+"""
+Resource ID Allocator Module
+
+Hands out asset resource_ids ("<type name>-<year>-<zero-padded number>") from
+memory so an INSERT can carry its final resource_id, instead of reading back
+the auto-increment id and issuing a second UPDATE.
+
+Numbers come from the ResourceIdSequence table, one row per (type_id, year).
+The allocator reserves them in blocks of block_size with a single locked
+read-and-advance, then serves the block from memory; a request larger than the
+remaining block reserves exactly what it needs in one go. Numbers reserved but
+not used before a restart are skipped, so sequences can have gaps.
+
+Configuration (config.ini, all optional):
+    [resource_ids]
+    block_size = 100
+
+Example usage:
+    from src.database.resource_ids import allocator
+
+    resource_ids = allocator.allocate(type_id=1, count=3)
+    # ["Laptop-2025-1041", "Laptop-2025-1042", "Laptop-2025-1043"]
+"""
+
+import configparser
+import datetime
+import threading
+from src.database import database_connector
+from src.logger import logger
+
+config = configparser.ConfigParser()
+config.read('./config.ini')
+
+BLOCK_SIZE = config.getint('resource_ids', 'block_size', fallback=100)
+
+ENSURE_QUERY = """
+INSERT IGNORE INTO ResourceIdSequence (type_id, year, next_value)
+VALUES (:type_id, :year, 1);
+"""
+
+LOCK_QUERY = """
+SELECT s.next_value, t.asset_type_name
+FROM ResourceIdSequence s
+JOIN AssetTypes t ON t.id = s.type_id
+WHERE s.type_id = :type_id AND s.year = :year
+FOR UPDATE;
+"""
+
+ADVANCE_QUERY = """
+UPDATE ResourceIdSequence
+SET next_value = next_value + :count
+WHERE type_id = :type_id AND year = :year;
+"""
+
+
+def format_resource_id(asset_type_name: str, year: int, number: int) -> str:
+    """Builds the resource_id "<type name>-<year>-<number padded to 3 digits>"."""
+    return f"{asset_type_name}-{year}-{str(number).zfill(3)}"
+
+
+class ResourceIdAllocator:
+    """Per-(type, year) resource_id blocks reserved from ResourceIdSequence."""
+
+    def __init__(self, block_size: int = BLOCK_SIZE):
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        # (type_id, year) -> [next number, end of block (exclusive), type name]
+        self._blocks: dict[tuple[int, int], list] = {}
+
+    def _reserve(self, type_id: int, year: int, count: int) -> tuple[int, str] | None:
+        """Advances the stored sequence by count; returns (first number, type name)."""
+        params = {"type_id": type_id, "year": year, "count": count}
+
+        def work(run):
+            run(ENSURE_QUERY, params)
+            rows = run(LOCK_QUERY, params)
+            if not rows:
+                return None     # unknown type_id (the INSERT IGNORE hit the foreign key)
+            run(ADVANCE_QUERY, params)
+            return rows[0]["next_value"], rows[0]["asset_type_name"]
+
+        logger.event(f"Reserving {count} resource ids with params: {params}", level="trace")
+        return database_connector.execute_transaction(work)
+
+    def allocate(self, type_id: int, count: int = 1) -> list[str] | None:
+        """
+        Returns count consecutive resource_ids for type_id in the current year.
+
+        Returns:
+            list[str]: The resource_ids, or None if the type is unknown or the
+            sequence could not be advanced.
+        """
+        year = datetime.datetime.now().year
+        key = (type_id, year)
+        with self._lock:
+            block = self._blocks.get(key)
+            if block is None or block[1] - block[0] < count:
+                reserve = max(count, self.block_size)
+                reserved = self._reserve(type_id, year, reserve)
+                if reserved is None:
+                    logger.event(f"Could not reserve resource ids for type {type_id}",
+                                 level="error")
+                    return None
+                first, type_name = reserved
+                block = self._blocks[key] = [first, first + reserve, type_name]
+            first = block[0]
+            block[0] += count
+            return [format_resource_id(block[2], year, number)
+                    for number in range(first, first + count)]
+
+    def reset(self):
+        """Forgets the cached blocks, e.g. after an asset type is renamed."""
+        with self._lock:
+            self._blocks.clear()
+
+
+allocator = ResourceIdAllocator()
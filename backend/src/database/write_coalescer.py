@@ -0,0 +1,133 @@
+"""
+Write Coalescer Module
+
+Optional group-commit stage for asset writes. Inserts and updates that arrive
+within a few milliseconds of each other are gathered and flushed together:
+inserts as one multi-row INSERT (database_controller.add_resource_assets) and
+updates as one transaction (database_controller.update_resources). Each caller
+still gets its own result: a status and new id for inserts, a status for updates.
+
+A batch flushes when window_ms has passed since its first write or when it
+reaches max_batch writes. If a whole batch fails, its writes are retried one by
+one so a single bad row (e.g. an unknown type_id) only fails its own caller.
+
+Configuration (config.ini, all optional):
+    [coalescing]
+    enabled = false
+    window_ms = 5
+    max_batch = 100
+
+Example usage:
+    from src.database.write_coalescer import coalescer
+
+    status, asset_id = await coalescer.add(resource, auth.Role.MANAGER)
+    status = await coalescer.update(resource, auth.Role.MANAGER, expected_version, actor)
+"""
+
+import asyncio
+import configparser
+from src.database import database_controller
+import src.database.authorize as auth
+from src.logger import logger
+
+config = configparser.ConfigParser()
+config.read('./config.ini')
+
+COALESCING_ENABLED = config.getboolean('coalescing', 'enabled', fallback=False)
+WINDOW_MS = config.getint('coalescing', 'window_ms', fallback=5)
+MAX_BATCH = config.getint('coalescing', 'max_batch', fallback=100)
+
+INSERT = "insert"
+UPDATE = "update"
+
+
+class WriteCoalescer:
+    """Gathers concurrent asset writes on the event loop and flushes them in batches."""
+
+    def __init__(self, window_ms: int = WINDOW_MS, max_batch: int = MAX_BATCH):
+        self.window_seconds = window_ms / 1000
+        self.max_batch = max_batch
+        self._queues = {INSERT: [], UPDATE: []}
+        self._timers = {}
+        self._flushes = set()
+
+    async def add(self, resource: dict, user_position: auth.Role) -> tuple[int, int | None]:
+        """Queues an insert; returns (status code, new asset id or None)."""
+        if not auth.can_write(user_position):
+            return 401, None
+        return await self._enqueue(INSERT, (resource, user_position))
+
+    async def update(self, resource: dict, user_position: auth.Role,
+                     expected_version: int | None = None, actor: str | None = None) -> int:
+        """Queues an update; returns its status code (200, 400, 401 or 412)."""
+        if not auth.can_write(user_position):
+            return 401
+        return await self._enqueue(UPDATE, ((resource, expected_version, actor), user_position))
+
+    def _enqueue(self, kind: str, item: tuple) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        queue = self._queues[kind]
+        queue.append((item, future))
+        if len(queue) >= self.max_batch:
+            self._flush_now(kind)
+        elif kind not in self._timers:
+            self._timers[kind] = loop.call_later(self.window_seconds, self._flush_now, kind)
+        return future
+
+    def _flush_now(self, kind: str):
+        timer = self._timers.pop(kind, None)
+        if timer is not None:
+            timer.cancel()
+        batch, self._queues[kind] = self._queues[kind], []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._flush(kind, batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, kind: str, batch: list):
+        by_role = {}
+        for item, future in batch:
+            by_role.setdefault(item[1], []).append((item[0], future))
+        for role, entries in by_role.items():
+            payloads = [payload for payload, _ in entries]
+            try:
+                results = await asyncio.to_thread(self._write, kind, payloads, role)
+            except Exception as e:
+                logger.event(f"Coalesced {kind} of {len(payloads)} failed: {e}", level="error")
+                for _, future in entries:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), result in zip(entries, results):
+                if not future.done():
+                    future.set_result(result)
+
+    @staticmethod
+    def _failed(kind: str, result) -> bool:
+        return (result[0] if kind == INSERT else result) == 400
+
+    def _write(self, kind: str, payloads: list, role: auth.Role) -> list:
+        write_many = (database_controller.add_resource_assets if kind == INSERT
+                      else database_controller.update_resources)
+        logger.event(f"Flushing {len(payloads)} coalesced {kind}s", level="trace")
+        results = write_many(payloads, role)
+        failed = [i for i, result in enumerate(results) if self._failed(kind, result)]
+        if len(payloads) > 1 and failed:
+            # One bad row fails its whole shard's statement; retry each failed
+            # payload alone so only the bad one fails
+            logger.event(f"{len(failed)} of {len(payloads)} coalesced {kind}s failed, "
+                         f"retrying individually", level="warning")
+            for i in failed:
+                results[i] = write_many([payloads[i]], role)[0]
+        return results
+
+    async def drain(self):
+        """Flushes anything queued and waits for in-flight batches to finish."""
+        for kind in (INSERT, UPDATE):
+            self._flush_now(kind)
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+
+coalescer = WriteCoalescer()
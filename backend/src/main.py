@@ -9,14 +9,13 @@ app = create_app()
 async def root():
     return {"message": "Team Blue API is live 🚀"}
 
-# Optional sample route that uses the engine (kept for parity with your tests)
 @app.get("/employees/count")
 def employees_count():
     db_engine = get_db_connection()
     with db_engine.connect() as db_conn:
-        rows = db_conn.execute(sqlalchemy.text("SELECT 1")).fetchall()
+        count = db_conn.execute(sqlalchemy.text("SELECT COUNT(*) FROM Employee")).scalar_one()
     logger.security("employees_count accessed", level="info")
-    return {"count": len(rows)}
+    return {"count": count}
 
 if __name__ == "__main__":
     # simple manual poke if you run `python -m src.main`
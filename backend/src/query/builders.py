@@ -1,4 +1,5 @@
 # src/query/builders.py
+import re
 from typing import Tuple, Dict, Any
 
 def build_asset_search_query(filters: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
@@ -14,3 +15,49 @@ def build_asset_search_query(filters: Dict[str, Any]) -> Tuple[str, Dict[str, An
         clauses.append("employee_id IS NOT NULL" if filters["assigned"] else "employee_id IS NULL")
     where = " AND ".join(clauses) or "1=1"
     return f"SELECT * FROM assets WHERE {where}", params
+
+
+def build_in_clause(name: str, values) -> Tuple[str, Dict[str, Any]]:
+    """Return an "IN (:name_0, :name_1, ...)" fragment + params for a list of values.
+
+    An empty list yields "IN (NULL)", which matches nothing.
+    """
+    values = list(values)
+    if not values:
+        return "IN (NULL)", {}
+    params = {f"{name}_{i}": value for i, value in enumerate(values)}
+    return f"IN ({', '.join(':' + key for key in params)})", params
+
+
+def build_notes_search_query(text: str, filters: Dict[str, Any], limit: int,
+                             offset: int = 0) -> Tuple[str, Dict[str, Any]]:
+    """Return a FULLTEXT search over Asset.notes, ranked by relevance, + params.
+
+    Every word in text is required (boolean mode "+word"); operator characters
+    are dropped so user input cannot change the query's meaning. Supported
+    filters: type_id, location_id, is_decommissioned. Ties in relevance are
+    broken by id so pages are stable.
+
+    Raises:
+        ValueError: If text contains no searchable words.
+    """
+    words = re.findall(r"\w+", text or "")
+    if not words:
+        raise ValueError("Search text has no searchable words")
+    params: Dict[str, Any] = {
+        "terms": " ".join(f"+{word}" for word in words),
+        "ranking": " ".join(words),
+        "limit": limit,
+        "offset": offset,
+    }
+    clauses = ["MATCH(notes) AGAINST (:terms IN BOOLEAN MODE)"]
+    for column in ("type_id", "location_id", "is_decommissioned"):
+        if filters.get(column) is not None:
+            clauses.append(f"{column} = :{column}")
+            params[column] = filters[column]
+    sql = (
+        "SELECT *, MATCH(notes) AGAINST (:ranking IN NATURAL LANGUAGE MODE) AS relevance "
+        f"FROM Asset WHERE {' AND '.join(clauses)} "
+        "ORDER BY relevance DESC, id LIMIT :limit OFFSET :offset;"
+    )
+    return sql, params
@@ -3,25 +3,29 @@ data_validation.py
 
 Validate incoming inventory/resource JSON objects.
 
-This module provides a single helper function `data_validation` that checks
-a Python dict against a JSON Schema tailored for the Inventory Tracking
-System. The schema enforces required fields, types, the XOR rule that
-exactly one of `location_id` or `employee_id` must be provided, and
-additional simple constraints (e.g. `is_decommissioned` must be 0 or 1).
+The asset payload is a Pydantic v2 model (`AssetPayload`), so checks run in
+the compiled pydantic-core instead of walking a JSON Schema in Python on
+every request. It enforces required fields, strict types (no "1" for 1, no
+true for 1), the XOR rule that exactly one of `location_id` or
+`employee_id` must be provided, and simple constraints (e.g.
+`is_decommissioned` must be 0 or 1). Fields not listed are ignored.
 
 Behavior
-- Returns True when validation succeeds.
-- Returns False when validation fails.
-- Prints small status messages on success/failure.
+- `data_validation(data)` returns True when validation succeeds and False
+  when it fails.
+- `asset_errors(data)` returns the structured errors (loc, type, msg) of one
+  record, empty when it is valid.
+- `batch_validation(rows)` validates a list of records in one pass and
+  returns one error message (or None) per record.
+- Logs small status messages on success/failure.
 
 Schema summary
 - type_id: integer (required)
-- is_decommissioned: integer enum {0,1} (required)
+- is_decommissioned: integer 0 or 1 (required)
 - location_id: integer or null
 - employee_id: integer or null
-- notes: string or null
-- Exactly one of (location_id, employee_id) must be present as an integer
-  (enforced with JSON Schema `oneOf`).
+- notes: string or null, at most 1000 characters
+- Exactly one of (location_id, employee_id) must be an integer.
 
 Example
     >>> data = {
@@ -35,47 +39,75 @@ Example
     True
 """
 
-import jsonschema
-from jsonschema import validate
+from typing import Annotated
+from pydantic import BaseModel, ConfigDict, Field, StrictInt, StrictStr, TypeAdapter
+from pydantic import ValidationError, model_validator
 from src.logger import logger
 
 
-def data_validation (data):
-    # Define a schema
-    schema = {
-        "type": "object",
-        "properties": {
-            "type_id": {"type": "integer"},
-            "location_id": {"type": ["integer", "null"]},
-            "employee_id": {"type": ["integer", "null"]},
-            "notes": {"type": ["string", "null"], "maxLength": 1000},
-            "is_decommissioned": {"type": "integer", "enum": [0, 1]},
-        },
-        "required": ["type_id", "is_decommissioned"],
-        # enforce exactly one of location_id or employee_id (XOR)
-        "oneOf": [
-            {
-                "required": ["location_id"],
-                "properties": {
-                    "location_id": {"type": "integer"},
-                    "employee_id": {"type": ["null"]}  # if present must be null
-                }
-            },
-            {
-                "required": ["employee_id"],
-                "properties": {
-                    "employee_id": {"type": "integer"},
-                    "location_id": {"type": ["null"]}  # if present must be null
-                }
-            }
-        ]
-    }
+class AssetPayload(BaseModel):
+    """An asset as sent in a POST/PUT body or an import row."""
+    model_config = ConfigDict(strict=True, extra="ignore")
 
-    # Validate data
+    type_id: StrictInt
+    location_id: StrictInt | None = None
+    employee_id: StrictInt | None = None
+    notes: Annotated[StrictStr, Field(max_length=1000)] | None = None
+    is_decommissioned: Annotated[StrictInt, Field(ge=0, le=1)]
+
+    @model_validator(mode="after")
+    def _location_xor_employee(self):
+        if (self.location_id is None) == (self.employee_id is None):
+            raise ValueError("exactly one of location_id or employee_id must be set")
+        return self
+
+
+# Built once, so batches are validated in a single call into pydantic-core
+_batch = TypeAdapter(list[AssetPayload])
+
+
+def _message(error: dict) -> str:
+    field = ".".join(str(part) for part in error["loc"] if not isinstance(part, int))
+    return f"{field}: {error['msg']}" if field else error["msg"]
+
+
+def asset_errors(data) -> list[dict]:
+    """Structured validation errors of one record ([] when valid)."""
     try:
-        validate(instance=data, schema=schema)
+        AssetPayload.model_validate(data)
+    except ValidationError as e:
+        return e.errors(include_url=False, include_input=False, include_context=False)
+    return []
+
+
+def data_validation (data):
+    # Validate data
+    errors = asset_errors(data)
+    if not errors:
         logger.security("Data validation succeeded", level="warning")
         return True
-    except jsonschema.exceptions.ValidationError as e:
-        logger.security(f"Data validation failed: {e.message}", level="warning")
-        return False
+    logger.security(f"Data validation failed: {'; '.join(map(_message, errors))}",
+                    level="warning")
+    return False
+
+
+def batch_validation(rows):
+    """
+    Validates many records against the same schema.
+
+    Returns a list with, for each row in order, None when it is valid or the
+    validation error message. One summary line is logged for the whole batch.
+    """
+    results = [None] * len(rows)
+    try:
+        _batch.validate_python(rows)
+    except ValidationError as e:
+        # Errors are located by row index first; keep the first one per row
+        for error in e.errors(include_url=False, include_input=False, include_context=False):
+            row = error["loc"][0]
+            if results[row] is None:
+                results[row] = _message({**error, "loc": error["loc"][1:]})
+    failed = sum(result is not None for result in results)
+    logger.security(f"Batch validation of {len(results)} rows, {failed} failed",
+                    level="warning")
+    return results
@@ -0,0 +1,107 @@
+import datetime
+import pytest
+from src.analytics import asset_analytics as aa
+
+pytestmark = pytest.mark.unit
+
+TODAY = datetime.date(2025, 1, 1)
+
+
+def _row(asset_id, type_id=1, location_id=None, employee_id=None,
+         added=datetime.date(2024, 6, 1), decommissioned=b"0"):
+    return {"id": asset_id, "type_id": type_id, "location_id": location_id,
+            "employee_id": employee_id, "date_added": added,
+            "is_decommissioned": decommissioned,
+            "updated_at": datetime.datetime(2025, 1, 1, 0, 0, asset_id % 60)}
+
+
+def _store(rows):
+    store = aa.AssetColumns()
+    store.load_rows(rows)
+    return store
+
+
+def test_load_rows_builds_columns():
+    store = _store([_row(1, location_id=1), _row(2, employee_id=4, decommissioned=b"1")])
+    assert store.size == 2
+    assert store.location_ids.tolist() == [1, 0]
+    assert store.employee_ids.tolist() == [0, 4]
+    assert store.decommissioned.tolist() == [False, True]
+
+
+def test_age_distribution_buckets_active_assets():
+    store = _store([
+        _row(1, location_id=1, added=datetime.date(2024, 12, 1)),
+        _row(2, location_id=1, added=datetime.date(2023, 6, 1)),
+        _row(3, location_id=1, added=datetime.date(2018, 1, 1)),
+        _row(4, location_id=1, added=datetime.date(2018, 1, 1), decommissioned=b"1"),
+    ])
+    ages = store.report(today=TODAY)["age_distribution"]
+    assert ages["count"] == 3
+    assert ages["buckets"] == {"<1y": 1, "1-2y": 1, "2-3y": 0, "3-5y": 0, "5y+": 1}
+
+
+def test_decommission_rate_by_type():
+    store = _store([_row(1, type_id=2, location_id=1),
+                    _row(2, type_id=2, location_id=1, decommissioned=b"1"),
+                    _row(3, type_id=5, location_id=1)])
+    rates = store.decommission_rates()
+    assert rates == [{"type_id": 2, "total": 2, "decommissioned": 1, "rate": 0.5},
+                     {"type_id": 5, "total": 1, "decommissioned": 0, "rate": 0.0}]
+
+
+def test_assets_per_employee_percentiles():
+    rows = [_row(i, employee_id=10) for i in range(1, 4)] + [_row(4, employee_id=11)]
+    per_employee = _store(rows).assets_per_employee()
+    assert per_employee["employees"] == 2
+    assert per_employee["max"] == 3
+    assert per_employee["p50"] == 2.0
+
+
+def test_refresh_forecast_by_location():
+    store = _store([
+        _row(1, location_id=7, added=datetime.date(2020, 1, 1)),   # overdue at 4 years
+        _row(2, location_id=7, added=datetime.date(2021, 6, 1)),   # due within a year
+        _row(3, location_id=7, added=datetime.date(2024, 6, 1)),   # not due
+        _row(4, employee_id=3, added=datetime.date(2019, 1, 1)),   # not at a location
+    ])
+    forecast = store.refresh_forecast(aa.np.datetime64(TODAY, "D"), 4, 365)
+    assert forecast == [{"location_id": 7, "active_assets": 3, "overdue": 1,
+                         "due_within_horizon": 1}]
+
+
+def test_refresh_rebuilds_from_the_read_model_only_when_it_changed(monkeypatch):
+    rows = [_row(1, location_id=1), _row(2, location_id=1)]
+    monkeypatch.setattr(aa.asset_read_model.db_ctrl, "get_resource_changes",
+                        lambda since, since_id, limit, user_position: (200, rows))
+    store = aa.AssetColumns()
+    loads = []
+    real_load = store.load_rows
+    monkeypatch.setattr(store, "load_rows", lambda r: loads.append(len(r)) or real_load(r))
+
+    assert store.refresh() is True
+    assert store.size == 2
+    rows = []       # the change feed has nothing new
+    assert store.refresh() is True
+    assert loads == [2]
+
+
+def test_refresh_failure(monkeypatch):
+    monkeypatch.setattr(aa.asset_read_model.db_ctrl, "get_resource_changes",
+                        lambda *a, **k: (400, []))
+    assert aa.AssetColumns().refresh() is False
+
+
+def test_written_off_assets_leave_the_columns(monkeypatch):
+    monkeypatch.setattr(aa.asset_read_model.db_ctrl, "get_resource_changes",
+                        lambda since, since_id, limit, user_position: (200, [_row(1), _row(2)]))
+    store = aa.AssetColumns()
+    assert store.refresh() is True and store.size == 2
+    # asset 2 was archived: the write listener no longer finds it in Asset
+    monkeypatch.setattr(aa.asset_read_model.db_ctrl, "get_resources_by_ids",
+                        lambda ids, role: (200, {"found": {}, "missing": [2]}))
+    store.source.on_write([2])
+    monkeypatch.setattr(aa.asset_read_model.db_ctrl, "get_resource_changes",
+                        lambda *a, **k: (200, []))
+    assert store.refresh() is True
+    assert store.ids.tolist() == [1]
@@ -12,13 +12,16 @@ def test_health(client, loguru_capture):
     assert any("health check called" in rec.record["message"] for rec in loguru_capture)
 
 def test_employees_count_uses_engine_mock(client, monkeypatch):
-    engine = sqlalchemy.create_engine("sqlite:///:memory:")
-    with engine.connect() as conn:
-        conn.execute(sqlalchemy.text("SELECT 1"))
+    # StaticPool keeps the one in-memory database across the request thread
+    engine = sqlalchemy.create_engine("sqlite:///:memory:", poolclass=sqlalchemy.pool.StaticPool,
+                                      connect_args={"check_same_thread": False})
+    with engine.begin() as conn:
+        conn.execute(sqlalchemy.text("CREATE TABLE Employee (id INTEGER PRIMARY KEY)"))
+        conn.execute(sqlalchemy.text("INSERT INTO Employee (id) VALUES (1), (2), (3)"))
 
     # Patch where it's USED now:
     monkeypatch.setattr(m, "get_db_connection", lambda: engine)
 
     r = client.get("/employees/count")
     assert r.status_code == 200
-    assert r.json() == {"count": 1}
+    assert r.json() == {"count": 3}
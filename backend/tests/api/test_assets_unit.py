@@ -22,3 +22,48 @@ def test_create_asset_rejects_unsupported_type(client):
     r = client.post("/assets", json={"type": "toaster", "location": "HQ"})
     assert r.status_code == 400
     assert r.json()["detail"] == "unsupported type"
+
+
+def test_asset_service_reads_from_loaded_read_model(monkeypatch):
+    class FakeModel:
+        loaded = True
+        def all(self):
+            return [{"id": 1}]
+        def get(self, asset_id):
+            return {"id": asset_id} if asset_id == 1 else None
+        def by_employee(self, employee_id):
+            return [{"id": 1, "employee_id": employee_id}]
+        def by_location(self, location_id):
+            return []
+    monkeypatch.setattr(assets.db_ctrl, "get_resources",
+                        lambda **_: pytest.fail("database used"))
+    svc = assets.AssetService(FakeModel())
+    assert svc.list() == [{"id": 1}]
+    assert svc.get_by_id(1) == {"id": 1}
+    assert svc.list_by_employee(3) == [{"id": 1, "employee_id": 3}]
+    assert svc.list_by_location(3) == []
+    with pytest.raises(assets.HTTPException) as exc:
+        svc.get_by_id(2)
+    assert exc.value.status_code == 404
+
+
+def test_asset_service_falls_back_to_database_until_loaded(monkeypatch):
+    class Unloaded:
+        loaded = False
+    monkeypatch.setattr(assets.db_ctrl, "get_resource_by_location_id",
+                        lambda location_id, user_position: (200, [{"id": 5}]))
+    assert assets.AssetService(Unloaded()).list_by_location(2) == [{"id": 5}]
+
+
+def test_list_assets_by_employee_route(client):
+    class FakeSvc(assets.AssetService):
+        def list_by_employee(self, employee_id):
+            return [{"id": 8, "employee_id": employee_id}]
+
+    client.app.dependency_overrides[assets.get_service] = lambda: FakeSvc()
+    try:
+        r = client.get("/assets/employee/3", headers={"Authorization": "Bearer x"})
+        assert r.status_code == 200
+        assert r.json() == [{"id": 8, "employee_id": 3}]
+    finally:
+        client.app.dependency_overrides.clear()
@@ -0,0 +1,142 @@
+import gzip
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from starlette.requests import Request
+from starlette.testclient import TestClient
+from src.api import compression
+from src.api.responses import FastJSONResponse
+
+pytestmark = pytest.mark.unit
+
+BIG = [{"id": i, "notes": "Laptop issued to the finance team"} for i in range(200)]
+
+
+@pytest.fixture
+def app():
+    app = FastAPI(default_response_class=FastJSONResponse)
+    app.add_middleware(compression.CompressionMiddleware, minimum_size=500)
+
+    @app.get("/big")
+    async def big():
+        return FastJSONResponse(BIG, headers={"ETag": '"7"'})
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield f"line {i}\n".encode()
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    @app.get("/binary")
+    async def binary():
+        return PlainTextResponse("x" * 2000, media_type="application/octet-stream")
+
+    @app.get("/precompressed")
+    async def precompressed(request: Request):
+        return compression.Precompressed(b'{"a":"' + b"b" * 2000 + b'"}').response(request)
+
+    return app
+
+
+def _raw_get(client, path, accept="gzip"):
+    # Ask for the undecoded bytes, to see exactly what went over the wire
+    with client.stream("GET", path, headers={"Accept-Encoding": accept}) as r:
+        return r, b"".join(r.iter_raw())
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, deflate", "gzip"),
+    ("br;q=0, gzip;q=0.5", "gzip"),
+    ("gzip;q=0", None),
+    ("*", compression.available_encodings()[0]),
+    ("identity", None),
+    (None, None),
+])
+def test_negotiate(header, expected):
+    assert compression.negotiate(header) == expected
+
+
+def test_large_json_is_compressed_and_etag_weakened(app):
+    r, raw = _raw_get(TestClient(app), "/big")
+    assert r.headers["content-encoding"] == "gzip"
+    assert r.headers["vary"] == "Accept-Encoding"
+    assert r.headers["etag"] == 'W/"7"'
+    assert int(r.headers["content-length"]) == len(raw)
+    assert gzip.decompress(raw) == FastJSONResponse(BIG).body
+
+
+@pytest.mark.parametrize("path, accept", [("/small", "gzip"), ("/big", "identity"),
+                                          ("/binary", "gzip")])
+def test_left_uncompressed(app, path, accept):
+    r, _ = _raw_get(TestClient(app), path, accept)
+    assert "content-encoding" not in r.headers
+
+
+def test_streamed_bodies_are_compressed_per_chunk(app):
+    r, raw = _raw_get(TestClient(app), "/stream")
+    assert r.headers["content-encoding"] == "gzip" and "content-length" not in r.headers
+    assert gzip.decompress(raw) == b"line 0\nline 1\nline 2\n"
+
+
+def test_precompressed_responses_are_not_compressed_again(app):
+    client = TestClient(app)
+    r, raw = _raw_get(client, "/precompressed")
+    assert r.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(raw).startswith(b'{"a":"bbb')
+    r, raw = _raw_get(client, "/precompressed", "identity")
+    assert "content-encoding" not in r.headers and raw.startswith(b'{"a"')
+
+
+def test_response_cache_expires(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(compression.time, "monotonic", lambda: now[0])
+    cache = compression.ResponseCache(ttl_seconds=60)
+    entry = cache.put("types", compression.Precompressed(b"[]"))
+    assert cache.get("types") is entry
+    now[0] += 61
+    assert cache.get("types") is None
+    disabled = compression.ResponseCache(ttl_seconds=0)
+    assert disabled.put("k", entry) is entry and disabled.get("k") is None
+
+
+def _decompress(data: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return compression.brotli.decompress(data)
+    if encoding == "zstd":
+        # Streamed frames carry no content size, so read them as a stream
+        return compression.zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    return gzip.decompress(data)
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "br", "zstd"])
+def test_every_encoding_round_trips(app, encoding):
+    assert encoding in compression.available_encodings()
+    client = TestClient(app)
+    r, raw = _raw_get(client, "/big", encoding)
+    assert r.headers["content-encoding"] == encoding
+    assert _decompress(raw, encoding) == FastJSONResponse(BIG).body
+
+    r, raw = _raw_get(client, "/stream", encoding)
+    assert r.headers["content-encoding"] == encoding
+    assert _decompress(raw, encoding) == b"line 0\nline 1\nline 2\n"
+
+    cached = compression.Precompressed(FastJSONResponse(BIG).body, minimum_size=500)
+    assert _decompress(cached.bodies[encoding], encoding) == cached.bodies[None]
+
+
+def test_reference_writes_clear_cached_responses(monkeypatch):
+    from src.database import database_controller as dc
+    cache = compression.ResponseCache(ttl_seconds=60)
+    cache.put("types", compression.Precompressed(b"[]"))
+    monkeypatch.setattr(dc.database_connector, "execute_query", lambda *_: [])
+    dc.add_reference_listener(cache.invalidate)
+    try:
+        assert dc.add_resource_type({"asset_type_name": "Dock"}, dc.auth.Role.MANAGER) == 200
+    finally:
+        dc.remove_reference_listener(cache.invalidate)
+    assert cache.get("types") is None
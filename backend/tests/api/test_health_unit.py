@@ -34,3 +34,34 @@ def test_health_ready_down(client, monkeypatch, loguru_capture):
     assert data["status"] == "error"
     assert data["db"]["status"] == "down"
     assert any("readiness db check FAILED" in rec.record["message"] for rec in loguru_capture)
+
+async def _stub_validate_ok(request, token: str, validate_body=True):
+    return {"status": "valid", "method": request.method}
+
+async def _stub_authorize_ok(request, decoded_payload: dict):
+    return {"authorized": True}
+
+def _stub_authenticate(title):
+    async def authenticate(request, token: str):
+        return {"decoded_payload": {"title": title}}
+    return authenticate
+
+def _authenticate_as(monkeypatch, title):
+    monkeypatch.setattr(health, "validate_request", _stub_validate_ok, raising=True)
+    monkeypatch.setattr(health, "authenticate_request", _stub_authenticate(title), raising=True)
+    monkeypatch.setattr(health, "authorize_request", _stub_authorize_ok, raising=True)
+
+def test_health_metrics_requires_a_token(client):
+    r = client.get("/health/metrics")
+    assert r.status_code == 401
+
+def test_health_metrics_requires_a_manager(client, monkeypatch):
+    _authenticate_as(monkeypatch, "Employee")
+    r = client.get("/health/metrics", headers={"Authorization": "Bearer x"})
+    assert r.status_code == 401
+
+def test_health_metrics_reports_token_cache(client, monkeypatch):
+    _authenticate_as(monkeypatch, "Manager")
+    r = client.get("/health/metrics", headers={"Authorization": "Bearer x"})
+    assert r.status_code == 200
+    assert "hit_rate" in r.json()["token_cache"]
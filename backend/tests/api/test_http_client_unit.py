@@ -0,0 +1,96 @@
+import asyncio
+import httpx
+import pytest
+from src.api import authenticate
+from src.api import http_client
+from src.api.routes import auth_proxy
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def fresh_client(monkeypatch):
+    monkeypatch.setattr(http_client, "_client", None)
+    monkeypatch.setattr(http_client, "_transport", None)
+    yield
+    asyncio.run(http_client.close())
+
+
+async def _keep_alive_server(connections: list):
+    async def handle(reader, writer):
+        connections.append(writer)
+        while await reader.readuntil(b"\r\n\r\n"):
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                         b"Content-Length: 17\r\n\r\n{\"title\": \"Aide\"}")
+            await writer.drain()
+
+    async def guarded(reader, writer):
+        try:
+            await handle(reader, writer)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    return await asyncio.start_server(guarded, "127.0.0.1", 0)
+
+
+def test_requests_reuse_one_pooled_connection(fresh_client):
+    connections = []
+
+    async def run():
+        server = await _keep_alive_server(connections)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            client = http_client.get_client()
+            for _ in range(3):
+                response = await client.get(f"http://127.0.0.1:{port}/user/info")
+                assert response.json() == {"title": "Aide"}
+            assert http_client.get_client() is client
+            return http_client.metrics()["hosts"][f"127.0.0.1:{port}"]
+        finally:
+            await http_client.close()
+            server.close()
+
+    stats = asyncio.run(run())
+    assert len(connections) == 1
+    assert stats["requests"] == 3 and stats["errors"] == 0
+    assert stats["open"] == 1 and stats["idle"] == 1
+
+
+def test_metered_transport_counts_errors():
+    def handler(request):
+        raise httpx.ConnectError("refused", request=request)
+
+    transport = http_client._MeteredTransport(httpx.MockTransport(handler))
+
+    async def run():
+        async with httpx.AsyncClient(transport=transport) as client:
+            with pytest.raises(httpx.ConnectError):
+                await client.get("https://sso.example/user/info")
+
+    asyncio.run(run())
+    assert transport.hosts["sso.example:443"]["errors"] == 1
+    assert transport.hosts["sso.example:443"]["in_flight"] == 0
+
+
+def test_metrics_before_start(fresh_client):
+    assert http_client.metrics() == {"started": False, "hosts": {}}
+
+
+def _mock_client(handler, seen):
+    def record(request):
+        seen.append(request)
+        return handler(request)
+    return httpx.AsyncClient(transport=httpx.MockTransport(record))
+
+
+def test_sso_verification_and_login_use_shared_client(monkeypatch):
+    seen = []
+    client = _mock_client(lambda request: httpx.Response(200, json={"title": "Manager"}), seen)
+    monkeypatch.setattr(http_client, "get_client", lambda: client)
+
+    assert asyncio.run(authenticate.verify_with_sso("abc")) == {"title": "Manager"}
+    assert seen[-1].headers["Authorization"] == "Bearer abc"
+
+    credentials = auth_proxy.LoginRequest(username="jdoe", password="pw")
+    assert asyncio.run(auth_proxy.proxy_login(credentials)) == {"title": "Manager"}
+    assert seen[-1].url == httpx.URL(auth_proxy.SSO_SERVER_URL)
@@ -0,0 +1,147 @@
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+import httpx
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+from src.api import authenticate
+from src.api import http_client
+from src.api import jwt_verifier
+
+pytestmark = pytest.mark.unit
+
+
+def _key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def _jwk(private_key, kid):
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+    return {**jwk, "kid": kid, "use": "sig", "alg": "RS256"}
+
+
+def _token(private_key, kid="k1", **claims):
+    claims = {"title": "Manager", "aud": "inventory", "exp": time.time() + 300, **claims}
+    claims = {name: value for name, value in claims.items() if value is not None}
+    return jwt.encode(claims, private_key, algorithm="RS256", headers={"kid": kid} if kid else None)
+
+
+@pytest.fixture
+def jwks(monkeypatch):
+    """Serves a mutable JWKS document through the shared HTTP client."""
+    document = {"keys": []}
+    fetches = []
+
+    def handler(request):
+        fetches.append(request)
+        return httpx.Response(200, json=document)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(http_client, "get_client", lambda: client)
+    return SimpleNamespace(document=document, fetches=fetches)
+
+
+def _verifier(**overrides):
+    options = {"jwks_url": "https://sso.example/jwks.json", "algorithms": ["RS256"],
+               "audience": "inventory", "enabled": True}
+    options.update(overrides)
+    return jwt_verifier.JWTVerifier(**options)
+
+
+def test_verifies_signature_and_claims_locally(jwks):
+    key = _key()
+    jwks.document["keys"] = [_jwk(key, "k1")]
+    verifier = _verifier()
+
+    async def run():
+        assert await verifier.refresh()
+        return await verifier.verify(_token(key))
+
+    assert asyncio.run(run())["title"] == "Manager"
+    assert len(jwks.fetches) == 1
+
+
+@pytest.mark.parametrize("claims", [{"exp": time.time() - 3600}, {"aud": "someone-else"}])
+def test_rejects_expired_or_foreign_tokens(jwks, claims):
+    key = _key()
+    jwks.document["keys"] = [_jwk(key, "k1")]
+    verifier = _verifier()
+    asyncio.run(verifier.refresh())
+    with pytest.raises(jwt.InvalidTokenError):
+        asyncio.run(verifier.verify(_token(key, **claims)))
+
+
+def test_rejects_token_signed_with_another_key(jwks):
+    jwks.document["keys"] = [_jwk(_key(), "k1")]
+    verifier = _verifier()
+    asyncio.run(verifier.refresh())
+    with pytest.raises(jwt.InvalidSignatureError):
+        asyncio.run(verifier.verify(_token(_key(), kid="k1")))
+
+
+def test_unknown_kid_triggers_a_rate_limited_reload(jwks):
+    old, new = _key(), _key()
+    jwks.document["keys"] = [_jwk(old, "k1")]
+    verifier = _verifier(min_refresh_seconds=0)
+    asyncio.run(verifier.refresh())
+
+    jwks.document["keys"] = [_jwk(old, "k1"), _jwk(new, "k2")]     # rotation
+    assert asyncio.run(verifier.verify(_token(new, kid="k2")))["title"] == "Manager"
+    assert len(jwks.fetches) == 2
+
+    verifier.min_refresh_seconds = 3600
+    assert asyncio.run(verifier.verify(_token(new, kid="k3"))) is None
+    assert len(jwks.fetches) == 2
+
+
+def test_undecidable_tokens_return_none(jwks):
+    verifier = _verifier()
+    assert asyncio.run(verifier.verify("opaque-session-token")) is None
+    hs = jwt.encode({"exp": time.time() + 60}, "secret" * 6, algorithm="HS256")
+    assert asyncio.run(verifier.verify(hs)) is None
+
+
+def test_pem_key_and_title_claim(tmp_path):
+    key = _key()
+    pem = tmp_path / "sso.pem"
+    pem.write_bytes(key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo))
+    verifier = _verifier(jwks_url=None, public_key_path=str(pem), title_claim="role")
+    asyncio.run(verifier.refresh())
+    claims = asyncio.run(verifier.verify(_token(key, kid=None, title=None, role="Aide")))
+    assert claims["title"] == "Aide"
+
+
+def test_authenticate_prefers_local_verification(jwks, monkeypatch):
+    key = _key()
+    jwks.document["keys"] = [_jwk(key, "k1")]
+    verifier = _verifier()
+    asyncio.run(verifier.refresh())
+    monkeypatch.setattr(authenticate.jwt_verifier, "verifier", verifier)
+
+    async def remote(token):
+        remote.calls += 1
+        return {"title": "Aide"}
+    remote.calls = 0
+    monkeypatch.setattr(authenticate, "verify_with_sso", remote)
+    monkeypatch.setattr(authenticate.token_cache, "cache", authenticate.token_cache.TokenCache())
+    request = SimpleNamespace(method="GET")
+
+    out = asyncio.run(authenticate.authenticate_request(request, f"Bearer {_token(key)}"))
+    assert out["decoded_payload"]["title"] == "Manager" and remote.calls == 0
+
+    with pytest.raises(HTTPException) as ei:
+        asyncio.run(authenticate.authenticate_request(
+            request, f"Bearer {_token(key, exp=time.time() - 3600)}"))
+    assert ei.value.status_code == 401 and remote.calls == 0
+
+    # Not decidable locally: remote fallback, unless disabled
+    out = asyncio.run(authenticate.authenticate_request(request, "Bearer opaque"))
+    assert out["decoded_payload"] == {"title": "Aide"} and remote.calls == 1
+    verifier.fallback_remote = False
+    with pytest.raises(HTTPException):
+        asyncio.run(authenticate.authenticate_request(request, "Bearer opaque-2"))
@@ -0,0 +1,65 @@
+import asyncio
+from types import SimpleNamespace
+import pytest
+from fastapi import HTTPException
+from src.api import pipeline
+from src.database.authorize import Role
+
+pytestmark = pytest.mark.unit
+
+
+class _Req:
+    def __init__(self, method="POST", token="Bearer x", body=None):
+        self.method = method
+        self.headers = {"Authorization": token} if token else {}
+        self.state = SimpleNamespace()
+        self.body = body
+        self.json_calls = 0
+
+    async def json(self):
+        self.json_calls += 1
+        return self.body
+
+
+async def _validate(request, token, validate_body=True):
+    body = await request.json() if validate_body and request.method in ("POST", "PUT") else None
+    return {"status": "valid", "method": request.method, "body": body}
+
+
+async def _authenticate(request, token):
+    return {"decoded_payload": {"title": "Manager", "email": "ada@example.com"}}
+
+
+async def _authorize(request, decoded):
+    return {"authorized": True}
+
+
+def test_run_parses_the_body_once_and_builds_a_principal():
+    request = _Req(body={"type_id": 1})
+    ctx = asyncio.run(pipeline.run(request, _validate, _authenticate, _authorize))
+    assert ctx.body == {"type_id": 1} and request.json_calls == 1
+    assert ctx.principal.role == Role.MANAGER
+    assert ctx.principal.actor == "ada@example.com"
+    assert list(ctx.timings) == ["validate", "authenticate", "authorize", "role"]
+    assert request.state.timings is ctx.timings
+
+
+def test_streamed_routes_leave_the_body_unread():
+    request = _Req(body={"type_id": 1})
+    ctx = asyncio.run(pipeline.run(request, _validate, _authenticate, _authorize,
+                                   validate_body=False))
+    assert ctx.body is None and request.json_calls == 0
+
+
+def test_missing_token_stops_before_any_stage():
+    async def never(*_args, **_kwargs):
+        raise AssertionError("stage must not run")
+
+    with pytest.raises(HTTPException) as ei:
+        asyncio.run(pipeline.run(_Req(token=None), never, never, never))
+    assert ei.value.status_code == 401
+
+
+def test_server_timing_header_format():
+    assert pipeline.server_timing({"validate": 0.5, "authenticate": 12.345}) == \
+        "validate;dur=0.50, authenticate;dur=12.35"
@@ -0,0 +1,128 @@
+import asyncio
+import httpx
+import pytest
+from fastapi import HTTPException
+from src.api import authenticate
+from src.api import http_client
+from src.api import resilience
+from src.api import token_cache
+
+pytestmark = pytest.mark.unit
+
+
+async def _fail():
+    raise resilience.DependencyError("boom")
+
+
+async def _ok():
+    return "ok"
+
+
+def test_breaker_opens_fails_fast_and_recovers_through_half_open(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(resilience.time, "monotonic", lambda: now[0])
+    dependency = resilience.ResilientDependency(
+        "sso", resilience.CircuitBreaker("sso", failure_threshold=2, reset_timeout_seconds=30))
+
+    async def run():
+        for _ in range(2):
+            with pytest.raises(resilience.DependencyError):
+                await dependency.call(_fail)
+        assert dependency.breaker.state == resilience.OPEN
+        with pytest.raises(resilience.CircuitOpenError):
+            await dependency.call(_ok)
+
+        now[0] += 31                                 # half-open: one trial call
+        with pytest.raises(resilience.DependencyError):
+            await dependency.call(_fail)
+        assert dependency.breaker.state == resilience.OPEN
+
+        now[0] += 31
+        assert await dependency.call(_ok) == "ok"
+        assert dependency.breaker.state == resilience.CLOSED
+
+    asyncio.run(run())
+    metrics = dependency.metrics()
+    assert metrics["times_opened"] == 2 and metrics["rejected_while_open"] == 1
+
+
+def test_attempts_are_bounded_by_the_request_timeout():
+    dependency = resilience.ResilientDependency("sso", request_timeout_seconds=0.01)
+
+    async def slow():
+        await asyncio.sleep(1)
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(dependency.call(slow))
+    assert dependency.breaker.failures == 1
+
+
+def test_slow_call_is_hedged_and_the_hedge_wins():
+    dependency = resilience.ResilientDependency("sso", hedge_delay_ms=10, max_hedge_ratio=1.0)
+    delays = iter([1.0, 0.0])
+    cancelled = []
+
+    async def attempt():
+        delay = next(delays)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(delay)
+            raise
+        return delay
+
+    assert asyncio.run(dependency.call(attempt, hedge=True)) == 0.0
+    assert (dependency.hedges, dependency.hedge_wins) == (1, 1)
+    assert cancelled == [1.0]                       # the losing attempt is cancelled
+
+
+def test_hedging_respects_its_budget():
+    dependency = resilience.ResilientDependency("sso", hedge_delay_ms=1, max_hedge_ratio=0.0)
+
+    async def attempt():
+        await asyncio.sleep(0.01)
+        return "slow"
+
+    assert asyncio.run(dependency.call(attempt, hedge=True)) == "slow"
+    assert dependency.hedges == 0
+
+
+def test_grace_window_serves_recent_tokens_while_sso_is_down(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(token_cache.time, "monotonic", lambda: now[0])
+    cache = token_cache.TokenCache(enabled=True, ttl_seconds=60, grace_seconds=300)
+
+    async def up(token):
+        return {"title": "Manager"}
+
+    async def down(token):
+        raise HTTPException(status_code=503)
+
+    asyncio.run(cache.verify("known", up))
+    now[0] += 120                                  # past the TTL, inside the grace window
+    assert asyncio.run(cache.verify("known", down)) == {"title": "Manager"}
+    assert cache.grace_hits == 1
+    with pytest.raises(HTTPException):
+        asyncio.run(cache.verify("never-seen", down))
+    now[0] += 300                                  # grace window over
+    with pytest.raises(HTTPException):
+        asyncio.run(cache.verify("known", down))
+
+
+def test_sso_5xx_opens_the_breaker(monkeypatch):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(502)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(http_client, "get_client", lambda: client)
+    monkeypatch.setattr(resilience, "sso", resilience.ResilientDependency(
+        "sso", resilience.CircuitBreaker("sso", failure_threshold=2), hedge_delay_ms=0))
+
+    for detail in ("unreachable", "unreachable", "unavailable"):
+        with pytest.raises(HTTPException) as ei:
+            asyncio.run(authenticate.verify_with_sso("abc"))
+        assert ei.value.status_code == 503 and detail in ei.value.detail
+    assert len(calls) == 2                         # the third call failed fast
@@ -1,11 +1,18 @@
 # tests/api/test_resources_routes_unit.py
 from types import SimpleNamespace
 import pytest
+from src.api import compression
 from src.api.routes import resources as R
 from src.database import authorize as db_auth
 
 pytestmark = pytest.mark.unit
 
+
+@pytest.fixture(autouse=True)
+def _fresh_reference_responses(monkeypatch):
+    # Each test sees its own fake db, not a response cached by an earlier test
+    monkeypatch.setattr(R, "reference_responses", compression.ResponseCache())
+
 # --------- Async stubs used by our route ---------
 async def _stub_validate_ok(request, token: str):
     return {"status": "valid", "method": request.method}
@@ -44,7 +51,7 @@ def test_get_resources_happy_path(client, monkeypatch, loguru_capture):
     monkeypatch.setattr(R, "authenticate_request", _stub_authenticate_employee, raising=True)
     monkeypatch.setattr(R, "authorize_request", _stub_authorize_ok, raising=True)
 
-    fake = _fake_db(get_resources=lambda role: (200, [{"id": 1, "location": "HQ"}]))
+    fake = _fake_db(get_resources=lambda role, **_: (200, [{"id": 1, "location": "HQ"}]))
     monkeypatch.setattr(R, "db", fake, raising=True)
 
     r = client.get("/resources/", headers={"Authorization": "Bearer x"})
@@ -57,7 +64,7 @@ def test_get_resource_types_happy_path(client, monkeypatch):
     monkeypatch.setattr(R, "authenticate_request", _stub_authenticate_employee, raising=True)
     monkeypatch.setattr(R, "authorize_request", _stub_authorize_ok, raising=True)
 
-    fake = _fake_db(get_resource_types=lambda role: (200, [{"id": 4, "asset_type_name": "Monitor"}]))
+    fake = _fake_db(get_resource_types=lambda role, **_: (200, [{"id": 4, "asset_type_name": "Monitor"}]))
     monkeypatch.setattr(R, "db", fake, raising=True)
 
     r = client.get("/resources/types/", headers={"Authorization": "Bearer x"})
@@ -70,7 +77,7 @@ def test_get_resource_by_id_happy_path(client, monkeypatch):
     monkeypatch.setattr(R, "authenticate_request", _stub_authenticate_employee, raising=True)
     monkeypatch.setattr(R, "authorize_request", _stub_authorize_ok, raising=True)
 
-    fake = _fake_db(get_resource_by_id=lambda rid, role: (200, {"id": rid, "location": "HQ"}))
+    fake = _fake_db(get_resource_by_id=lambda rid, role, **_: (200, {"id": rid, "location": "HQ"}))
     monkeypatch.setattr(R, "db", fake, raising=True)
 
     r = client.get("/resources/123", headers={"Authorization": "Bearer x"})
@@ -83,7 +90,7 @@ def test_get_resources_by_employee_happy_path(client, monkeypatch):
     monkeypatch.setattr(R, "authenticate_request", _stub_authenticate_employee, raising=True)
     monkeypatch.setattr(R, "authorize_request", _stub_authorize_ok, raising=True)
 
-    fake = _fake_db(get_resource_by_employee_id=lambda eid, role: (200, [{"id": 7, "employee_id": eid}]))
+    fake = _fake_db(get_resource_by_employee_id=lambda eid, role, **_: (200, [{"id": 7, "employee_id": eid}]))
     monkeypatch.setattr(R, "db", fake, raising=True)
 
     r = client.get("/resources/employee/55", headers={"Authorization": "Bearer x"})
@@ -96,7 +103,7 @@ def test_get_resources_by_location_happy_path(client, monkeypatch):
     monkeypatch.setattr(R, "authenticate_request", _stub_authenticate_employee, raising=True)
     monkeypatch.setattr(R, "authorize_request", _stub_authorize_ok, raising=True)
 
-    fake = _fake_db(get_resource_by_location_id=lambda lid, role: (200, [{"id": 8, "location_id": lid}]))
+    fake = _fake_db(get_resource_by_location_id=lambda lid, role, **_: (200, [{"id": 8, "location_id": lid}]))
     monkeypatch.setattr(R, "db", fake, raising=True)
 
     r = client.get("/resources/location/77", headers={"Authorization": "Bearer x"})
@@ -137,7 +144,7 @@ def test_put_resource_manager_updates(client, monkeypatch):
     monkeypatch.setattr(R, "authorize_request", _stub_authorize_ok, raising=True)
 
     captured = {}
-    def fake_update(body, title):
+    def fake_update(body, title, expected_version=None, actor=None):
         captured["title"] = title
         captured["asset_id"] = body.get("asset_id")
         captured["notes"] = body.get("notes")
@@ -202,7 +209,7 @@ def test_get_resources_db_error_400(client, monkeypatch):
     monkeypatch.setattr(R, "authenticate_request", _stub_authenticate_employee, raising=True)
     monkeypatch.setattr(R, "authorize_request", _stub_authorize_ok, raising=True)
 
-    fake = _fake_db(get_resources=lambda role: (400, []))
+    fake = _fake_db(get_resources=lambda role, **_: (400, []))
     monkeypatch.setattr(R, "db", fake, raising=True)
 
     r = client.get("/resources/", headers={"Authorization": "Bearer x"})
@@ -215,7 +222,7 @@ def test_get_resource_types_db_error_400(client, monkeypatch):
     monkeypatch.setattr(R, "authenticate_request", _stub_authenticate_employee, raising=True)
     monkeypatch.setattr(R, "authorize_request", _stub_authorize_ok, raising=True)
 
-    fake = _fake_db(get_resource_types=lambda role: (400, []))
+    fake = _fake_db(get_resource_types=lambda role, **_: (400, []))
     monkeypatch.setattr(R, "db", fake, raising=True)
 
     r = client.get("/resources/types/", headers={"Authorization": "Bearer x"})
@@ -228,7 +235,7 @@ def test_get_resource_by_id_404_when_missing(client, monkeypatch):
     monkeypatch.setattr(R, "authenticate_request", _stub_authenticate_employee, raising=True)
     monkeypatch.setattr(R, "authorize_request", _stub_authorize_ok, raising=True)
 
-    fake = _fake_db(get_resource_by_id=lambda rid, role: (400, {}))
+    fake = _fake_db(get_resource_by_id=lambda rid, role, **_: (400, {}))
     monkeypatch.setattr(R, "db", fake, raising=True)
 
     r = client.get("/resources/777", headers={"Authorization": "Bearer x"})
@@ -241,7 +248,7 @@ def test_get_resources_by_employee_db_error_400(client, monkeypatch):
     monkeypatch.setattr(R, "authenticate_request", _stub_authenticate_employee, raising=True)
     monkeypatch.setattr(R, "authorize_request", _stub_authorize_ok, raising=True)
 
-    fake = _fake_db(get_resource_by_employee_id=lambda eid, role: (400, []))
+    fake = _fake_db(get_resource_by_employee_id=lambda eid, role, **_: (400, []))
     monkeypatch.setattr(R, "db", fake, raising=True)
 
     r = client.get("/resources/employee/22", headers={"Authorization": "Bearer x"})
@@ -254,7 +261,7 @@ def test_get_resources_by_location_db_error_400(client, monkeypatch):
     monkeypatch.setattr(R, "authenticate_request", _stub_authenticate_employee, raising=True)
     monkeypatch.setattr(R, "authorize_request", _stub_authorize_ok, raising=True)
 
-    fake = _fake_db(get_resource_by_location_id=lambda lid, role: (400, []))
+    fake = _fake_db(get_resource_by_location_id=lambda lid, role, **_: (400, []))
     monkeypatch.setattr(R, "db", fake, raising=True)
 
     r = client.get("/resources/location/33", headers={"Authorization": "Bearer x"})
@@ -304,3 +311,385 @@ def test_delete_resource_db_failure_400(client, monkeypatch):
     r = client.delete("/resources/7", headers={"Authorization": "Bearer x"})
     assert r.status_code == 400
     assert r.json()["detail"] == "Database delete failed"
+
+
+# -------------------- Optimistic concurrency --------------------
+
+def test_get_resource_by_id_exposes_version_as_etag(client, monkeypatch):
+    monkeypatch.setattr(R, "validate_request", _stub_validate_ok, raising=True)
+    monkeypatch.setattr(R, "authenticate_request", _stub_authenticate_employee, raising=True)
+    monkeypatch.setattr(R, "authorize_request", _stub_authorize_ok, raising=True)
+
+    fake = _fake_db(get_resource_by_id=lambda rid, role, **_: (200, {"id": rid, "version": 4}))
+    monkeypatch.setattr(R, "db", fake, raising=True)
+
+    r = client.get("/resources/9", headers={"Authorization": "Bearer x"})
+    assert r.status_code == 200
+    assert r.headers["ETag"] == '"4"'
+
+
+def test_put_resource_passes_if_match_version(client, monkeypatch):
+    monkeypatch.setattr(R, "validate_request", _stub_validate_ok, raising=True)
+    monkeypatch.setattr(R, "authenticate_request", _stub_authenticate_manager, raising=True)
+    monkeypatch.setattr(R, "authorize_request", _stub_authorize_ok, raising=True)
+
+    captured = {}
+    def fake_update(body, title, expected_version=None, actor=None):
+        captured["expected_version"] = expected_version
+        return 200
+
+    monkeypatch.setattr(R, "db", _fake_db(update_resource=fake_update), raising=True)
+
+    body = {"type_id": 2, "location_id": 5, "employee_id": None,
+            "notes": "changed", "is_decommissioned": 0}
+    r = client.put("/resources/5", json=body,
+                   headers={"Authorization": "Bearer x", "If-Match": 'W/"3"'})
+    assert r.status_code == 200
+    assert captured["expected_version"] == 3
+    assert r.headers["ETag"] == '"4"'
+
+
+def test_put_resource_version_conflict_412(client, monkeypatch):
+    monkeypatch.setattr(R, "validate_request", _stub_validate_ok, raising=True)
+    monkeypatch.setattr(R, "authenticate_request", _stub_authenticate_manager, raising=True)
+    monkeypatch.setattr(R, "authorize_request", _stub_authorize_ok, raising=True)
+
+    monkeypatch.setattr(R, "db", _fake_db(update_resource=lambda *_: 412), raising=True)
+
+    body = {"type_id": 2, "location_id": 5, "employee_id": None,
+            "notes": "changed", "is_decommissioned": 0}
+    r = client.put("/resources/5", json=body,
+                   headers={"Authorization": "Bearer x", "If-Match": '"3"'})
+    assert r.status_code == 412
+
+
+def test_delete_resource_unparseable_if_match_412(client, monkeypatch):
+    monkeypatch.setattr(R, "validate_request", _stub_validate_ok, raising=True)
+    monkeypatch.setattr(R, "authenticate_request", _stub_authenticate_manager, raising=True)
+    monkeypatch.setattr(R, "authorize_request", _stub_authorize_ok, raising=True)
+
+    def should_not_run(*_a, **_k):
+        raise AssertionError("delete_resource should not be called")
+
+    monkeypatch.setattr(R, "db", _fake_db(delete_resource=should_not_run), raising=True)
+
+    r = client.delete("/resources/7", headers={"Authorization": "Bearer x", "If-Match": '"abc"'})
+    assert r.status_code == 412
+
+
+# -------------------- Change feed --------------------
+
+def test_get_resource_changes_returns_cursor(client, monkeypatch):
+    monkeypatch.setattr(R, "validate_request", _stub_validate_ok, raising=True)
+    monkeypatch.setattr(R, "authenticate_request", _stub_authenticate_employee, raising=True)
+    monkeypatch.setattr(R, "authorize_request", _stub_authorize_ok, raising=True)
+
+    captured = {}
+    def fake_changes(since, since_id, limit, role):
+        captured.update(since=since, since_id=since_id, limit=limit)
+        return 200, [{"id": 3, "updated_at": R.datetime(2025, 3, 1, 12, 0, 0, 5)},
+                     {"id": 4, "updated_at": R.datetime(2025, 3, 1, 12, 0, 1)}]
+
+    monkeypatch.setattr(R, "db", _fake_db(get_resource_changes=fake_changes), raising=True)
+
+    r = client.get("/resources/changes",
+                   params={"since": "2025-03-01T11:00:00,2", "limit": 2},
+                   headers={"Authorization": "Bearer x"})
+    assert r.status_code == 200
+    assert captured == {"since": R.datetime(2025, 3, 1, 11), "since_id": 2, "limit": 2}
+    assert r.json()["next_cursor"] == "2025-03-01T12:00:01,4"
+    assert r.json()["has_more"] is True
+
+
+def test_get_resource_changes_bad_cursor_400(client, monkeypatch):
+    monkeypatch.setattr(R, "validate_request", _stub_validate_ok, raising=True)
+    monkeypatch.setattr(R, "authenticate_request", _stub_authenticate_employee, raising=True)
+    monkeypatch.setattr(R, "authorize_request", _stub_authorize_ok, raising=True)
+    monkeypatch.setattr(R, "db", _fake_db(), raising=True)
+
+    r = client.get("/resources/changes", params={"since": "yesterday"},
+                   headers={"Authorization": "Bearer x"})
+    assert r.status_code == 400
+
+
+# -------------------- Archive --------------------
+
+def test_get_resources_include_archived_is_forwarded(client, monkeypatch):
+    monkeypatch.setattr(R, "validate_request", _stub_validate_ok, raising=True)
+    monkeypatch.setattr(R, "authenticate_request", _stub_authenticate_employee, raising=True)
+    monkeypatch.setattr(R, "authorize_request", _stub_authorize_ok, raising=True)
+
+    captured = {}
+    def fake_get(role, include_archived=False):
+        captured["include_archived"] = include_archived
+        return 200, []
+
+    monkeypatch.setattr(R, "db", _fake_db(get_resources=fake_get), raising=True)
+
+    r = client.get("/resources/", params={"include_archived": "true"},
+                   headers={"Authorization": "Bearer x"})
+    assert r.status_code == 200
+    assert captured["include_archived"] is True
+
+
+# -------------------- Stats --------------------
+
+def test_get_resource_stats_summarizes_buckets(client, monkeypatch):
+    monkeypatch.setattr(R, "validate_request", _stub_validate_ok, raising=True)
+    monkeypatch.setattr(R, "authenticate_request", _stub_authenticate_employee, raising=True)
+    monkeypatch.setattr(R, "authorize_request", _stub_authorize_ok, raising=True)
+
+    rows = [
+        {"type_id": 1, "location_key": 5, "is_decommissioned": 0, "asset_count": 3},
+        {"type_id": 1, "location_key": 0, "is_decommissioned": 1, "asset_count": 2},
+        {"type_id": 2, "location_key": 5, "is_decommissioned": 0, "asset_count": 0},
+    ]
+    monkeypatch.setattr(R, "db", _fake_db(get_resource_stats=lambda role: (200, rows)),
+                        raising=True)
+
+    r = client.get("/resources/stats", headers={"Authorization": "Bearer x"})
+    assert r.status_code == 200
+    body = r.json()
+    assert (body["total"], body["active"], body["decommissioned"]) == (5, 3, 2)
+    assert body["by_type"] == [{"type_id": 1, "total": 5, "active": 3, "decommissioned": 2}]
+    assert {"location_id": None, "total": 2, "active": 0, "decommissioned": 2} in body["by_location"]
+
+
+def test_get_resource_analytics_refreshes_and_reports(client, monkeypatch):
+    monkeypatch.setattr(R, "validate_request", _stub_validate_ok, raising=True)
+    monkeypatch.setattr(R, "authenticate_request", _stub_authenticate_employee, raising=True)
+    monkeypatch.setattr(R, "authorize_request", _stub_authorize_ok, raising=True)
+
+    calls = []
+    fake_store = SimpleNamespace(
+        refresh_if_stale=lambda: True,
+        report=lambda years, horizon: calls.append((years, horizon)) or {"assets": 0})
+    monkeypatch.setattr(R, "analytics_store", fake_store, raising=True)
+
+    r = client.get("/resources/analytics?refresh_years=3&horizon_days=90",
+                   headers={"Authorization": "Bearer x"})
+    assert r.status_code == 200
+    assert r.json() == {"assets": 0}
+    assert calls == [(3, 90)]
+
+
+def test_get_resource_analytics_refresh_failure_returns_400(client, monkeypatch):
+    monkeypatch.setattr(R, "validate_request", _stub_validate_ok, raising=True)
+    monkeypatch.setattr(R, "authenticate_request", _stub_authenticate_employee, raising=True)
+    monkeypatch.setattr(R, "authorize_request", _stub_authorize_ok, raising=True)
+    monkeypatch.setattr(R, "analytics_store",
+                        SimpleNamespace(refresh_if_stale=lambda: False), raising=True)
+
+    r = client.get("/resources/analytics", headers={"Authorization": "Bearer x"})
+    assert r.status_code == 400
+
+
+def test_get_resource_analytics_requires_read_access(client, monkeypatch):
+    async def _stub_authenticate_other(request, token: str):
+        return {"decoded_payload": {"title": "Visitor", "first_name": "Eve"}}
+
+    monkeypatch.setattr(R, "validate_request", _stub_validate_ok, raising=True)
+    monkeypatch.setattr(R, "authenticate_request", _stub_authenticate_other, raising=True)
+    monkeypatch.setattr(R, "authorize_request", _stub_authorize_ok, raising=True)
+
+    def refresh():
+        raise AssertionError("analytics must not be computed")
+    monkeypatch.setattr(R, "analytics_store",
+                        SimpleNamespace(refresh_if_stale=refresh), raising=True)
+
+    r = client.get("/resources/analytics", headers={"Authorization": "Bearer x"})
+    assert r.status_code == 401
+    assert r.json()["detail"] == "Unauthorized"
+
+
+def test_search_resources_paginates_with_extra_row(client, monkeypatch):
+    monkeypatch.setattr(R, "validate_request", _stub_validate_ok, raising=True)
+    monkeypatch.setattr(R, "authenticate_request", _stub_authenticate_employee, raising=True)
+    monkeypatch.setattr(R, "authorize_request", _stub_authorize_ok, raising=True)
+
+    calls = []
+    def fake_search(text, filters, limit, offset, role):
+        calls.append((text, filters, limit, offset))
+        return 200, [{"id": i, "notes": "cracked screen", "relevance": 1.0} for i in range(limit)]
+    monkeypatch.setattr(R, "db", _fake_db(search_resources=fake_search), raising=True)
+
+    r = client.get("/resources/search?q=cracked%20screen&decommissioned=false&limit=2&offset=4",
+                   headers={"Authorization": "Bearer x"})
+    assert r.status_code == 200
+    body = r.json()
+    assert [row["id"] for row in body["results"]] == [0, 1]
+    assert body["next_offset"] == 6 and body["has_more"] is True
+    assert calls == [("cracked screen",
+                      {"type_id": None, "location_id": None, "is_decommissioned": 0}, 3, 4)]
+
+
+def test_search_resources_invalid_text_returns_400(client, monkeypatch):
+    monkeypatch.setattr(R, "validate_request", _stub_validate_ok, raising=True)
+    monkeypatch.setattr(R, "authenticate_request", _stub_authenticate_employee, raising=True)
+    monkeypatch.setattr(R, "authorize_request", _stub_authorize_ok, raising=True)
+    monkeypatch.setattr(R, "db", _fake_db(search_resources=lambda *_: (400, [])), raising=True)
+
+    r = client.get("/resources/search?q=%2B%2B", headers={"Authorization": "Bearer x"})
+    assert r.status_code == 400
+
+
+def test_get_employees_served_from_index_with_cursor_header(client, monkeypatch):
+    monkeypatch.setattr(R, "validate_request", _stub_validate_ok, raising=True)
+    monkeypatch.setattr(R, "authenticate_request", _stub_authenticate_employee, raising=True)
+    monkeypatch.setattr(R, "authorize_request", _stub_authorize_ok, raising=True)
+
+    index = R.employee_index.EmployeeIndex()
+    index.load([{"id": 1, "first_name": "Ada", "last_name": "Lovelace"},
+                {"id": 3, "first_name": "Adam", "last_name": "Smith"}])
+    monkeypatch.setattr(R.employee_index, "index", index, raising=True)
+    monkeypatch.setattr(R, "db", _fake_db(get_employees=lambda *a, **k: pytest.fail("db used")),
+                        raising=True)
+
+    r = client.get("/resources/employees/?q=ada&limit=1", headers={"Authorization": "Bearer x"})
+    assert r.status_code == 200
+    assert r.json() == [{"employee_id": 1, "first_name": "Ada", "last_name": "Lovelace"}]
+
+    r = client.get(f"/resources/employees/?q=ada&limit=1&cursor={r.headers['X-Next-Cursor']}",
+                   headers={"Authorization": "Bearer x"})
+    assert r.json() == [{"employee_id": 3, "first_name": "Adam", "last_name": "Smith"}]
+    assert "X-Next-Cursor" not in r.headers
+
+
+def test_get_resources_batch_keys_by_id(client, monkeypatch):
+    monkeypatch.setattr(R, "validate_request", _stub_validate_ok, raising=True)
+    monkeypatch.setattr(R, "authenticate_request", _stub_authenticate_employee, raising=True)
+    monkeypatch.setattr(R, "authorize_request", _stub_authorize_ok, raising=True)
+
+    calls = []
+    def fake_batch(ids, role, **kwargs):
+        calls.append((ids, kwargs))
+        return 200, {"found": {1: {"id": 1, "is_decommissioned": b"0"}}, "missing": [7]}
+    monkeypatch.setattr(R, "db", _fake_db(get_resources_by_ids=fake_batch), raising=True)
+
+    r = client.get("/resources/batch?ids=1,7", headers={"Authorization": "Bearer x"})
+    assert r.status_code == 200
+    assert r.json() == {"resources": {"1": {"id": 1, "is_decommissioned": "0"}}, "missing": [7]}
+    assert calls == [([1, 7], {"include_archived": False})]
+
+
+@pytest.mark.parametrize("ids", ["1,x", ",", ",".join(str(i) for i in range(R.MAX_BATCH_IDS + 1))])
+def test_get_resources_batch_rejects_bad_id_lists(client, monkeypatch, ids):
+    monkeypatch.setattr(R, "validate_request", _stub_validate_ok, raising=True)
+    monkeypatch.setattr(R, "authenticate_request", _stub_authenticate_employee, raising=True)
+    monkeypatch.setattr(R, "authorize_request", _stub_authorize_ok, raising=True)
+
+    r = client.get(f"/resources/batch?ids={ids}", headers={"Authorization": "Bearer x"})
+    assert r.status_code == 400
+
+
+async def _stub_validate_streamed(request, token: str, validate_body: bool = True):
+    assert validate_body is False
+    return {"status": "valid", "method": request.method}
+
+
+def test_audit_location_streams_tags_into_report(client, monkeypatch):
+    monkeypatch.setattr(R, "validate_request", _stub_validate_streamed, raising=True)
+    monkeypatch.setattr(R, "authenticate_request", _stub_authenticate_manager, raising=True)
+    monkeypatch.setattr(R, "authorize_request", _stub_authorize_ok, raising=True)
+
+    seen = {}
+    def fake_reconcile(location_id, scanned):
+        seen["args"] = (location_id, scanned)
+        return {"location_id": location_id, "matched": len(scanned)}
+    monkeypatch.setattr(R.audit, "reconcile_location", fake_reconcile, raising=True)
+
+    r = client.post("/resources/audit/4", content="L-1\nL-2\nL-1\n",
+                    headers={"Authorization": "Bearer x", "Content-Type": "text/plain"})
+    assert r.status_code == 200
+    assert r.json() == {"location_id": 4, "matched": 2, "duplicates": 1}
+    assert seen["args"] == (4, {"L-1", "L-2"})
+
+
+def test_audit_location_empty_body_returns_400(client, monkeypatch):
+    monkeypatch.setattr(R, "validate_request", _stub_validate_streamed, raising=True)
+    monkeypatch.setattr(R, "authenticate_request", _stub_authenticate_manager, raising=True)
+    monkeypatch.setattr(R, "authorize_request", _stub_authorize_ok, raising=True)
+
+    r = client.post("/resources/audit/4", content="\n\n",
+                    headers={"Authorization": "Bearer x", "Content-Type": "text/plain"})
+    assert r.status_code == 400
+
+
+def test_import_resources_streams_file_to_importer(client, monkeypatch):
+    monkeypatch.setattr(R, "validate_request", _stub_validate_streamed, raising=True)
+    monkeypatch.setattr(R, "authenticate_request", _stub_authenticate_manager, raising=True)
+    monkeypatch.setattr(R, "authorize_request", _stub_authorize_ok, raising=True)
+
+    seen = {}
+    def fake_import(file, file_format, role):
+        seen["args"] = (file.read(), file_format, role)
+        return {"rows": 1, "inserted": 1, "failed": 0, "errors": [], "errors_truncated": False}
+    monkeypatch.setattr(R.asset_import, "import_assets", fake_import, raising=True)
+
+    r = client.post("/resources/import", content="type,location\nLaptop,Austin\n",
+                    headers={"Authorization": "Bearer x", "Content-Type": "text/csv"})
+    assert r.status_code == 200
+    assert r.json()["inserted"] == 1
+    assert seen["args"] == (b"type,location\nLaptop,Austin\n", "csv", db_auth.Role.MANAGER)
+
+
+def test_import_resources_unknown_format_415(client, monkeypatch):
+    monkeypatch.setattr(R, "validate_request", _stub_validate_streamed, raising=True)
+    monkeypatch.setattr(R, "authenticate_request", _stub_authenticate_manager, raising=True)
+    monkeypatch.setattr(R, "authorize_request", _stub_authorize_ok, raising=True)
+
+    r = client.post("/resources/import", content="{}",
+                    headers={"Authorization": "Bearer x", "Content-Type": "application/json"})
+    assert r.status_code == 415
+
+
+def test_get_resource_history_forwards_paging(client, monkeypatch):
+    monkeypatch.setattr(R, "validate_request", _stub_validate_ok, raising=True)
+    monkeypatch.setattr(R, "authenticate_request", _stub_authenticate_manager, raising=True)
+    monkeypatch.setattr(R, "authorize_request", _stub_authorize_ok, raising=True)
+
+    seen = {}
+    def fake_history(asset_id, title, limit, before_id):
+        seen["args"] = (asset_id, title, limit, before_id)
+        return 200, [{"id": 3, "action": "update", "before": {"notes": "a"},
+                      "after": {"notes": "b"}}]
+    monkeypatch.setattr(R, "db", _fake_db(get_resource_history=fake_history), raising=True)
+
+    r = client.get("/resources/7/history?limit=5000&before=10",
+                   headers={"Authorization": "Bearer x"})
+    assert r.status_code == 200
+    assert r.json()[0]["after"] == {"notes": "b"}
+    assert seen["args"] == (7, db_auth.Role.MANAGER, 1000, 10)
+
+
+def test_routes_report_pipeline_stage_timings(client, monkeypatch):
+    monkeypatch.setattr(R, "validate_request", _stub_validate_ok, raising=True)
+    monkeypatch.setattr(R, "authenticate_request", _stub_authenticate_employee, raising=True)
+    monkeypatch.setattr(R, "authorize_request", _stub_authorize_ok, raising=True)
+    monkeypatch.setattr(R, "db", _fake_db(get_resources=lambda role, **_: (200, [])), raising=True)
+
+    r = client.get("/resources/", headers={"Authorization": "Bearer x"})
+    assert r.status_code == 200
+    stages = [part.split(";")[0] for part in r.headers["Server-Timing"].split(", ")]
+    assert stages == ["validate", "authenticate", "authorize", "role"]
+
+
+def test_reference_responses_are_cached_precompressed(client, monkeypatch):
+    monkeypatch.setattr(R, "validate_request", _stub_validate_ok, raising=True)
+    monkeypatch.setattr(R, "authenticate_request", _stub_authenticate_employee, raising=True)
+    monkeypatch.setattr(R, "authorize_request", _stub_authorize_ok, raising=True)
+    calls = []
+    types = [{"id": i, "asset_type_name": f"Type {i}"} for i in range(200)]
+    def fake_types(role, **_):
+        calls.append(role)
+        return 200, types
+    monkeypatch.setattr(R, "db", _fake_db(get_resource_types=fake_types), raising=True)
+
+    for _ in range(2):
+        r = client.get("/resources/types/",
+                       headers={"Authorization": "Bearer x", "Accept-Encoding": "gzip"})
+        assert r.status_code == 200 and r.json() == types
+        assert r.headers["Content-Encoding"] == "gzip"
+    assert len(calls) == 1
+    cached = R.reference_responses.get(("types", db_auth.Role.EMPLOYEE))
+    assert "gzip" in cached.bodies
@@ -0,0 +1,40 @@
+from datetime import date, datetime
+from decimal import Decimal
+import numpy as np
+import pytest
+from starlette.responses import JSONResponse
+from src.api import responses
+from src.utils import convert_bytes_to_strings
+
+pytestmark = pytest.mark.unit
+
+ROWS = [{"id": 1, "resource_id": "R-000001", "notes": "Zürich office", "employee_id": None,
+         "is_decommissioned": b"1", "updated_at": datetime(2025, 1, 2, 3, 4, 5, 120000),
+         "purchase_date": date(2024, 6, 30)}]
+
+
+@pytest.fixture(params=["orjson", "json"])
+def serializer(request, monkeypatch):
+    if request.param == "json":
+        monkeypatch.setattr(responses, "orjson", None)
+    return request.param
+
+
+def test_output_matches_the_previous_encoding(serializer):
+    expected = JSONResponse(convert_bytes_to_strings(ROWS)).body
+    assert responses.FastJSONResponse(ROWS).body == expected
+
+
+def test_decimals_numpy_and_int_keys(serializer):
+    body = responses.dumps({1: Decimal("2.5"), "n": np.int64(3), "a": np.array([1, 2])})
+    assert body == b'{"1":2.5,"n":3,"a":[1,2]}'
+
+
+def test_unknown_types_are_rejected(serializer):
+    with pytest.raises(TypeError):
+        responses.dumps({"x": object()})
+
+
+def test_app_default_response_class():
+    from src.main import app
+    assert app.router.default_response_class is responses.FastJSONResponse
@@ -0,0 +1,144 @@
+import asyncio
+import time
+from types import SimpleNamespace
+import jwt
+import pytest
+from fastapi import HTTPException
+from src.api import authenticate
+from src.api import session_tokens
+from src.api.routes import auth_proxy
+
+pytestmark = pytest.mark.unit
+
+SECRET = b"s" * 32
+
+
+def _sessions(**overrides):
+    options = {"secret": SECRET, "enabled": True, "ttl_seconds": 900}
+    options.update(overrides)
+    return session_tokens.SessionTokens(**options)
+
+
+def _request(token=None):
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    return SimpleNamespace(method="GET", headers=headers)
+
+
+def test_issued_token_carries_identity_and_role():
+    sessions = _sessions()
+    token, expires_in = sessions.issue({"email": "j@example.com", "title": "Manager"})
+    claims = sessions.verify(token)
+    assert claims["username"] == "j@example.com"
+    assert (claims["title"], claims["role"]) == ("Manager", "Manager")
+    assert expires_in == 900
+
+
+def test_foreign_tokens_are_not_session_tokens():
+    sessions = _sessions()
+    assert sessions.verify("opaque") is None
+    other = jwt.encode({"iss": "sso", "exp": time.time() + 60}, "x" * 32, algorithm="HS256")
+    assert sessions.verify(other) is None
+
+
+def test_forged_and_expired_tokens_are_rejected():
+    sessions = _sessions()
+    forged = _sessions(secret=b"f" * 32).issue({"username": "jdoe", "title": "Manager"})[0]
+    with pytest.raises(jwt.InvalidSignatureError):
+        sessions.verify(forged)
+    expired = _sessions(ttl_seconds=-10).issue({"username": "jdoe"})[0]
+    with pytest.raises(jwt.ExpiredSignatureError):
+        sessions.verify(expired)
+
+
+def test_refresh_rotates_token_and_revokes_the_old_one():
+    sessions = _sessions()
+    old, _ = sessions.issue({"username": "jdoe", "title": "Aide"})
+    new, _ = sessions.refresh(old)
+    assert jwt.decode(new, options={"verify_signature": False})["sid"] == \
+        jwt.decode(old, options={"verify_signature": False})["sid"]
+    with pytest.raises(session_tokens.SessionRevoked):
+        sessions.verify(old)
+    with pytest.raises(session_tokens.SessionRevoked):
+        sessions.refresh(old)                    # a token is refreshed once
+
+
+def test_refresh_within_grace_but_not_past_session_age():
+    expired = _sessions(ttl_seconds=-10).issue({"username": "jdoe"})[0]
+    sessions = _sessions(refresh_grace_seconds=60)
+    assert sessions.verify(sessions.refresh(expired)[0])["username"] == "jdoe"
+
+    old_session = _sessions(max_session_seconds=0, refresh_grace_seconds=60)
+    token = old_session.issue({"username": "jdoe"})[0]
+    with pytest.raises(jwt.InvalidTokenError):
+        old_session.refresh(token)
+
+
+def test_logout_revokes_every_token_of_the_session():
+    sessions = _sessions()
+    first, _ = sessions.issue({"username": "jdoe"})
+    second, _ = sessions.refresh(first)
+    sessions.logout(second)
+    with pytest.raises(session_tokens.SessionRevoked):
+        sessions.verify(second)
+
+
+def test_deny_list_forgets_entries_that_can_no_longer_be_used(monkeypatch):
+    denied = session_tokens.DenyList()
+    now = [1000.0]
+    monkeypatch.setattr(session_tokens.time, "time", lambda: now[0])
+    denied.add("a", 1010)
+    assert "a" in denied
+    now[0] = 1100
+    denied.add("b", 1200)
+    assert "a" not in denied and len(denied) == 1
+
+
+def test_authenticate_accepts_session_token_without_sso(monkeypatch):
+    sessions = _sessions()
+    monkeypatch.setattr(authenticate.session_tokens, "sessions", sessions)
+
+    async def sso(token):
+        raise AssertionError("SSO must not be called")
+    monkeypatch.setattr(authenticate, "verify_with_sso", sso)
+
+    token, _ = sessions.issue({"username": "jdoe", "title": "Manager"})
+    out = asyncio.run(authenticate.authenticate_request(_request(), f"Bearer {token}"))
+    assert out["decoded_payload"]["title"] == "Manager"
+
+    sessions.logout(token)
+    with pytest.raises(HTTPException) as ei:
+        asyncio.run(authenticate.authenticate_request(_request(), f"Bearer {token}"))
+    assert ei.value.status_code == 401
+
+
+def test_login_refresh_and_logout_endpoints(monkeypatch):
+    sessions = _sessions()
+    monkeypatch.setattr(auth_proxy.session_tokens, "sessions", sessions)
+    monkeypatch.setattr(auth_proxy.token_cache, "cache", auth_proxy.token_cache.TokenCache())
+
+    async def sso(token):
+        assert token == "sso-token"
+        return {"title": "Manager"}
+    monkeypatch.setattr(auth_proxy.authenticate, "verify_with_sso", sso)
+
+    response = asyncio.run(auth_proxy._start_session(
+        {"access_token": "Bearer sso-token", "message": "ok"}, "jdoe"))
+    assert "access_token" not in response and response["message"] == "ok"
+    assert sessions.verify(response["token"])["username"] == "jdoe"
+
+    refreshed = asyncio.run(auth_proxy.refresh_session(_request(response["token"])))
+    assert sessions.verify(refreshed["token"])["role"] == "Manager"
+    with pytest.raises(HTTPException) as ei:
+        asyncio.run(auth_proxy.refresh_session(_request(response["token"])))
+    assert ei.value.status_code == 401
+
+    assert asyncio.run(auth_proxy.logout(_request(refreshed["token"]))) == {"status": "logged out"}
+    with pytest.raises(jwt.InvalidTokenError):
+        sessions.verify(refreshed["token"])
+
+
+def test_session_endpoints_404_when_disabled(monkeypatch):
+    monkeypatch.setattr(auth_proxy.session_tokens, "sessions", _sessions(enabled=False))
+    with pytest.raises(HTTPException) as ei:
+        asyncio.run(auth_proxy.refresh_session(_request("x")))
+    assert ei.value.status_code == 404
@@ -0,0 +1,136 @@
+import asyncio
+import base64
+import json
+import time
+from types import SimpleNamespace
+import pytest
+from fastapi import HTTPException
+from src.api import authenticate
+from src.api import token_cache
+
+pytestmark = pytest.mark.unit
+
+
+def _jwt(claims: dict) -> str:
+    body = base64.urlsafe_b64encode(json.dumps(claims).encode()).rstrip(b"=").decode()
+    return f"header.{body}.signature"
+
+
+class CountingVerifier:
+    def __init__(self, payload=None, delay=0.0, error=None):
+        self.payload = payload
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    async def __call__(self, token):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self.payload
+
+
+def test_accepted_token_is_served_from_cache():
+    cache = token_cache.TokenCache(enabled=True)
+    verify = CountingVerifier({"title": "Manager"})
+
+    async def run():
+        first = await cache.verify("abc", verify)
+        second = await cache.verify("abc", verify)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first == second == {"title": "Manager"}
+    assert verify.calls == 1
+    metrics = cache.metrics()
+    assert (metrics["hits"], metrics["misses"], metrics["hit_rate"]) == (1, 1, 0.5)
+    assert metrics["sso_latency_ms"]["p50"] is not None
+
+
+def test_rejected_token_is_negatively_cached_briefly(monkeypatch):
+    cache = token_cache.TokenCache(enabled=True, negative_ttl_seconds=5)
+    verify = CountingVerifier(None)
+    now = [1000.0]
+    monkeypatch.setattr(token_cache.time, "monotonic", lambda: now[0])
+
+    assert asyncio.run(cache.verify("bad", verify)) is None
+    assert asyncio.run(cache.verify("bad", verify)) is None
+    assert verify.calls == 1 and cache.negative_hits == 1
+    now[0] += 6
+    asyncio.run(cache.verify("bad", verify))
+    assert verify.calls == 2
+
+
+def test_entry_never_outlives_token_expiry():
+    cache = token_cache.TokenCache(enabled=True, ttl_seconds=60)
+    expired = _jwt({"exp": time.time() - 1})
+    verify = CountingVerifier({"title": "Aide"})
+    asyncio.run(cache.verify(expired, verify))
+    asyncio.run(cache.verify(expired, verify))
+    assert verify.calls == 2
+
+    assert token_cache.token_expiry(_jwt({"exp": 123})) == 123.0
+    assert token_cache.token_expiry("opaque-token") is None
+    assert token_cache.token_expiry("opaque", {"exp": "456"}) == 456.0
+
+
+def test_lru_evicts_least_recently_used():
+    cache = token_cache.TokenCache(enabled=True, max_entries=2)
+    verify = CountingVerifier({"title": "Aide"})
+
+    async def run():
+        for token in ("a", "b", "a", "c"):
+            await cache.verify(token, verify)
+
+    asyncio.run(run())
+    assert cache.evictions == 1
+    assert verify.calls == 3
+    asyncio.run(cache.verify("a", verify))       # still cached, "b" was evicted
+    assert verify.calls == 3
+
+
+def test_concurrent_verifications_share_one_call():
+    cache = token_cache.TokenCache(enabled=True)
+    verify = CountingVerifier({"title": "Manager"}, delay=0.05)
+
+    async def run():
+        return await asyncio.gather(*(cache.verify("abc", verify) for _ in range(20)))
+
+    results = asyncio.run(run())
+    assert verify.calls == 1
+    assert all(result == {"title": "Manager"} for result in results)
+    assert cache.coalesced == 19
+
+
+def test_sso_errors_are_shared_but_not_cached():
+    cache = token_cache.TokenCache(enabled=True)
+    verify = CountingVerifier(error=HTTPException(status_code=503))
+
+    async def run():
+        return await asyncio.gather(*(cache.verify("abc", verify) for _ in range(3)),
+                                    return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, HTTPException) for result in results)
+    assert verify.calls == 1 and cache.sso_errors == 1
+    verify.error = None
+    verify.payload = {"title": "Aide"}
+    assert asyncio.run(cache.verify("abc", verify)) == {"title": "Aide"}
+
+
+def test_authenticate_request_uses_cache(monkeypatch):
+    verify = CountingVerifier({"title": "Manager"})
+    monkeypatch.setattr(authenticate, "verify_with_sso", verify)
+    monkeypatch.setattr(authenticate.token_cache, "cache", token_cache.TokenCache(enabled=True))
+    request = SimpleNamespace(method="GET")
+
+    out = asyncio.run(authenticate.authenticate_request(request, "Bearer abc"))
+    asyncio.run(authenticate.authenticate_request(request, "Bearer abc"))
+    assert out["decoded_payload"] == {"title": "Manager"}
+    assert verify.calls == 1
+
+    verify.payload = None
+    with pytest.raises(HTTPException) as ei:
+        asyncio.run(authenticate.authenticate_request(request, "Bearer other"))
+    assert ei.value.status_code == 401
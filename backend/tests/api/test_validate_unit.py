@@ -44,6 +44,7 @@ async def test_post_schema_ok_with_location():
              None, "notes": "", "is_decommissioned": 0}
     out = await v.validate_request(_req("POST", body), token="Bearer x")
     assert out["status"] == "valid"
+    assert out["body"] == body
 
 
 @pytest.mark.anyio
@@ -68,3 +69,9 @@ async def test_put_schema_fails_neither_present():
     body = {"type_id": 1, "notes": "", "is_decommissioned": 0}
     with pytest.raises(HTTPException):
         await v.validate_request(_req("PUT", body), token="Bearer x")
+
+
+@pytest.mark.anyio
+async def test_validate_request_can_skip_body_validation():
+    out = await v.validate_request(_req("POST"), token="Bearer x", validate_body=False)
+    assert out["status"] == "valid"
@@ -0,0 +1,48 @@
+import pytest
+from src.database import archive
+
+pytestmark = pytest.mark.unit
+
+
+def _fake_transaction(select_rows, executed):
+    def fake_tx(work):
+        def run(q, p=None):
+            executed.append((q, p))
+            if q.strip().startswith("SELECT"):
+                return select_rows
+            return {"status": "success", "rows_affected": len(select_rows)}
+        return work(run)
+    return fake_tx
+
+
+def test_archive_batch_moves_selected_rows(monkeypatch):
+    executed = []
+    monkeypatch.setattr(archive.shards.database_connector, "execute_transaction",
+                        _fake_transaction([{"id": 3}, {"id": 8}], executed))
+    assert archive.archive_batch(older_than_days=30, batch_size=10) == 2
+
+    select, insert, delete = executed
+    assert "FOR UPDATE SKIP LOCKED" in select[0]
+    assert select[1] == {"older_than_days": 30, "batch_size": 10}
+    assert "INSERT INTO AssetArchive" in insert[0]
+    assert "DELETE FROM Asset WHERE id IN (:asset_id_0, :asset_id_1)" in delete[0]
+    assert delete[1] == {"asset_id_0": 3, "asset_id_1": 8}
+
+
+def test_archive_batch_nothing_eligible(monkeypatch):
+    executed = []
+    monkeypatch.setattr(archive.shards.database_connector, "execute_transaction",
+                        _fake_transaction([], executed))
+    assert archive.archive_batch() == 0
+    assert len(executed) == 1
+
+
+def test_archive_decommissioned_assets_loops_until_short_batch(monkeypatch):
+    batches = iter([5, 5, 2])
+    monkeypatch.setattr(archive, "archive_batch", lambda days, size, shard: next(batches))
+    assert archive.archive_decommissioned_assets(older_than_days=1, batch_size=5) == 12
+
+
+def test_archive_decommissioned_assets_stops_on_failure(monkeypatch):
+    monkeypatch.setattr(archive, "archive_batch", lambda days, size, shard: None)
+    assert archive.archive_decommissioned_assets() == 0
@@ -0,0 +1,75 @@
+import json
+import pytest
+from src.database import asset_history
+
+pytestmark = pytest.mark.unit
+
+
+def _before(**overrides):
+    row = {"id": 7, "type_id": 1, "location_id": 4, "employee_id": None, "notes": "old",
+           "is_decommissioned": b"0", "version": 3}
+    row.update(overrides)
+    return row
+
+
+def test_diff_keeps_only_changed_columns_and_bumps_version():
+    old, new = asset_history.diff(_before(), {"type_id": 1, "location_id": None,
+                                              "employee_id": 9, "is_decommissioned": 0})
+    assert old == {"location_id": 4, "employee_id": None, "version": 3}
+    assert new == {"location_id": None, "employee_id": 9, "version": 4}
+
+
+def test_record_is_buffered_until_flush(monkeypatch):
+    queries = []
+    monkeypatch.setattr(asset_history.database_connector, "execute_query",
+                        lambda q, p=None: queries.append((q, p)) or {"rows_affected": 1})
+    writer = asset_history.HistoryWriter(batch_size=2, enabled=True)
+    for asset_id in (1, 2, 3):
+        writer.record(asset_id, asset_history.UPDATE, _before(), {"notes": "new"}, actor="jdoe")
+    assert queries == []
+
+    assert writer.flush() == 3
+    assert len(queries) == 2        # batches of two and one
+    params = queries[0][1]
+    assert (params["asset_id_0"], params["asset_id_1"]) == (1, 2)
+    assert params["actor_0"] == "jdoe" and params["action_0"] == "update"
+    assert json.loads(params["after_values_0"]) == {"notes": "new", "version": 4}
+    assert writer.pending_for(1) == []
+
+
+def test_failed_flush_keeps_entries_in_order(monkeypatch):
+    monkeypatch.setattr(asset_history.database_connector, "execute_query", lambda q, p=None: None)
+    writer = asset_history.HistoryWriter(enabled=True)
+    writer.record(1, asset_history.DELETE, _before(), {"is_decommissioned": 1})
+    writer.record(1, asset_history.UPDATE, _before(), {"notes": "x"})
+    assert writer.flush() == 0
+    assert [entry["action"] for entry in writer.pending_for(1)] == ["delete", "update"]
+
+
+def test_buffer_is_bounded():
+    writer = asset_history.HistoryWriter(max_pending=2, enabled=True)
+    for asset_id in (1, 2, 3):
+        writer.record(asset_id, asset_history.UPDATE, _before(), {"notes": "x"})
+    assert writer.dropped == 1
+    assert writer.pending_for(1) == [] and len(writer.pending_for(3)) == 1
+
+
+def test_disabled_writer_records_nothing():
+    writer = asset_history.HistoryWriter(enabled=False)
+    writer.record(1, asset_history.UPDATE, _before(), {"notes": "x"})
+    assert writer.pending_for(1) == []
+
+
+def test_get_history_pages_by_id_and_decodes(monkeypatch):
+    seen = {}
+    def fake_exec(q, p=None):
+        seen["query"], seen["params"] = q, p
+        return [{"id": 5, "asset_id": 7, "action": "update", "actor": "jdoe",
+                 "changed_at": "2025-01-01", "before_values": '{"notes": "a"}',
+                 "after_values": '{"notes": "b"}'}]
+    monkeypatch.setattr(asset_history.database_connector, "execute_query", fake_exec)
+
+    entries = asset_history.get_history(7, limit=10, before_id=9)
+    assert "id < :before_id" in seen["query"] and "ORDER BY id DESC" in seen["query"]
+    assert seen["params"] == {"asset_id": 7, "limit": 10, "before_id": 9}
+    assert entries[0]["before"] == {"notes": "a"} and entries[0]["after"] == {"notes": "b"}
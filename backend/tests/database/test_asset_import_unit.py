@@ -0,0 +1,150 @@
+import io
+import pytest
+from src.database import asset_import
+from src.database import reference_data
+from src.database import authorize as db_auth
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def references(monkeypatch):
+    cache = reference_data.ReferenceCache()
+    monkeypatch.setattr(reference_data, "cache", cache)
+    monkeypatch.setattr(reference_data.db_ctrl, "get_resource_types",
+                        lambda role: (200, [{"id": 1, "asset_type_name": "Laptop"},
+                                            {"id": 2, "asset_type_name": "Phone"}]))
+    monkeypatch.setattr(reference_data.db_ctrl, "get_resource_locations",
+                        lambda role: (200, [{"id": 4, "city": "Austin", "street": "1 Main St"},
+                                            {"id": 5, "city": "Denver", "street": "2 Oak Ave"}]))
+    return cache
+
+
+@pytest.fixture
+def inserts(monkeypatch):
+    calls = []
+    def fake_add(resources, role):
+        calls.append(list(resources))
+        return [(200, 100 + i) for i in range(len(resources))]
+    monkeypatch.setattr(asset_import.database_controller, "add_resource_assets", fake_add)
+    return calls
+
+
+def _csv(text):
+    return io.BytesIO(text.encode("utf-8-sig"))
+
+
+def test_reference_cache_resolves_names_and_ids(references):
+    assert references.resolve_type("laptop") == 1
+    assert references.resolve_type(2) == 2
+    assert references.resolve_location("DENVER") == 5
+    assert references.resolve_location("1 Main St") == 4
+    with pytest.raises(reference_data.ReferenceLookupError):
+        references.resolve_type("Tablet")
+
+
+def test_reference_cache_serves_stale_rows_when_reload_fails(references, monkeypatch):
+    references.resolve_type("Laptop")
+    references.ttl_seconds = 0
+    monkeypatch.setattr(reference_data.db_ctrl, "get_resource_types", lambda role: (400, []))
+    assert references.resolve_type("Laptop") == 1
+
+
+def test_reference_writes_reload_the_cache(references, monkeypatch):
+    with pytest.raises(reference_data.ReferenceLookupError):
+        references.resolve_type("Dock")
+    monkeypatch.setattr(reference_data.db_ctrl, "get_resource_types",
+                        lambda role: (200, [{"id": 3, "asset_type_name": "Dock"}]))
+    reference_data.db_ctrl.add_reference_listener(references.invalidate)
+    try:
+        reference_data.db_ctrl.notify_reference_write()
+    finally:
+        reference_data.db_ctrl.remove_reference_listener(references.invalidate)
+    assert references.resolve_type("Dock") == 3
+
+
+def test_import_csv_resolves_names_and_inserts_in_chunks(references, inserts):
+    data = _csv("Type,Location,employee_id,notes,is_decommissioned\n"
+                "Laptop,Austin,,first,no\n"
+                "phone,,7,,\n"
+                "Laptop,Denver,,<script>x</script>,1\n")
+    report = asset_import.import_assets(data, "csv", db_auth.Role.MANAGER, chunk_size=2)
+
+    assert report == {"rows": 3, "inserted": 3, "failed": 0, "errors": [],
+                      "errors_truncated": False}
+    assert [len(chunk) for chunk in inserts] == [2, 1]
+    assert inserts[0][0] == {"type_id": 1, "location_id": 4, "employee_id": None,
+                             "notes": "first", "is_decommissioned": 0}
+    assert inserts[0][1]["employee_id"] == 7 and inserts[0][1]["location_id"] is None
+    assert inserts[1][0]["is_decommissioned"] == 1
+    assert "<script>" not in inserts[1][0]["notes"]
+
+
+def test_import_reports_row_errors_without_aborting(references, inserts):
+    data = _csv("type,location,employee_id\n"
+                "Tablet,Austin,\n"          # unknown type
+                "Laptop,Austin,3\n"         # both location and employee
+                "\n"                        # blank rows are skipped
+                "Laptop,,abc\n"             # not an integer
+                "Laptop,Austin,\n")
+    report = asset_import.import_assets(data, "csv", db_auth.Role.MANAGER)
+
+    assert report["rows"] == 4 and report["inserted"] == 1 and report["failed"] == 3
+    assert [error["row"] for error in report["errors"]] == [2, 5, 3]
+    assert len(inserts) == 1 and len(inserts[0]) == 1
+
+
+def test_import_retries_failed_chunk_row_by_row(references, monkeypatch):
+    def fake_add(resources, role):
+        if any(resource["employee_id"] == 99 for resource in resources):
+            return [(400, None)] * len(resources)
+        return [(200, 1)] * len(resources)
+    monkeypatch.setattr(asset_import.database_controller, "add_resource_assets", fake_add)
+
+    data = _csv("type,employee_id\nLaptop,1\nLaptop,99\nLaptop,2\n")
+    report = asset_import.import_assets(data, "csv", db_auth.Role.MANAGER)
+    assert report["inserted"] == 2
+    assert report["errors"] == [{"row": 3, "error": "Database error"}]
+
+
+def test_import_retries_only_the_rows_of_a_failed_shard(references, monkeypatch):
+    # Rows at location 4 and 5 live on different shards; only location 5's failed
+    batches = []
+    def fake_add(resources, role):
+        batches.append([resource["location_id"] for resource in resources])
+        return [(400, None) if resource["location_id"] == 5 and len(resources) > 1
+                else (200, 1) for resource in resources]
+    monkeypatch.setattr(asset_import.database_controller, "add_resource_assets", fake_add)
+
+    data = _csv("type,location\nLaptop,4\nLaptop,5\n")
+    report = asset_import.import_assets(data, "csv", db_auth.Role.MANAGER)
+    assert report["inserted"] == 2 and report["errors"] == []
+    assert batches == [[4, 5], [5]]
+
+
+def test_import_caps_listed_errors(references, inserts):
+    data = _csv("type,location\n" + "Tablet,Austin\n" * 5)
+    report = asset_import.import_assets(data, "csv", db_auth.Role.MANAGER, max_errors=2)
+    assert report["failed"] == 5 and len(report["errors"]) == 2
+    assert report["errors_truncated"] is True
+
+
+def test_import_rejects_missing_columns(references, inserts):
+    with pytest.raises(asset_import.ImportFileError):
+        asset_import.import_assets(_csv("notes\nx\n"), "csv", db_auth.Role.MANAGER)
+
+
+def test_import_xlsx(references, inserts):
+    openpyxl = pytest.importorskip("openpyxl")
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(["type_id", "location_id", "notes"])
+    sheet.append([1, 4.0, "spreadsheet"])
+    sheet.append(["Phone", "Denver", None])
+    data = io.BytesIO()
+    workbook.save(data)
+    data.seek(0)
+
+    report = asset_import.import_assets(data, "xlsx", db_auth.Role.MANAGER)
+    assert report["inserted"] == 2
+    assert [(r["type_id"], r["location_id"]) for r in inserts[0]] == [(1, 4), (2, 5)]
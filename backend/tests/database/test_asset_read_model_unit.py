@@ -0,0 +1,99 @@
+import datetime
+import pytest
+from src.database import asset_read_model as arm
+
+pytestmark = pytest.mark.unit
+
+STAMP = datetime.datetime(2025, 1, 1)
+
+
+def _asset(asset_id, version=1, **fields):
+    row = {"id": asset_id, "resource_id": f"LAP-{asset_id}", "type_id": 1,
+           "location_id": None, "employee_id": 7, "notes": None,
+           "is_decommissioned": b"0", "version": version,
+           "updated_at": STAMP + datetime.timedelta(seconds=asset_id)}
+    row.update(fields)
+    return row
+
+
+def _loaded(monkeypatch, rows):
+    monkeypatch.setattr(arm.db_ctrl, "get_resource_changes",
+                        lambda since, since_id, limit, user_position: (200, rows))
+    model = arm.AssetReadModel()
+    assert model.reload() is True
+    return model
+
+
+def test_reload_builds_hash_indexes(monkeypatch):
+    model = _loaded(monkeypatch, [_asset(1), _asset(2, employee_id=None, location_id=4),
+                                  _asset(3, type_id=2)])
+    assert [a["id"] for a in model.all()] == [1, 2, 3]
+    assert [a["id"] for a in model.by_employee(7)] == [1, 3]
+    assert [a["id"] for a in model.by_location(4)] == [2]
+    assert [a["id"] for a in model.by_type(2)] == [3]
+    assert model.by_resource_id("LAP-2")["location_id"] == 4
+    assert model.get(99) is None
+
+
+def test_refresh_applies_changes_after_cursor(monkeypatch):
+    model = _loaded(monkeypatch, [_asset(1)])
+    calls = []
+    def fake_changes(since, since_id, limit, user_position):
+        calls.append((since, since_id))
+        return 200, [_asset(1, version=2, employee_id=None, location_id=9)]
+    monkeypatch.setattr(arm.db_ctrl, "get_resource_changes", fake_changes)
+    assert model.refresh() is True
+    assert calls == [(_asset(1)["updated_at"], 1)]
+    assert model.by_employee(7) == []
+    assert [a["id"] for a in model.by_location(9)] == [1]
+
+
+def test_failed_reload_keeps_previous_copy(monkeypatch):
+    model = _loaded(monkeypatch, [_asset(1)])
+    monkeypatch.setattr(arm.db_ctrl, "get_resource_changes", lambda *a, **k: (400, []))
+    assert model.reload() is False
+    assert model.get(1)["id"] == 1
+
+
+def test_write_through_applies_committed_rows_and_drops_missing(monkeypatch):
+    model = _loaded(monkeypatch, [_asset(1), _asset(2)])
+    monkeypatch.setattr(arm.db_ctrl, "get_resources_by_ids",
+                        lambda ids, role: (200, {"found": {1: _asset(1, version=3, notes="x")},
+                                                 "missing": [2]}))
+    model.on_write([1, 2])
+    assert model.get(1)["notes"] == "x"
+    assert model.get(2) is None
+    assert [a["id"] for a in model.by_employee(7)] == [1]
+
+
+def test_stale_change_feed_row_does_not_overwrite_newer_write(monkeypatch):
+    model = _loaded(monkeypatch, [_asset(1, version=5, notes="new")])
+    with model._lock:
+        model._index(_asset(1, version=4, notes="old"))
+    assert model.get(1)["notes"] == "new"
+
+
+def test_controller_notifies_write_listeners(monkeypatch):
+    seen = []
+    def listener(ids):
+        seen.append(ids)
+    def broken(ids):
+        raise RuntimeError("boom")
+    arm.db_ctrl.add_write_listener(broken)
+    arm.db_ctrl.add_write_listener(listener)
+    try:
+        arm.db_ctrl.notify_asset_write([4, 5])
+    finally:
+        arm.db_ctrl.remove_write_listener(broken)
+        arm.db_ctrl.remove_write_listener(listener)
+    assert seen == [[4, 5]]
+
+
+def test_sync_refreshes_until_a_full_reload_is_due(monkeypatch):
+    model = _loaded(monkeypatch, [_asset(1)])
+    generation = model.generation
+    monkeypatch.setattr(arm.db_ctrl, "get_resource_changes", lambda *a, **k: (200, []))
+    monkeypatch.setattr(model, "reload", lambda: "reloaded")
+    assert model.sync(full_reload_seconds=3600) is True
+    assert model.generation == generation      # nothing new in the change feed
+    assert model.sync(full_reload_seconds=0) == "reloaded"
@@ -0,0 +1,65 @@
+import pytest
+from src.database import audit
+
+pytestmark = pytest.mark.unit
+
+
+def _row(asset_id, tag, location_id=4, employee_id=None, decommissioned=b"0"):
+    return {"id": asset_id, "resource_id": tag, "location_id": location_id,
+            "employee_id": employee_id, "is_decommissioned": decommissioned}
+
+
+def test_tag_parser_handles_split_chunks_separators_and_duplicates():
+    parser = audit.TagParser()
+    parser.feed("Laptop-2025-001\nLapt")
+    parser.feed("op-2025-002,Laptop-2025-001\r\n\n")
+    parser.feed("Phone-2025-009")
+    assert parser.finish() == {"Laptop-2025-001", "Laptop-2025-002", "Phone-2025-009"}
+    assert parser.duplicates == 1
+
+
+def test_tag_parser_enforces_limit():
+    parser = audit.TagParser(max_tags=2)
+    with pytest.raises(ValueError):
+        parser.feed("a\nb\nc\n")
+
+
+def test_reconcile_location_reports_discrepancies(monkeypatch):
+    queries = []
+    def fake_exec(q, p=None):
+        queries.append((q, p))
+        if "location_id = :location_id" in q:
+            return [_row(1, "L-1"), _row(2, "L-2"), _row(3, "L-3", decommissioned=b"1")]
+        return [_row(7, "L-7", location_id=9), _row(8, "L-8", location_id=None, employee_id=5),
+                _row(9, "L-9", location_id=9, decommissioned=b"1")]
+    monkeypatch.setattr(audit.shards.database_connector, "execute_query", fake_exec)
+
+    report = audit.reconcile_location(4, {"L-1", "L-7", "L-8", "L-9", "NOPE"})
+    assert report["matched"] == 1
+    assert [r["resource_id"] for r in report["missing"]] == ["L-2"]   # L-3 is decommissioned
+    assert report["unexpected"] == ["NOPE"]
+    assert [r["resource_id"] for r in report["wrong_location"]] == ["L-7"]
+    assert [r["resource_id"] for r in report["wrong_assignee"]] == ["L-8"]
+    assert [r["resource_id"] for r in report["decommissioned"]] == ["L-9"]
+    # one query for the location plus one IN lookup for the tags it does not explain
+    assert len(queries) == 2
+    assert sorted(queries[1][1].values()) == ["L-7", "L-8", "L-9", "NOPE"]
+
+
+def test_reconcile_location_chunks_lookups(monkeypatch):
+    lookups = []
+    def fake_exec(q, p=None):
+        if "location_id = :location_id" in q:
+            return []
+        lookups.append(len(p))
+        return []
+    monkeypatch.setattr(audit.shards.database_connector, "execute_query", fake_exec)
+    monkeypatch.setattr(audit, "LOOKUP_CHUNK_SIZE", 2)
+    report = audit.reconcile_location(4, {"a", "b", "c", "d", "e"})
+    assert lookups == [2, 2, 1]
+    assert report["unexpected"] == ["a", "b", "c", "d", "e"]
+
+
+def test_reconcile_location_database_error(monkeypatch):
+    monkeypatch.setattr(audit.shards.database_connector, "execute_query", lambda q, p=None: None)
+    assert audit.reconcile_location(4, {"a"}) is None
@@ -194,3 +194,43 @@ def test_close_db_connection_disposes_and_closes(monkeypatch):
     assert engine.disposed is True
     assert conn_obj.closed is True
     assert dbm.POOL is None and dbm.CONNECTOR is None
+
+
+class FakeTxEngine(FakeEngine):
+    """Engine whose begin() hands out the scripted connection as a transaction."""
+
+    def begin(self):
+        return self._ctx
+
+
+def test_execute_transaction_runs_statements_on_one_connection(monkeypatch):
+    ctx = FakeConnCtx([{"returns_rows": True, "rows": [{"id": 4}]},
+                       {"returns_rows": False, "rowcount": 1}])
+    monkeypatch.setattr(dbm, "POOL", FakeTxEngine(ctx))
+
+    def work(run):
+        rows = run("SELECT id FROM T FOR UPDATE")
+        status = run("DELETE FROM T WHERE id = :id", {"id": rows[0]["id"]})
+        return rows, status
+
+    rows, status = dbm.execute_transaction(work)
+    assert rows == [{"id": 4}]
+    assert status == {"status": "success", "rows_affected": 1}
+    assert [q for q, _ in ctx._executed] == ["SELECT id FROM T FOR UPDATE",
+                                             "DELETE FROM T WHERE id = :id"]
+
+
+def test_execute_transaction_database_error_returns_none(monkeypatch):
+    ctx = FakeConnCtx([{"raise": sqlalchemy.exc.SQLAlchemyError("boom")}])
+    monkeypatch.setattr(dbm, "POOL", FakeTxEngine(ctx))
+    assert dbm.execute_transaction(lambda run: run("UPDATE T SET a = 1")) is None
+
+
+def test_execute_transaction_reraises_non_database_errors(monkeypatch):
+    monkeypatch.setattr(dbm, "POOL", FakeTxEngine(FakeConnCtx([])))
+
+    def work(_run):
+        raise LookupError("abort")
+
+    with pytest.raises(LookupError):
+        dbm.execute_transaction(work)
@@ -18,41 +18,46 @@ def test_add_resource_type_allows_manager_and_returns_200(monkeypatch):
 def test_add_resource_type_denies_non_manager():
     assert dc.add_resource_type("Employee", {"asset_type_name":"Laptop"}) == 401
 
-def test_add_resource_asset_creates_and_updates(monkeypatch):
-    # 1) insert returns success
-    # 2) select LAST_INSERT_ID returns new id
-    # 3) fetch type name returns one row
-    # 4) update returns success
+def test_add_resource_asset_inserts_with_allocated_resource_id(monkeypatch):
+    # 1) resource_id comes from the allocator
+    # 2) INSERT carries it, LAST_INSERT_ID is read on the same transaction
+    # 3) no follow-up UPDATE of resource_id
     steps = []
-    def fake_exec(q, p=None):
-        steps.append(q.strip().split()[0].upper())
+    def run(q, p=None):
+        steps.append((q.strip().split()[0].upper(), p))
         if "LAST_INSERT_ID" in q:
             return [{"new_id": 7}]
-        if "SELECT" in q and "FROM AssetTypes" in q:
-            return [{"asset_type_name": "Laptop"}]
         return {"status":"success", "rows_affected":1}
-    monkeypatch.setattr(dc.database_connector, "execute_query", fake_exec)
+    monkeypatch.setattr(dc.resource_id_allocator, "allocate",
+                        lambda type_id, count=1: ["Laptop-2025-101"])
+    monkeypatch.setattr(dc.database_connector, "execute_transaction", lambda work: work(run))
     status = dc.add_resource_asset({"type_id": 1, "location_id": 2,
                                                 "employee_id": None, "notes": "",
                                                   "is_decommissioned": 0},
                                    db_auth.Role.MANAGER)
     assert status == 200
-    # sanity: we called INSERT, SELECT (id), SELECT (type name),
-    # UPDATE in some order
-    assert "INSERT" in steps[0]
-    assert any("SELECT" == s for s in steps)
-    assert any("UPDATE" == s for s in steps)
+    assert steps[0][0] == "INSERT" and steps[0][1]["resource_id"] == "Laptop-2025-101"
+    assert steps[1][0] == "SELECT"
+    assert not any(verb == "UPDATE" for verb, _ in steps)
+
+def _fake_transaction(run):
+    return lambda work: work(run)
+
+def _captured_row_run(q, p=None):
+    if q.startswith("SELECT @before_"):
+        return [{"id": 1, "type_id": 2, "location_id": 3, "is_decommissioned": b"0"}]
+    return {"status": "success", "rows_affected": 1}
 
 def test_delete_resource_updates_flag(monkeypatch):
     called = {}
-    monkeypatch.setattr(dc.database_connector, "execute_query",
-                         lambda q, role, p=None: {"status":"success"})
+    monkeypatch.setattr(dc.database_connector, "execute_transaction",
+                        _fake_transaction(_captured_row_run))
     status = dc.delete_resource(10, db_auth.Role.MANAGER)
     assert status == 200
 
 def test_update_resource_updates_fields(monkeypatch):
-    monkeypatch.setattr(dc.database_connector, "execute_query",
-                         lambda q, p=None: {"status":"success"})
+    monkeypatch.setattr(dc.database_connector, "execute_transaction",
+                        _fake_transaction(_captured_row_run))
     status = dc.update_resource({"asset_id":1,"type_id":2,
                                             "location_id":3,"employee_id":4,
                                             "notes":"","is_decommissioned":0},
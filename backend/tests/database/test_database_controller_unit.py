@@ -105,9 +105,15 @@ def test_get_resource_by_id_denied_for_other_role(monkeypatch):
     assert code in (401, 403)
 
 
+def _fixed_allocator(monkeypatch, resource_ids=("Laptop-2025-101",)):
+    monkeypatch.setattr(dc.resource_id_allocator, "allocate",
+                        lambda type_id, count=1: list(resource_ids)[:count])
+
+
 def test_add_resource_asset_failure_on_insert(monkeypatch):
-    # INSERT fails (returns None)
-    monkeypatch.setattr(dc.database_connector, "execute_query", lambda q, p=None: None)
+    # INSERT transaction fails (returns None)
+    _fixed_allocator(monkeypatch)
+    monkeypatch.setattr(dc.database_connector, "execute_transaction", lambda work: None)
     status = dc.add_resource_asset({"type_id": 1, "location_id": 2,
                                     "employee_id": None, "notes": "",
                                     "is_decommissioned": 0}, 
@@ -115,46 +121,18 @@ def test_add_resource_asset_failure_on_insert(monkeypatch):
     assert status == 400
 
 
-def test_add_resource_asset_failure_on_last_insert_id(monkeypatch):
-    # INSERT ok; LAST_INSERT_ID returns falsy
-    steps = []
-    def fake_exec(q, p=None):
-        steps.append(q.strip().split()[0].upper())
-        if "LAST_INSERT_ID" in q:
-            return []   # simulate missing row
-        return {"status": "success", "rows_affected": 1}
-    monkeypatch.setattr(dc.database_connector, "execute_query", fake_exec)
-    status = dc.add_resource_asset({"type_id": 1, "location_id": 2,
+def test_add_resource_asset_failure_on_resource_id_allocation(monkeypatch):
+    # Unknown type: no resource_id can be allocated, nothing is inserted
+    monkeypatch.setattr(dc.resource_id_allocator, "allocate", lambda type_id, count=1: None)
+    monkeypatch.setattr(dc.database_connector, "execute_transaction",
+                        lambda work: pytest.fail("no insert expected"))
+    status = dc.add_resource_asset({"type_id": 99, "location_id": 2,
                                     "employee_id": None, "notes": "",
                                     "is_decommissioned": 0},
                                    db_auth.Role.MANAGER)
     assert status == 400
 
 
-def test_add_resource_asset_failure_on_update_resource_id(monkeypatch):
-    # INSERT ok; LAST_INSERT_ID ok; SELECT type ok; but final UPDATE fails
-    def fake_exec(q, p=None):
-        q_str = str(q)
-        if "LAST_INSERT_ID" in q_str:
-            return [{"new_id": 5}]
-        if "FROM AssetTypes" in q_str:
-            return [{"asset_type_name": "Monitor"}]
-        # Be tolerant of newlines/spacing in the UPDATE statement
-        if "UPDATE Asset" in q_str and "SET resource_id" in q_str:
-            return None  # simulate failure in update_resource_id()
-        return {"status": "success", "rows_affected": 1}
-
-    import src.database.database_controller as dc
-    monkeypatch.setattr(dc.database_connector, "execute_query", fake_exec)
-
-    status = dc.add_resource_asset(
-        {"type_id": 2, "location_id": 3, "employee_id": None, "notes": "", "is_decommissioned": 0},
-        db_auth.Role.MANAGER
-    )
-    assert status == 400
-
-
-
 def test_update_resource_id_success(monkeypatch):
     # Fix the year via monkeypatch (dc.datetime.datetime.now().year)
     class FakeDT(type(dc.datetime.datetime)):
@@ -186,3 +164,262 @@ def test_update_resource_id_failure_when_type_missing(monkeypatch):
                         p=None: [] if "FROM AssetTypes" in q else {"status": "success"})
     ok = dc.update_resource_id(9, 100, db_auth.Role.MANAGER)
     assert ok is False
+
+
+def _recording_transaction(before_rows, executed):
+    # The UPDATE matches the row when there is one; its old values come back
+    # from the @before_ session variables
+    def fake_tx(work):
+        def run(q, p=None):
+            executed.append((q, p))
+            if q.startswith("SELECT @before_"):
+                return before_rows
+            return {"status": "success", "rows_affected": len(before_rows)}
+        return work(run)
+    return fake_tx
+
+
+def test_update_resource_if_match_adds_version_guard(monkeypatch):
+    executed = []
+    before = [{"id": 1, "type_id": 2, "location_id": 3, "is_decommissioned": b"0"}]
+    monkeypatch.setattr(dc.database_connector, "execute_transaction",
+                        _recording_transaction(before, executed))
+    status = dc.update_resource({"asset_id": 1, "type_id": 2, "location_id": 3,
+                                 "employee_id": None, "notes": "", "is_decommissioned": 0},
+                                db_auth.Role.MANAGER, expected_version=5)
+    assert status == 200
+    update, captured = executed[0], executed[1]
+    assert "version + 1" in update[0]
+    assert "AND version = :expected_version" in update[0]
+    assert update[1]["expected_version"] == 5
+    # no read or lock before the UPDATE; the old values are captured by it
+    assert "@before_type_id := type_id" in update[0]
+    assert captured[0].startswith("SELECT @before_type_id AS type_id")
+    # bucket unchanged, so the summary is not touched
+    assert len(executed) == 2
+
+
+def test_update_resource_stale_version_returns_412(monkeypatch):
+    executed = []
+    monkeypatch.setattr(dc.database_connector, "execute_transaction",
+                        _recording_transaction([], executed))
+    status = dc.update_resource({"asset_id": 1, "type_id": 2, "location_id": 3,
+                                 "employee_id": None, "notes": "", "is_decommissioned": 0},
+                                db_auth.Role.MANAGER, expected_version=5)
+    assert status == 412
+    assert len(executed) == 1  # nothing read or written after the stale UPDATE
+
+
+def test_delete_resource_stale_version_returns_412(monkeypatch):
+    monkeypatch.setattr(dc.database_connector, "execute_transaction",
+                        _recording_transaction([], []))
+    assert dc.delete_resource(10, db_auth.Role.MANAGER, expected_version=2) == 412
+
+
+def test_delete_resource_moves_summary_bucket(monkeypatch):
+    executed = []
+    before = [{"id": 10, "type_id": 2, "location_id": None, "is_decommissioned": b"0"}]
+    monkeypatch.setattr(dc.database_connector, "execute_transaction",
+                        _recording_transaction(before, executed))
+    assert dc.delete_resource(10, db_auth.Role.MANAGER) == 200
+    deltas = [p for q, p in executed if "INSERT INTO AssetSummary" in q]
+    assert deltas == [
+        {"type_id": 2, "location_key": 0, "is_decommissioned": 0, "delta": -1},
+        {"type_id": 2, "location_key": 0, "is_decommissioned": 1, "delta": 1},
+    ]
+
+
+def test_add_resource_asset_increments_summary(monkeypatch):
+    executed = []
+    def run(q, p=None):
+        executed.append((q, p))
+        if "LAST_INSERT_ID" in q:
+            return [{"new_id": 7}]
+        return {"status": "success", "rows_affected": 1}
+    _fixed_allocator(monkeypatch)
+    monkeypatch.setattr(dc.database_connector, "execute_transaction", lambda work: work(run))
+    dc.add_resource_asset({"type_id": 1, "location_id": 2, "employee_id": None,
+                           "notes": "", "is_decommissioned": 0}, db_auth.Role.MANAGER)
+    deltas = [p for q, p in executed if "INSERT INTO AssetSummary" in q]
+    assert deltas == [{"type_id": 1, "location_key": 2, "is_decommissioned": 0, "delta": 1}]
+
+
+def test_get_resource_stats_reads_summary(monkeypatch):
+    monkeypatch.setattr(dc.database_connector, "execute_query",
+                        lambda q, p=None: [{"type_id": 1, "location_key": 0,
+                                            "is_decommissioned": 0, "asset_count": 4}])
+    code, rows = dc.get_resource_stats(db_auth.Role.EMPLOYEE)
+    assert code == 200 and rows[0]["asset_count"] == 4
+
+
+def test_get_resource_changes_uses_keyset_cursor(monkeypatch):
+    captured = {}
+    def fake_exec(q, p=None):
+        captured["query"] = q
+        captured["params"] = p
+        return [{"id": 8}]
+    monkeypatch.setattr(dc.database_connector, "execute_query", fake_exec)
+    since = dc.datetime.datetime(2025, 1, 1)
+    code, rows = dc.get_resource_changes(since, 7, 50, db_auth.Role.EMPLOYEE)
+    assert code == 200 and rows == [{"id": 8}]
+    assert "ORDER BY updated_at, id" in captured["query"]
+    assert captured["params"] == {"since": since, "since_id": 7, "limit": 50}
+
+
+def test_get_resource_changes_denied_for_other_role():
+    assert dc.get_resource_changes(user_position=db_auth.Role.OTHER) == (401, [])
+
+
+def test_get_resources_default_reads_active_table_only(monkeypatch):
+    captured = {}
+    def fake_exec(q, p=None):
+        captured["query"] = q
+        return []
+    monkeypatch.setattr(dc.database_connector, "execute_query", fake_exec)
+    dc.get_resources(db_auth.Role.EMPLOYEE)
+    assert "AssetArchive" not in captured["query"]
+
+
+def test_get_resource_by_id_include_archived_spans_archive(monkeypatch):
+    captured = {}
+    def fake_exec(q, p=None):
+        captured["query"] = q
+        return [{"id": 7, "archived_at": "2024-01-01"}]
+    monkeypatch.setattr(dc.database_connector, "execute_query", fake_exec)
+    code, item = dc.get_resource_by_id(7, db_auth.Role.EMPLOYEE, include_archived=True)
+    assert code == 200 and item["id"] == 7
+    assert "UNION ALL" in captured["query"]
+    assert "FROM AssetArchive WHERE id = :asset_id" in captured["query"]
+
+
+def test_search_resources_runs_fulltext_query(monkeypatch):
+    captured = {}
+    def fake_exec(q, p=None):
+        captured["query"], captured["params"] = q, p
+        return [{"id": 4, "relevance": 1.5}]
+    monkeypatch.setattr(dc.database_connector, "execute_query", fake_exec)
+    code, rows = dc.search_resources("cracked screen", {"location_id": 2}, 10, 0,
+                                     db_auth.Role.EMPLOYEE)
+    assert code == 200 and rows[0]["id"] == 4
+    assert "MATCH(notes)" in captured["query"]
+    assert captured["params"]["terms"] == "+cracked +screen"
+    assert captured["params"]["location_id"] == 2
+
+
+def test_search_resources_without_words_returns_400(monkeypatch):
+    monkeypatch.setattr(dc.database_connector, "execute_query",
+                        lambda q, p=None: pytest.fail("no query expected"))
+    assert dc.search_resources("+-*", None, 10, 0, db_auth.Role.EMPLOYEE) == (400, [])
+
+
+def test_get_resources_by_ids_single_in_query(monkeypatch):
+    captured = []
+    def fake_exec(q, p=None):
+        captured.append((q, p))
+        return [{"id": 3}, {"id": 1}]
+    monkeypatch.setattr(dc.database_connector, "execute_query", fake_exec)
+    code, batch = dc.get_resources_by_ids([1, 2, 3, 1], db_auth.Role.EMPLOYEE)
+    assert code == 200
+    assert len(captured) == 1
+    assert "WHERE id IN (:asset_id_0, :asset_id_1, :asset_id_2)" in captured[0][0]
+    assert set(batch["found"]) == {1, 3}
+    assert batch["missing"] == [2]
+
+
+def test_get_resources_by_ids_denied_for_other_role():
+    assert dc.get_resources_by_ids([1], db_auth.Role.OTHER) == (401, {})
+
+
+def test_add_resource_assets_one_multi_row_insert(monkeypatch):
+    executed, allocations = [], []
+    def fake_allocate(type_id, count=1):
+        allocations.append((type_id, count))
+        return [f"T{type_id}-2025-{n:03d}" for n in range(1, count + 1)]
+    def fake_tx(work):
+        def run(q, p=None):
+            executed.append((q, p))
+            if "SELECT id, resource_id" in q:
+                # ids come back out of order and non-consecutive
+                return [{"id": 12, "resource_id": "T2-2025-001"},
+                        {"id": 10, "resource_id": "T1-2025-001"},
+                        {"id": 15, "resource_id": "T1-2025-002"}]
+            return {"status": "success", "rows_affected": 3}
+        return work(run)
+    monkeypatch.setattr(dc.resource_id_allocator, "allocate", fake_allocate)
+    monkeypatch.setattr(dc.database_connector, "execute_transaction", fake_tx)
+    resource = {"type_id": 1, "location_id": 4, "employee_id": None, "notes": "", "is_decommissioned": 0}
+    resources = [resource, {**resource, "type_id": 2}, resource]
+
+    assert dc.add_resource_assets(resources, db_auth.Role.MANAGER) == [(200, 10), (200, 12), (200, 15)]
+    assert allocations == [(1, 2), (2, 1)]
+    insert, select, *deltas = executed
+    assert insert[0].count("(:resource_id_") == 3
+    assert [insert[1][f"resource_id_{i}"] for i in range(3)] == ["T1-2025-001", "T2-2025-001",
+                                                                  "T1-2025-002"]
+    assert not any(q.strip().startswith("UPDATE") for q, _ in executed)
+    assert sorted(d[1]["delta"] for d in deltas) == [1, 2]
+
+
+def test_add_resource_assets_failure_fails_every_item(monkeypatch):
+    _fixed_allocator(monkeypatch, ("A", "B"))
+    monkeypatch.setattr(dc.database_connector, "execute_transaction", lambda work: None)
+    assert dc.add_resource_assets([{"type_id": 1}] * 2, db_auth.Role.MANAGER) == [(400, None)] * 2
+
+
+def test_update_resources_shares_one_transaction(monkeypatch):
+    executed, calls = [], []
+    before = [{"id": 1, "type_id": 2, "location_id": 3, "is_decommissioned": b"0"}]
+    def fake_tx(work):
+        calls.append(work)
+        def run(q, p=None):
+            executed.append((q, p))
+            if q.startswith("SELECT @before_"):
+                return before
+            return {"status": "success",
+                    "rows_affected": 0 if (p or {}).get("expected_version") == 9 else 1}
+        return work(run)
+    monkeypatch.setattr(dc.database_connector, "execute_transaction", fake_tx)
+    resource = {"asset_id": 1, "type_id": 2, "location_id": 3, "employee_id": None,
+                "notes": "", "is_decommissioned": 0}
+    assert dc.update_resources([(resource, None), (resource, 9)], db_auth.Role.MANAGER) == [200, 412]
+    assert len(calls) == 1
+
+
+def test_update_resource_records_history_after_commit(monkeypatch):
+    before = [{"id": 1, "type_id": 2, "location_id": 3, "employee_id": None, "notes": "",
+               "is_decommissioned": b"0", "version": 4}]
+    monkeypatch.setattr(dc.database_connector, "execute_transaction",
+                        _recording_transaction(before, []))
+    writer = dc.asset_history.HistoryWriter(enabled=True)
+    monkeypatch.setattr(dc.asset_history, "writer", writer)
+
+    status = dc.update_resource({"asset_id": 1, "type_id": 2, "location_id": 3,
+                                 "employee_id": None, "notes": "moved", "is_decommissioned": 0},
+                                db_auth.Role.MANAGER, actor="jdoe")
+    assert status == 200
+    [entry] = writer.pending_for(1)
+    assert entry["actor"] == "jdoe" and entry["action"] == "update"
+    assert entry["after_values"] == '{"notes": "moved", "version": 5}'
+
+
+def test_stale_delete_records_no_history(monkeypatch):
+    monkeypatch.setattr(dc.database_connector, "execute_transaction",
+                        _recording_transaction([], []))
+    writer = dc.asset_history.HistoryWriter(enabled=True)
+    monkeypatch.setattr(dc.asset_history, "writer", writer)
+    assert dc.delete_resource(10, db_auth.Role.MANAGER, expected_version=2) == 412
+    assert writer.pending_for(10) == []
+
+
+def test_get_resource_history_puts_unflushed_entries_first(monkeypatch):
+    writer = dc.asset_history.HistoryWriter(enabled=True)
+    writer.record(7, "delete", {"is_decommissioned": b"0"}, {"is_decommissioned": 1}, "jdoe")
+    monkeypatch.setattr(dc.asset_history, "writer", writer)
+    stored = [{"id": 3, "asset_id": 7, "action": "update", "actor": "amy", "changed_at": "t",
+               "before": {}, "after": {}}]
+    monkeypatch.setattr(dc.asset_history, "get_history", lambda *a: list(stored))
+
+    status, entries = dc.get_resource_history(7, db_auth.Role.EMPLOYEE)
+    assert status == 200
+    assert [(e["id"], e["action"]) for e in entries] == [(None, "delete"), (3, "update")]
+    assert dc.get_resource_history(7, db_auth.Role.OTHER) == (401, [])
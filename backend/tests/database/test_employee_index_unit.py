@@ -0,0 +1,99 @@
+import datetime
+import pytest
+from src.database import employee_index as ei
+
+pytestmark = pytest.mark.unit
+
+ROWS = [
+    {"id": 1, "first_name": "Ada", "last_name": "Lovelace"},
+    {"id": 2, "first_name": "Grace", "last_name": "Hopper"},
+    {"id": 3, "first_name": "Adam", "last_name": "Smith"},
+    {"id": 4, "first_name": "Linus", "last_name": "Adamson"},
+    {"id": 5, "first_name": "Barbara", "last_name": "Liskov"},
+]
+
+
+def _index(rows=ROWS):
+    index = ei.EmployeeIndex()
+    index.load(rows)
+    return index
+
+
+def _ids(results):
+    return [row["id"] for row in results]
+
+
+def test_prefix_matches_any_name_ordered_by_last_name():
+    results, cursor = _index().search("ada")
+    # Adamson (last-name prefix), Lovelace (first), Smith (first)
+    assert _ids(results) == [4, 1, 3]
+    assert cursor is None
+
+
+def test_prefix_matches_rank_before_substrings():
+    index = _index(ROWS + [{"id": 6, "first_name": "Alison", "last_name": "Abbott"}])
+    results, _ = index.search("lis")
+    assert _ids(results) == [5, 6]      # Liskov (prefix) before Alison (substring)
+    results, _ = index.search("opp")
+    assert _ids(results) == [2]
+
+
+def test_short_queries_match_prefixes_only():
+    assert _ids(_index().search("ov")[0]) == []
+
+
+def test_full_name_prefix_and_case_folding():
+    results, _ = _index().search("  GRACE  hop")
+    assert _ids(results) == [2]
+
+
+def test_cursor_pagination_walks_every_match_once():
+    index = _index()
+    seen, cursor = [], None
+    while True:
+        page, cursor = index.search("a", limit=2, cursor=cursor)
+        seen += _ids(page)
+        if cursor is None:
+            break
+    assert seen == [4, 1, 3]
+
+
+def test_empty_query_lists_everyone_by_name():
+    results, _ = _index().search("", limit=10)
+    assert _ids(results) == [4, 2, 5, 1, 3]
+
+
+def test_invalid_cursor_raises():
+    with pytest.raises(ValueError):
+        _index().search("a", cursor="not-a-cursor")
+
+
+def test_upsert_reindexes_renamed_employee():
+    index = _index()
+    index.upsert([{"id": 2, "first_name": "Grace", "last_name": "Brewster"}])
+    assert _ids(index.search("hop")[0]) == []
+    assert _ids(index.search("brew")[0]) == [2]
+
+
+def test_refresh_queries_changes_since_last_update(monkeypatch):
+    stamp = datetime.datetime(2025, 1, 1)
+    index = _index([{**ROWS[0], "updated_at": stamp}])
+    captured = {}
+    def fake_exec(q, p=None):
+        captured["query"], captured["params"] = q, p
+        return [{"id": 9, "first_name": "Alan", "last_name": "Turing",
+                 "updated_at": stamp + datetime.timedelta(seconds=5)}]
+    monkeypatch.setattr(ei.database_connector, "execute_query", fake_exec)
+    assert index.refresh() is True
+    assert "(updated_at > :since OR id > :since_id)" in captured["query"]
+    assert "NOW(6) - INTERVAL 1 SECOND" in captured["query"]
+    assert captured["params"] == {"since": stamp, "since_id": 1}
+    assert _ids(index.search("tur")[0]) == [9]
+    assert index._cursor == (stamp + datetime.timedelta(seconds=5), 9)
+
+
+def test_reload_failure_leaves_index_unloaded(monkeypatch):
+    monkeypatch.setattr(ei.database_connector, "execute_query", lambda q, p=None: None)
+    index = ei.EmployeeIndex()
+    assert index.reload() is False
+    assert index.loaded is False
@@ -0,0 +1,57 @@
+import pytest
+from src.database import inventory_summary as summary
+
+pytestmark = pytest.mark.unit
+
+
+def test_bucket_normalizes_binary_flag_and_employee_assets():
+    assert summary.bucket({"type_id": 1, "location_id": None, "is_decommissioned": b"1"}) == (1, 0, 1)
+    assert summary.bucket({"type_id": 1, "location_id": 4, "is_decommissioned": 0}) == (1, 4, 0)
+
+
+def test_move_skips_unchanged_bucket():
+    calls = []
+    row = {"type_id": 1, "location_id": 4, "is_decommissioned": b"0"}
+    summary.move(lambda q, p=None: calls.append(p), row, {**row, "notes": "x"})
+    assert calls == []
+
+
+def test_reconcile_reads_a_snapshot_then_applies_only_the_drift(monkeypatch):
+    counted = [{"type_id": 1, "location_key": 4, "is_decommissioned": 0, "asset_count": 3},
+               {"type_id": 2, "location_key": 0, "is_decommissioned": 1, "asset_count": 1}]
+    stored = [{"type_id": 1, "location_key": 4, "is_decommissioned": b"0", "asset_count": 3},
+              {"type_id": 2, "location_key": 0, "is_decommissioned": b"1", "asset_count": 2},
+              {"type_id": 5, "location_key": 7, "is_decommissioned": b"0", "asset_count": 1}]
+    transactions = []
+    def fake_tx(work):
+        executed = []
+        transactions.append(executed)
+        def run(q, p=None):
+            executed.append((q, p))
+            if "FROM AssetSummary" in q:
+                return stored
+            if "GROUP BY" in q:
+                return counted
+            return {"status": "success", "rows_affected": 1}
+        return work(run)
+    monkeypatch.setattr(summary.shards.database_connector, "execute_transaction", fake_tx)
+    assert summary.reconcile() is True
+    reads, writes = transactions
+    assert all(q.lstrip().startswith("SELECT") for q, _ in reads)
+    assert sorted(p["delta"] for _, p in writes) == [-1, -1]
+    assert {(p["type_id"], p["location_key"]) for _, p in writes} == {(2, 0), (5, 7)}
+
+
+def test_reconcile_without_drift_writes_nothing(monkeypatch):
+    transactions = []
+    def fake_tx(work):
+        transactions.append(work)
+        return work(lambda q, p=None: [])
+    monkeypatch.setattr(summary.shards.database_connector, "execute_transaction", fake_tx)
+    assert summary.reconcile() is True
+    assert len(transactions) == 1
+
+
+def test_reconcile_failure(monkeypatch):
+    monkeypatch.setattr(summary.shards.database_connector, "execute_transaction", lambda work: None)
+    assert summary.reconcile() is False
@@ -0,0 +1,111 @@
+import pytest
+from src.database.migrations import runner
+
+pytestmark = pytest.mark.unit
+
+
+def _write(tmp_path, name, sql):
+    (tmp_path / name).write_text(sql, encoding="utf-8")
+
+
+def test_discover_migrations_orders_by_version(tmp_path):
+    _write(tmp_path, "0002_second.sql", "SELECT 2;")
+    _write(tmp_path, "0001_first.sql", "SELECT 1;")
+    _write(tmp_path, "README.txt", "not a migration")
+    found = runner.discover_migrations(str(tmp_path))
+    assert [(m.version, m.name) for m in found] == [(1, "first"), (2, "second")]
+
+
+def test_discover_migrations_rejects_duplicate_versions(tmp_path):
+    _write(tmp_path, "0001_first.sql", "SELECT 1;")
+    _write(tmp_path, "0001_again.sql", "SELECT 1;")
+    with pytest.raises(ValueError):
+        runner.discover_migrations(str(tmp_path))
+
+
+def test_split_statements_skips_comments():
+    sql = "-- header\nALTER TABLE A\n    ADD INDEX i (x);\n\n-- next\nALTER TABLE B ADD INDEX j (y);\n"
+    assert runner.split_statements(sql) == [
+        "ALTER TABLE A\n    ADD INDEX i (x);",
+        "ALTER TABLE B ADD INDEX j (y);",
+    ]
+
+
+def test_shipped_index_migrations_are_online():
+    for migration in runner.discover_migrations():
+        for statement in runner.split_statements(migration.sql):
+            if "ADD INDEX" in statement:
+                assert "ALGORITHM=INPLACE, LOCK=NONE" in statement, migration.name
+
+
+def _fake_db(applied, fail_on=None):
+    executed = []
+
+    def fake_exec(q, p=None):
+        executed.append((q, p))
+        if fail_on and fail_on in q:
+            return None
+        if "SELECT version, checksum" in q:
+            return [{"version": v, "checksum": c} for v, c in applied.items()]
+        return {"status": "success", "rows_affected": 0}
+    return executed, fake_exec
+
+
+def test_migrate_applies_pending_and_records(tmp_path, monkeypatch):
+    _write(tmp_path, "0001_first.sql", "ALTER TABLE A ADD INDEX i (x);")
+    _write(tmp_path, "0002_second.sql", "ALTER TABLE B ADD INDEX j (y);")
+    monkeypatch.setattr(runner, "VERSIONS_DIR", str(tmp_path))
+    first = runner.discover_migrations()[0]
+    executed, fake_exec = _fake_db({1: first.checksum})
+    monkeypatch.setattr(runner.shards.database_connector, "execute_query", fake_exec)
+
+    assert runner.migrate() is True
+    queries = [q for q, _ in executed]
+    assert "ALTER TABLE B ADD INDEX j (y);" in queries
+    assert "ALTER TABLE A ADD INDEX i (x);" not in queries
+    recorded = [p for q, p in executed if "INSERT INTO schema_migrations" in q]
+    assert [r["version"] for r in recorded] == [2]
+
+
+def test_migrate_stops_at_first_failure(tmp_path, monkeypatch):
+    _write(tmp_path, "0001_first.sql", "ALTER TABLE A ADD INDEX i (x);")
+    _write(tmp_path, "0002_second.sql", "ALTER TABLE B ADD INDEX j (y);")
+    monkeypatch.setattr(runner, "VERSIONS_DIR", str(tmp_path))
+    executed, fake_exec = _fake_db({}, fail_on="ALTER TABLE A")
+    monkeypatch.setattr(runner.shards.database_connector, "execute_query", fake_exec)
+
+    assert runner.migrate() is False
+    queries = [q for q, _ in executed]
+    assert "ALTER TABLE B ADD INDEX j (y);" not in queries
+    assert not any("INSERT INTO schema_migrations" in q for q in queries)
+
+
+def test_migrate_baseline_records_without_running(tmp_path, monkeypatch):
+    _write(tmp_path, "0001_first.sql", "ALTER TABLE A ADD INDEX i (x);")
+    monkeypatch.setattr(runner, "VERSIONS_DIR", str(tmp_path))
+    executed, fake_exec = _fake_db({})
+    monkeypatch.setattr(runner.shards.database_connector, "execute_query", fake_exec)
+
+    assert runner.migrate(baseline=True) is True
+    queries = [q for q, _ in executed]
+    assert "ALTER TABLE A ADD INDEX i (x);" not in queries
+    assert any("INSERT INTO schema_migrations" in q for q in queries)
+
+
+def test_migrate_runs_on_every_shard(tmp_path, monkeypatch):
+    _write(tmp_path, "0001_first.sql", "ALTER TABLE A ADD INDEX i (x);")
+    monkeypatch.setattr(runner, "VERSIONS_DIR", str(tmp_path))
+    ran = []
+
+    class Shard(runner.shards.Shard):
+        def execute_query(self, query, params=None):
+            ran.append((self.name, query))
+            if "SELECT version, checksum" in query:
+                return []
+            return {"status": "success", "rows_affected": 0}
+
+    monkeypatch.setattr(runner.shards, "router",
+                        runner.shards.ShardRouter([Shard("primary"), Shard("eu")]))
+    assert runner.migrate() is True
+    applied = [name for name, query in ran if query == "ALTER TABLE A ADD INDEX i (x);"]
+    assert applied == ["primary", "eu"]
@@ -0,0 +1,52 @@
+import pytest
+from src.database import resource_ids
+
+pytestmark = pytest.mark.unit
+
+
+def _sequence(monkeypatch, start=1041, type_name="Laptop"):
+    """Fakes ResourceIdSequence; returns the list of reserved (type_id, count)."""
+    state = {"next": start}
+    reserved = []
+    def fake_tx(work):
+        def run(q, p=None):
+            if "FOR UPDATE" in q:
+                return [{"next_value": state["next"], "asset_type_name": type_name}]
+            if q.strip().startswith("UPDATE"):
+                reserved.append((p["type_id"], p["count"]))
+                state["next"] += p["count"]
+            return {"status": "success", "rows_affected": 1}
+        return work(run)
+    monkeypatch.setattr(resource_ids.database_connector, "execute_transaction", fake_tx)
+    return reserved
+
+
+def test_allocations_are_served_from_one_block(monkeypatch):
+    reserved = _sequence(monkeypatch)
+    allocator = resource_ids.ResourceIdAllocator(block_size=10)
+    year = resource_ids.datetime.datetime.now().year
+    assert allocator.allocate(1) == [f"Laptop-{year}-1041"]
+    assert allocator.allocate(1, count=2) == [f"Laptop-{year}-1042", f"Laptop-{year}-1043"]
+    assert reserved == [(1, 10)]
+
+
+def test_exhausted_block_reserves_the_next_one(monkeypatch):
+    reserved = _sequence(monkeypatch, start=1)
+    allocator = resource_ids.ResourceIdAllocator(block_size=2)
+    ids = [allocator.allocate(1)[0] for _ in range(3)]
+    assert [i.rsplit("-", 1)[1] for i in ids] == ["001", "002", "003"]
+    assert reserved == [(1, 2), (1, 2)]
+
+
+def test_large_request_reserves_exactly_what_it_needs(monkeypatch):
+    reserved = _sequence(monkeypatch)
+    allocator = resource_ids.ResourceIdAllocator(block_size=10)
+    assert len(allocator.allocate(1, count=25)) == 25
+    assert reserved == [(1, 25)]
+
+
+def test_unknown_type_returns_none(monkeypatch):
+    monkeypatch.setattr(resource_ids.database_connector, "execute_transaction",
+                        lambda work: work(lambda q, p=None: [] if "FOR UPDATE" in q
+                                          else {"status": "success", "rows_affected": 0}))
+    assert resource_ids.ResourceIdAllocator().allocate(99) is None
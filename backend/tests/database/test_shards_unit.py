@@ -0,0 +1,191 @@
+import configparser
+import pytest
+import sqlalchemy
+from src.database import shards
+import src.database.database_controller as dc
+import src.database.authorize as auth
+
+pytestmark = pytest.mark.unit
+
+
+def _sqlite_shard(tmp_path, name, rows):
+    engine = sqlalchemy.create_engine(f"sqlite:///{tmp_path}/{name}.db")
+    with engine.begin() as conn:
+        conn.execute(sqlalchemy.text(
+            "CREATE TABLE Asset (id INTEGER PRIMARY KEY, location_id INTEGER, employee_id INTEGER)"))
+        for row in rows:
+            conn.execute(sqlalchemy.text(
+                "INSERT INTO Asset VALUES (:id, :location_id, :employee_id)"), row)
+    return shards.Shard(name, engine)
+
+
+class FakeShard(shards.Shard):
+    """Shard answering SELECTs with canned rows and recording every statement."""
+
+    def __init__(self, name, rows=None, fail=False):
+        super().__init__(name)
+        self.rows = rows or []
+        self.fail = fail
+        self.statements = []
+
+    def run(self, query, params=None):
+        self.statements.append((" ".join(query.split()), params))
+        if query.lstrip().startswith("SELECT"):
+            return [dict(row) for row in self.rows]
+        return {"status": "success", "rows_affected": 1}
+
+    def execute_query(self, query, params=None):
+        return None if self.fail else self.run(query, params)
+
+    def execute_transaction(self, work):
+        return None if self.fail else work(self.run)
+
+
+def test_parse_locations_expands_ranges():
+    assert shards.parse_locations("1-3, 7,, 10-10") == [1, 2, 3, 7, 10]
+    assert shards.parse_locations("") == []
+
+
+def test_router_routes_by_location_with_default_fallback():
+    primary, eu = shards.Shard("primary"), shards.Shard("eu")
+    router = shards.ShardRouter([primary, eu], {5: "eu"}, default="primary")
+    assert router.sharded
+    assert router.for_location(5) is eu
+    assert router.for_location(6) is primary
+    assert router.for_asset({"location_id": None, "employee_id": 3}) is primary
+    with pytest.raises(ValueError):
+        shards.ShardRouter([primary], {1: "missing"})
+
+
+def test_from_config_reads_shard_sections():
+    parser = configparser.ConfigParser()
+    parser.read_string("[shard.primary]\nlocations = 1-2\n[shard.eu]\nlocations = 3, 4\n")
+    router = shards.from_config(parser, enabled=True, default="primary")
+    assert [shard.name for shard in router.all()] == ["primary", "eu"]
+    assert router.for_location(4).name == "eu"
+    assert router.default.engine is None        # no url: the main database
+
+    assert not shards.from_config(parser, enabled=False).sharded
+
+    parser.read_string("[shard.us]\nlocations = 2\n")
+    with pytest.raises(ValueError):
+        shards.from_config(parser, enabled=True, default="primary")
+
+
+def test_query_all_and_locate_many_span_shards(tmp_path):
+    a = _sqlite_shard(tmp_path, "a", [{"id": 1, "location_id": 1, "employee_id": None},
+                                      {"id": 3, "location_id": None, "employee_id": 9}])
+    b = _sqlite_shard(tmp_path, "b", [{"id": 2, "location_id": 5, "employee_id": 9}])
+    router = shards.ShardRouter([a, b], {5: "b"}, workers=2)
+    try:
+        rows = router.query_all("SELECT id FROM Asset WHERE employee_id = :e", {"e": 9})
+        assert sorted(row["id"] for row in rows) == [2, 3]
+        located = router.locate_many([1, 2, 2, 99])
+        assert located == {1: a, 2: b}
+        assert router.locate(99) is a
+    finally:
+        router.close()
+
+
+def test_query_all_fails_when_any_shard_fails():
+    router = shards.ShardRouter([FakeShard("a", [{"id": 1}]), FakeShard("b", fail=True)])
+    assert router.query_all("SELECT * FROM Asset;") is None
+
+
+def test_get_resources_merges_shards_in_id_order(monkeypatch):
+    router = shards.ShardRouter([FakeShard("a", [{"id": 1}, {"id": 4}]),
+                                 FakeShard("b", [{"id": 2}])])
+    monkeypatch.setattr(dc.shards, "router", router)
+    assert dc.get_resources(auth.Role.MANAGER) == (200, [{"id": 1}, {"id": 2}, {"id": 4}])
+
+
+def test_get_resource_by_location_id_reads_one_shard(monkeypatch):
+    a, b = FakeShard("a", [{"id": 1}]), FakeShard("b", [{"id": 2}])
+    monkeypatch.setattr(dc.shards, "router", shards.ShardRouter([a, b], {5: "b"}))
+    assert dc.get_resource_by_location_id(5, auth.Role.MANAGER) == (200, [{"id": 2}])
+    assert a.statements == []
+
+
+def test_add_resource_assets_inserts_per_shard(monkeypatch):
+    a, b = FakeShard("a"), FakeShard("b", fail=True)
+    monkeypatch.setattr(dc.shards, "router", shards.ShardRouter([a, b], {5: "b"}))
+    monkeypatch.setattr(dc.resource_id_allocator, "allocate",
+                        lambda type_id, count: [f"T-{i}" for i in range(count)])
+    a.rows = [{"id": 10, "resource_id": "T-0"}]
+    results = dc.add_resource_assets(
+        [{"type_id": 1, "location_id": 1}, {"type_id": 1, "location_id": 5}], auth.Role.MANAGER)
+    assert results[1] == (400, None)            # shard b failed, shard a did not
+    assert results[0][0] == 200
+
+
+def test_update_moving_location_moves_row_between_shards(monkeypatch):
+    row = {"id": 7, "resource_id": "T-1", "type_id": 1, "date_added": None, "location_id": 1,
+           "employee_id": None, "notes": "", "is_decommissioned": 0,
+           "decommission_date": None, "version": 2}
+    a, b = FakeShard("a", [row]), FakeShard("b")
+    monkeypatch.setattr(dc.shards, "router", shards.ShardRouter([a, b], {5: "b"}))
+    monkeypatch.setattr(dc.shards.ShardRouter, "locate", lambda self, asset_id: a)
+
+    status = dc.update_resource({"asset_id": 7, "type_id": 1, "location_id": 5,
+                                 "employee_id": None, "notes": "", "is_decommissioned": 0},
+                                auth.Role.MANAGER)
+    assert status == 200
+    inserted = [params for query, params in b.statements if query.startswith("INSERT INTO Asset ")]
+    assert inserted and inserted[0]["id"] == 7 and inserted[0]["location_id"] == 5
+    assert inserted[0]["version"] == 3
+    assert any(query.startswith("DELETE FROM Asset") for query, _ in a.statements)
+
+
+def test_failed_move_leaves_source_untouched(monkeypatch):
+    a, b = FakeShard("a", [{"id": 7, "location_id": 1, "version": 1}]), FakeShard("b", fail=True)
+    result = dc._move_asset(a, b, {"asset_id": 7}, None, {"location_id": 5})
+    assert result is None
+    assert not any(query.startswith("DELETE") for query, _ in a.statements)
+
+
+def test_move_is_undone_when_the_source_row_changed():
+    class RacedShard(FakeShard):
+        def run(self, query, params=None):
+            result = super().run(query, params)
+            return {**result, "rows_affected": 0} if query.startswith("DELETE") else result
+
+    a, b = RacedShard("a", [{"id": 7, "location_id": 1, "version": 1}]), FakeShard("b")
+    assert dc._move_asset(a, b, {"asset_id": 7}, None, {"location_id": 5}) is None
+    assert dc._move_asset(a, b, {"asset_id": 7, "expected_version": 1}, 1,
+                          {"location_id": 5}) == {"status": "success", "rows_affected": 0}
+    undone = [query for query, _ in b.statements if query.startswith("DELETE FROM Asset")]
+    assert len(undone) == 2
+
+
+class FlakyShard(FakeShard):
+    """Fails its first `failures` statements, then behaves like FakeShard."""
+
+    def __init__(self, name, rows=None, failures=0):
+        super().__init__(name, rows)
+        self.failures = failures
+
+    def execute_query(self, query, params=None):
+        if self.failures:
+            self.failures -= 1
+            return None
+        return super().execute_query(query, params)
+
+
+def test_new_type_copy_is_retried(monkeypatch):
+    a, b = FakeShard("a", [{"id": 3, "asset_type_name": "Dock"}]), FlakyShard("b", failures=2)
+    monkeypatch.setattr(dc.shards, "router", shards.ShardRouter([a, b]))
+    monkeypatch.setattr(dc.database_connector, "execute_query", lambda q, p=None: {})
+    assert dc.add_resource_type({"asset_type_name": "Dock"}, auth.Role.MANAGER) == 200
+    assert [params for query, params in b.statements] == [{"id": 3, "asset_type_name": "Dock"}]
+
+
+def test_adding_a_partly_copied_type_again_finishes_the_copy(monkeypatch):
+    a, b = FakeShard("a", [{"id": 3, "asset_type_name": "Dock"}]), FlakyShard("b", failures=3)
+    monkeypatch.setattr(dc.shards, "router", shards.ShardRouter([a, b]))
+    monkeypatch.setattr(dc.database_connector, "execute_query", lambda q, p=None: {})
+    assert dc.add_resource_type({"asset_type_name": "Dock"}, auth.Role.MANAGER) == 400
+
+    # The name is now taken on the default shard, but shard b still lacks the type
+    monkeypatch.setattr(dc.database_connector, "execute_query", lambda q, p=None: None)
+    assert dc.add_resource_type({"asset_type_name": "Dock"}, auth.Role.MANAGER) == 200
+    assert any(query.startswith("INSERT IGNORE INTO AssetTypes") for query, _ in b.statements)
@@ -0,0 +1,102 @@
+import asyncio
+import pytest
+from src.database import write_coalescer as wc
+from src.database import authorize as db_auth
+
+pytestmark = pytest.mark.unit
+
+
+def _resource(type_id=1):
+    return {"type_id": type_id, "location_id": 2, "employee_id": None,
+            "notes": "", "is_decommissioned": 0}
+
+
+def test_concurrent_inserts_flush_as_one_batch(monkeypatch):
+    batches = []
+    def fake_insert_many(resources, role):
+        batches.append(len(resources))
+        return [(200, 100 + i) for i in range(len(resources))]
+    monkeypatch.setattr(wc.database_controller, "add_resource_assets", fake_insert_many)
+
+    async def scenario():
+        coalescer = wc.WriteCoalescer(window_ms=5, max_batch=50)
+        return await asyncio.gather(*(coalescer.add(_resource(), db_auth.Role.MANAGER)
+                                      for _ in range(3)))
+
+    assert asyncio.run(scenario()) == [(200, 100), (200, 101), (200, 102)]
+    assert batches == [3]
+
+
+def test_full_batch_flushes_without_waiting(monkeypatch):
+    batches = []
+    monkeypatch.setattr(wc.database_controller, "add_resource_assets",
+                        lambda resources, role: batches.append(len(resources))
+                        or [(200, 1)] * len(resources))
+
+    async def scenario():
+        coalescer = wc.WriteCoalescer(window_ms=10_000, max_batch=2)
+        return await asyncio.wait_for(
+            asyncio.gather(*(coalescer.add(_resource(), db_auth.Role.MANAGER) for _ in range(4))),
+            timeout=2)
+
+    assert len(asyncio.run(scenario())) == 4
+    assert batches == [2, 2]
+
+
+def test_failed_batch_is_retried_one_by_one(monkeypatch):
+    def fake_insert_many(resources, role):
+        if len(resources) > 1 or resources[0]["type_id"] == 99:
+            return [(400, None)] * len(resources)
+        return [(200, 7)]
+    monkeypatch.setattr(wc.database_controller, "add_resource_assets", fake_insert_many)
+
+    async def scenario():
+        coalescer = wc.WriteCoalescer(window_ms=1)
+        return await asyncio.gather(coalescer.add(_resource(), db_auth.Role.MANAGER),
+                                    coalescer.add(_resource(99), db_auth.Role.MANAGER))
+
+    assert asyncio.run(scenario()) == [(200, 7), (400, None)]
+
+
+def test_partly_failed_batch_retries_only_the_failed_rows(monkeypatch):
+    # The two updates sit on different shards and only one shard's transaction failed
+    seen = []
+    def fake_update_many(items, role):
+        seen.append([resource["asset_id"] for resource, _, _ in items])
+        return [200, 400] if len(items) > 1 else [200]
+    monkeypatch.setattr(wc.database_controller, "update_resources", fake_update_many)
+
+    async def scenario():
+        coalescer = wc.WriteCoalescer(window_ms=1)
+        return await asyncio.gather(coalescer.update({"asset_id": 1}, db_auth.Role.MANAGER),
+                                    coalescer.update({"asset_id": 2}, db_auth.Role.MANAGER))
+
+    assert asyncio.run(scenario()) == [200, 200]
+    assert seen == [[1, 2], [2]]
+
+
+def test_updates_resolve_each_callers_status(monkeypatch):
+    seen = []
+    def fake_update_many(items, role):
+        seen.append(items)
+        return [200, 412]
+    monkeypatch.setattr(wc.database_controller, "update_resources", fake_update_many)
+
+    async def scenario():
+        coalescer = wc.WriteCoalescer(window_ms=1)
+        return await asyncio.gather(
+            coalescer.update({"asset_id": 1}, db_auth.Role.MANAGER),
+            coalescer.update({"asset_id": 2}, db_auth.Role.MANAGER, expected_version=3,
+                             actor="jdoe"))
+
+    assert asyncio.run(scenario()) == [200, 412]
+    assert seen == [[({"asset_id": 1}, None, None), ({"asset_id": 2}, 3, "jdoe")]]
+
+
+def test_writes_without_write_access_are_not_queued():
+    async def scenario():
+        coalescer = wc.WriteCoalescer()
+        return (await coalescer.add(_resource(), db_auth.Role.EMPLOYEE),
+                await coalescer.update({"asset_id": 1}, db_auth.Role.EMPLOYEE))
+
+    assert asyncio.run(scenario()) == ((401, None), 401)
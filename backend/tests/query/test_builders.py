@@ -1,5 +1,6 @@
 import pytest
-from src.query.builders import build_asset_search_query
+from src.query.builders import (build_asset_search_query, build_in_clause,
+                                build_notes_search_query)
 
 pytestmark = pytest.mark.unit
 
@@ -13,3 +14,28 @@ def test_build_asset_search_query_empty():
     sql, params = build_asset_search_query({})
     assert sql.strip().endswith("1=1")
     assert params == {}
+
+def test_build_in_clause_numbers_placeholders():
+    sql, params = build_in_clause("asset_id", [7, 9])
+    assert sql == "IN (:asset_id_0, :asset_id_1)"
+    assert params == {"asset_id_0": 7, "asset_id_1": 9}
+
+def test_build_in_clause_empty_matches_nothing():
+    assert build_in_clause("asset_id", []) == ("IN (NULL)", {})
+
+def test_build_notes_search_query_requires_every_word():
+    sql, params = build_notes_search_query('cracked "screen"+', {}, 20, 40)
+    assert "MATCH(notes) AGAINST (:terms IN BOOLEAN MODE)" in sql
+    assert "ORDER BY relevance DESC, id" in sql
+    assert params == {"terms": "+cracked +screen", "ranking": "cracked screen",
+                      "limit": 20, "offset": 40}
+
+def test_build_notes_search_query_adds_filters():
+    sql, params = build_notes_search_query("PO1234", {"type_id": 3, "is_decommissioned": 0,
+                                                      "location_id": None}, 10)
+    assert "type_id = :type_id" in sql and "is_decommissioned = :is_decommissioned" in sql
+    assert "location_id" not in params
+
+def test_build_notes_search_query_rejects_empty_text():
+    with pytest.raises(ValueError):
+        build_notes_search_query("  -- ", {}, 10)
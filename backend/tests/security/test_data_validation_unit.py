@@ -0,0 +1,40 @@
+import pytest
+
+from src.security import data_validation as D
+
+pytestmark = pytest.mark.unit
+
+VALID = {"type_id": 4, "location_id": 1, "employee_id": None, "notes": "Test asset",
+         "is_decommissioned": 0}
+
+
+def test_valid_asset_passes_and_extra_fields_are_ignored():
+    assert D.data_validation(VALID) is True
+    assert D.data_validation({**VALID, "asset_id": 9}) is True
+    assert D.asset_errors(VALID) == []
+
+
+@pytest.mark.parametrize("change", [
+    {"type_id": "4"},                          # no string coercion
+    {"is_decommissioned": True},               # bool is not an integer
+    {"is_decommissioned": 2},
+    {"notes": "x" * 1001},
+    {"employee_id": 5},                        # both location and employee
+    {"location_id": None},                     # neither
+])
+def test_invalid_assets_fail(change):
+    assert D.data_validation({**VALID, **change}) is False
+
+
+def test_errors_are_structured():
+    errors = D.asset_errors({"location_id": 1, "is_decommissioned": 0})
+    assert errors == [{"type": "missing", "loc": ("type_id",), "msg": "Field required"}]
+
+
+def test_batch_reports_one_message_per_row():
+    messages = D.batch_validation([VALID, {**VALID, "type_id": "x"}, "not an object",
+                                   {**VALID, "employee_id": 3}])
+    assert messages[0] is None
+    assert messages[1].startswith("type_id:")
+    assert messages[2] is not None
+    assert "exactly one of location_id or employee_id" in messages[3]